@@ -1,13 +1,31 @@
+import functools
 import os
-import re
-import pandas as pd
-import numpy as np
+import uuid
 import streamlit as st
 import altair as alt
-from itertools import combinations
+
+from nmf_stats.archive import SeasonArchive
+from nmf_stats.charts import chart_data, chart_spec, downsample_lines
+from nmf_stats.form import FORM_MODES
+from nmf_stats import instrument
+from nmf_stats.instrument import span, track_cache
+from nmf_stats.intervals import INTERVAL_METHODS
+from nmf_stats.pairs import PAIR_COLUMNS
+from nmf_stats.parsing import season_months
+from nmf_stats.sources import SEASON, load_season, make_session, make_source
+from nmf_stats.snapshot import SeasonStore
+from nmf_stats.stats import Filters, SeasonStats, compare_seasons as archive_comparison
+from nmf_stats.tab_cache import TabCache
 
 st.set_page_config(page_title="NMF — Suivi", layout="wide")
 
+# --- Débogage : temps des étapes et compteurs de cache (panneau rempli en fin de page) ---
+# Mesures activées pour tout le processus par NMF_DEBUG=1 ; chaque rechargement de chaque
+# session marque ses spans pour n'afficher que les siens
+run_id = uuid.uuid4().hex
+instrument.set_run(run_id)
+show_debug = instrument.enabled() and st.sidebar.checkbox("🔧 Afficher le débogage", key="debug_timing")
+
 # --- Logo du club ---
 LOGO_PATH = os.path.join(os.path.dirname(__file__), "logo_nmf.png")
 if os.path.exists(LOGO_PATH):
@@ -17,179 +35,186 @@ else:
 
 st.title("Nantes Métropole Futsal — Suivi des performances")
 
-# ---------------- Google Sheets parser ----------------
-@st.cache_data(ttl="10m")  # Cache pendant 10 minutes
-def parse_google_sheet():
-    SHEET_ID = "1-QCywSqXboG2k1xLmaX2eRy7MWXzwcKoEPfIHbbEIY8"
-    
-    all_records = []
-    int_re = re.compile(r'(\d+)')
-    day_names = {"lundi":1,"mardi":2,"mercredi":3,"jeudi":4,"vendredi":5,"samedi":6,"dimanche":7}
-    
-    # Lire toutes les feuilles - celles sans données seront automatiquement ignorées
-    sheets = [
-        ("Août", 0),
-        ("Septembre", 1815364140),
-        ("Octobre", 2065545828),
-        ("Novembre", 2055534384),
-        ("Décembre", 2028758753),
-        ("Janvier", 228471660),
-        ("Février", 1003146032),
-        ("Mars", 1342797580),
-        ("Avril", 1812433009),
-        ("Mai", 549449988),
-        ("Juin", 557016746)
-    ]
-    
-    for sheet_name, gid in sheets:
-        try:
-            # URL pour lire une feuille spécifique en CSV avec le bon GID
-            sheet_url = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv&gid={gid}"
-            
-            # Lire les données depuis Google Sheets
-            raw = pd.read_csv(sheet_url, header=None)
-            
-            if raw.empty:
-                continue
-                
-            nrows, ncols = raw.shape
-
-            # Détection des lignes jour / jeu (même logique qu'avant)
-            candidate_day_scores = []
-            for r in range(min(6, nrows)):
-                row_vals = raw.iloc[r, 1:].astype(str).fillna("").str.strip().str.lower().tolist()
-                score = sum(1 for v in row_vals if v in day_names)
-                candidate_day_scores.append((r, score))
-            row_jours = max(candidate_day_scores, key=lambda x: x[1])[0] if candidate_day_scores else 0
-
-            candidate_num_scores = []
-            for r in range(row_jours + 1, min(row_jours + 6, nrows)):
-                row_vals = raw.iloc[r, 1:].astype(str).fillna("").str.strip().tolist()
-                score = sum(1 for v in row_vals if int_re.search(str(v)))
-                candidate_num_scores.append((r, score))
-            row_jeux = max(candidate_num_scores, key=lambda x: x[1])[0] if candidate_num_scores else min(row_jours + 1, nrows-1)
-
-            if row_jours < nrows and row_jeux < nrows:
-                jours_series = raw.iloc[row_jours].ffill().fillna("Séance inconnue").astype(str).str.strip()
-                jeux_series = raw.iloc[row_jeux].astype(str).fillna("").str.strip()
-
-                # Lecture des joueurs/gardiens
-                for r in range(row_jeux + 1, nrows):
-                    if r >= len(raw):
-                        continue
-                        
-                    joueur_cell = raw.iat[r, 0] if ncols > 0 else None
-                    poste_cell = raw.iat[r, 1] if ncols > 1 else None
-                    
-                    if pd.isna(joueur_cell) or str(joueur_cell).strip() == "":
-                        continue
-                    
-                    joueur_name = str(joueur_cell).strip()
-                    poste = str(poste_cell).strip() if not pd.isna(poste_cell) else "Joueur"
-                    
-                    for c in range(2, ncols):
-                        if c >= len(raw.columns):
-                            continue
-                            
-                        raw_val = raw.iat[r, c]
-                        if pd.isna(raw_val) or str(raw_val).strip() == "":
-                            continue
-                            
-                        jeu_cell = str(jeux_series.iloc[c]).strip() if c < len(jeux_series) else ""
-                        m = int_re.search(jeu_cell)
-                        jeu_num = int(m.group(1)) if m else c-1
-                        jour_name = str(jours_series.iloc[c]).strip() if c < len(jours_series) else "Séance inconnue"
-                        jour_index = day_names.get(jour_name.lower(), 0)
-                        
-                        # Calcul de semaine amélioré
-                        # Pour chaque jour, on regarde la colonne pour déterminer la semaine
-                        if jour_index > 0:
-                            # Calcul basé sur la position de la colonne
-                            if c <= 7:  # Colonnes C à I (première semaine)
-                                semaine = 1
-                            elif c <= 13:  # Colonnes J à P (deuxième semaine)  
-                                semaine = 2
-                            elif c <= 19:  # Colonnes Q à W (troisième semaine)
-                                semaine = 3
-                            else:  # Colonnes suivantes
-                                semaine = 4
-                        else:
-                            semaine = 1
-
-                        if poste.lower() != "gardien":
-                            val_str = str(raw_val).strip().upper()
-                            
-                            if val_str not in ("V","D","N"):  # Ajouter "N" pour match nul
-                                continue
-                            
-                            # Créer l'enregistrement avec les nouvelles variables
-                            all_records.append({
-                                "Mois": str(sheet_name),
-                                "Joueur": joueur_name,
-                                "Seance": jour_name,
-                                "Jour_index": jour_index,
-                                "Semaine": semaine,
-                                "Jeu": int(jeu_num),
-                                "Resultat": val_str,
-                                "Victoire": 1 if val_str=="V" else 0,
-                                "Défaite": 1 if val_str=="D" else 0,
-                                "Nul": 1 if val_str=="N" else 0,  # Nouvelle colonne pour les nuls
-                                "Postes": poste,
-                                "Buts_encaisses": np.nan
-                            })
-                        else:
-                            try:
-                                buts = float(raw_val)
-                            except:
-                                buts = np.nan
-                            all_records.append({
-                                "Mois": str(sheet_name),
-                                "Joueur": joueur_name,
-                                "Seance": jour_name,
-                                "Jour_index": jour_index,
-                                "Semaine": semaine,
-                                "Jeu": int(jeu_num),
-                                "Resultat": np.nan,
-                                "Victoire": np.nan,
-                                "Défaite": np.nan,
-                                "Nul": np.nan,  # Ajouter aussi pour les gardiens
-                                "Postes": poste,
-                                "Buts_encaisses": buts
-                            })
-                            
-        except Exception as e:
-            st.error(f"Erreur lecture feuille {sheet_name}: {str(e)}")
-            continue
-    
-    df = pd.DataFrame(all_records, columns=["Mois","Joueur","Seance","Jour_index","Semaine","Jeu","Resultat","Victoire","Défaite","Nul","Postes","Buts_encaisses"])
-    if not df.empty:
-        df["Jeu"] = df["Jeu"].astype(int)
-        df["Seance"] = df["Seance"].fillna("Séance inconnue").astype(str)
-        df["Mois"] = df["Mois"].astype(str)
-        df["Postes"] = df["Postes"].str.strip().str.capitalize()
-    return df
+# ---------------- Sources de données ----------------
+# Instantané local de la saison analysée (démarrage immédiat, fonctionne hors ligne)
+SNAPSHOT_PATH = os.environ.get("NMF_SNAPSHOT", os.path.join(os.path.dirname(__file__), ".cache", "season.parquet"))
+# Archive de toutes les saisons, partitionnée par saison et par mois
+ARCHIVE_PATH = os.environ.get("NMF_ARCHIVE", os.path.join(os.path.dirname(__file__), "archive"))
+CURRENT_SEASON = os.environ.get("NMF_SEASON", SEASON)
+
+@st.cache_resource
+def get_http_session():
+    # Session HTTP partagée entre les rechargements : les connexions vers Google sont réutilisées
+    return make_session()
+
+@st.cache_resource
+def get_tab_cache():
+    # Onglets déjà analysés, partagés entre sessions : seuls les onglets modifiés sont ré-analysés
+    return TabCache()
+
+@st.cache_resource
+def get_data_source():
+    # Google Sheet par défaut ; NMF_SOURCE peut désigner un classeur .xlsx ou un dossier de CSV (hors ligne)
+    return make_source(os.environ.get("NMF_SOURCE"), session=get_http_session())
+
+@st.cache_resource
+def get_season_archive():
+    return SeasonArchive(ARCHIVE_PATH)
+
+def archive_current_season(archive, season_df):
+    # Appelé aussi depuis le thread de revalidation : pas d'appel Streamlit ici (archive passée en argument)
+    try:
+        archive.write_season(CURRENT_SEASON, season_df)
+    except OSError:
+        pass  # Disque en lecture seule : l'archive n'est simplement pas mise à jour
+
+@st.cache_resource
+def get_season_store():
+    # Saison servie depuis l'instantané local, revalidée contre la source toutes les 2 minutes
+    # (load_season n'appelle pas Streamlit : elle tourne aussi en arrière-plan)
+    loader = functools.partial(load_season, get_data_source(), get_tab_cache())
+    archive = get_season_archive()
+    store = SeasonStore(SNAPSHOT_PATH, loader, max_age=120, on_change=functools.partial(archive_current_season, archive))
+    if store.df is not None and CURRENT_SEASON not in archive.seasons():
+        archive_current_season(archive, store.df)
+    return store
+
+@track_cache("get_archived_season", st.cache_resource(max_entries=1))
+def get_archived_season(saison, mois, archive_version):
+    # Une seule saison passée en mémoire à la fois, limitée aux mois demandés (partitions lues)
+    return get_season_archive().load(saisons=[saison], mois=mois).drop(columns="Saison")
+
+@st.cache_resource
+def get_stats_holder():
+    return {}
+
+@track_cache("get_season_stats", st.cache_resource(max_entries=2))
+def get_season_stats(data_version, _df):
+    # Calculs de la saison (tables compactes, index, cubes, Elo...) construits à la demande et
+    # partagés par toutes les sessions ; une nouvelle version des données qui ne fait qu'ajouter
+    # des séances prolonge l'index chronologique et les Elo de la précédente
+    holder = get_stats_holder()
+    holder["last"] = SeasonStats(_df, previous=holder.get("last"))
+    return holder["last"]
+
+# ---------------- Agrégations mémorisées ----------------
+# Chaque graphique est mis en cache selon ses filtres et la version des données :
+# une interaction ne recalcule que le graphique dont les filtres ont changé (LRU borné).
+# Les résultats sont partagés par toutes les sessions sans copie (cache_resource, et non
+# cache_data qui désérialise une copie à chaque lecture) : ils ne doivent pas être modifiés.
+AGG_CACHE_ENTRIES = 128
+
+def shared_result(name):
+    return track_cache(name, st.cache_resource(max_entries=AGG_CACHE_ENTRIES))
+
+@shared_result("aggregate")
+def aggregate(name, data_version, _stats, filters):
+    return _stats.aggregate(name, filters)
+
+# Fenêtre de la colonne "Forme" du classement
+FORM_WINDOW = 10
+
+@shared_result("player_ranking")
+def player_ranking(data_version, _stats, filters, interval):
+    return _stats.player_ranking(filters, interval)
+
+@shared_result("player_form")
+def player_form(data_version, _stats, mode, n, filters, latest=False):
+    return _stats.player_form(mode, n, filters, latest)
+
+@shared_result("player_ratings")
+def player_ratings(data_version, _stats, filters):
+    return _stats.player_ratings(filters)
+
+# Budget de points des courbes (Joueurs G2, G4, G6) : au-delà, une période sur N est tracée
+CHART_POINT_BUDGET = int(os.environ.get("NMF_CHART_POINTS", "3000"))
+
+@shared_result("cached_chart_spec")
+def cached_chart_spec(chart_key, _chart):
+    # ``chart_key`` : nom du graphique, version des données et filtres ; la
+    # spécification n'est sérialisée qu'une fois par combinaison
+    with span("chart.spec", graphique=chart_key[0]):
+        return chart_spec(_chart)
+
+def show_chart(chart_key, chart):
+    # Taille envoyée au navigateur : champ "octets" du span (panneau de débogage et logs)
+    spec, size = cached_chart_spec(chart_key, chart)
+    with span("chart.render", graphique=chart_key[0], octets=size):
+        st.vega_lite_chart(spec, use_container_width=True)
+
+@shared_result("compare_seasons")
+def compare_seasons(archive_version, joueurs):
+    return archive_comparison(get_season_archive(), joueurs)
+
+@shared_result("ranked_associations")
+def ranked_associations(data_version, _stats, k, n, filters, min_games, interval="wilson"):
+    # Seuls les ``n`` meilleurs groupes sont conservés (tas borné), avec le résumé de tous les groupes
+    return _stats.associations(k, n, filters, min_games, interval)
+
+@shared_result("pair_table")
+def pair_table(data_version, _stats, filters, min_games):
+    # Bilans de toutes les paires en un produit matriciel (incidence joueurs × jeux)
+    return _stats.pair_table(filters, min_games)
 
 # ---------------- Load data ----------------
+archive = get_season_archive()
+archived_seasons = sorted((s for s in archive.seasons() if s != CURRENT_SEASON), reverse=True)
+# Les filtres qui dépendent des données (mois, semaines, jeux, joueurs) ont une clé par saison :
+# changer de saison repart de leurs valeurs par défaut au lieu de garder des choix devenus invalides
+saison = st.sidebar.selectbox("Saison", [CURRENT_SEASON] + archived_seasons)
+
 try:
-    df = parse_google_sheet()
-    if df.empty:
+    store = get_season_store()
+    # Frame, version et erreurs lues ensemble : une revalidation en arrière-plan ne peut
+    # pas associer l'ancienne frame à la nouvelle version
+    df, data_version, load_errors = store.get()
+    if load_errors and len(load_errors) == get_tab_cache().last_stats["total"]:
+        # Tous les onglets en échec : la saison servie est la dernière chargée (ou l'instantané)
+        st.warning("Source de données injoignable : affichage des dernières données chargées.")
+    else:
+        for sheet_name, e in load_errors:
+            st.error(f"Erreur lecture feuille {sheet_name}: {str(e)}")
+    if df is None or df.empty:
         st.error("Aucune donnée trouvée dans le Google Sheet. Vérifiez que les données sont bien saisies.")
         st.stop()
 except Exception as e:
     st.error(f"Erreur lors de la lecture du Google Sheet : {str(e)}")
     st.stop()
 
-df["SessionID"] = df["Mois"].astype(str) + " - " + df["Seance"].astype(str)
+if saison != CURRENT_SEASON:
+    # Saison archivée : seules les partitions des mois choisis sont lues
+    mois_archive = season_months(archive.months(saison))  # ordre de la saison, pas alphabétique
+    mois_charges = st.sidebar.multiselect("Mois chargés", mois_archive, default=mois_archive)
+    archive_version = archive.version()
+    df = get_archived_season(saison, tuple(mois_charges), archive_version)
+    data_version = f"{saison}:{archive_version}:{','.join(mois_charges)}"
+    if df.empty:
+        st.warning("Aucune donnée archivée pour les mois choisis.")
+        st.stop()
+
+# Calculs et tables compactes partagés entre sessions (ne doivent pas être modifiés)
+stats = get_season_stats(data_version, df)
+tables = stats.tables
 
 # ---------------- Sidebar ----------------
 st.sidebar.title("Navigation")
 page = st.sidebar.radio("Aller à :", ["Classement", "Joueurs", "Gardiens"])
 
-months_all = sorted(df["Mois"].unique())
-jeux_min, jeux_max = int(df["Jeu"].min()), int(df["Jeu"].max())
-joueurs_all = sorted(df[df["Postes"]!="Gardien"]["Joueur"].unique())
-semaines_all = sorted(df["Semaine"].unique())
-gardiens_all = sorted(df[df["Postes"]=="Gardien"]["Joueur"].unique())
+refresh_stats = get_tab_cache().last_stats
+if refresh_stats["total"]:
+    st.sidebar.caption(
+        f"Dernier rafraîchissement : {refresh_stats['skipped']}/{refresh_stats['total']} onglets inchangés, "
+        f"{refresh_stats['parsed']} ré-analysé(s)"
+    )
+
+# Bornes des filtres, lues dans les tables compactes (joueurs et gardiens)
+populations = [t for t in (tables.players, tables.goalkeepers) if not t.empty]
+months_all = list(tables.sessions["Mois"].cat.categories)  # ordre de la saison
+jeux_min = min(int(t["Jeu"].min()) for t in populations)
+jeux_max = max(int(t["Jeu"].max()) for t in populations)
+joueurs_all = sorted(tables.players["Joueur"].unique())
+semaines_all = sorted({int(s) for t in populations for s in t["Semaine"].unique()})
+gardiens_all = sorted(tables.goalkeepers["Joueur"].unique())
 
 # ---------------- Page Classement ----------------
 if page == "Classement":
@@ -198,36 +223,31 @@ if page == "Classement":
     # ========================
     # Classement des joueurs
     st.subheader("🏆 Classement des joueurs (période filtrée)")
-    mois_sel_cl = st.multiselect("Mois", months_all, default=months_all, key="mois_classement_joueurs")
-    semaine_sel_cl = st.multiselect("Semaine", semaines_all, default=semaines_all, key="semaine_classement_joueurs")
-    jeu_range_cl = st.slider("Plage de jeux", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key="jeu_classement_joueurs")
-    joueurs_sel_cl = st.multiselect("Joueurs", joueurs_all, default=joueurs_all, key="joueurs_classement")
-
-    mask_cl = (
-        (df["Postes"] != "Gardien") &
-        (df["Mois"].isin(mois_sel_cl)) &
-        (df["Semaine"].isin(semaine_sel_cl)) &
-        (df["Jeu"].between(jeu_range_cl[0], jeu_range_cl[1])) &
-        (df["Joueur"].isin(joueurs_sel_cl))
-    )
-    df_cl = df.loc[mask_cl]
+    mois_sel_cl = st.multiselect("Mois", months_all, default=months_all, key=f"mois_classement_joueurs_{saison}")
+    semaine_sel_cl = st.multiselect("Semaine", semaines_all, default=semaines_all, key=f"semaine_classement_joueurs_{saison}")
+    jeu_range_cl = st.slider("Plage de jeux", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key=f"jeu_classement_joueurs_{saison}")
+    joueurs_sel_cl = st.multiselect("Joueurs", joueurs_all, default=joueurs_all, key=f"joueurs_classement_{saison}")
+
+    # Intervalle de confiance à 95 % du % de victoires : 3/4 et 30/40 ne se valent pas
+    ic_cl = st.radio("Intervalle de confiance", list(INTERVAL_METHODS), format_func=INTERVAL_METHODS.get, horizontal=True, key="ic_classement_joueurs")
+    ranking = player_ranking(data_version, stats, Filters(mois=mois_sel_cl, semaines=semaine_sel_cl, jeu_range=jeu_range_cl, joueurs=joueurs_sel_cl), ic_cl)
 
-    if df_cl.empty:
+    if ranking is None:
         st.warning("Aucune donnée pour les filtres choisis.")
     else:
-        ranking = df_cl.groupby("Joueur", as_index=False).agg({"Victoire":"sum","Défaite":"sum","Nul":"sum"})
-        ranking["Total"] = ranking["Victoire"] + ranking["Défaite"]  # Les nuls ne comptent pas dans le total pour le %
-        ranking["% Victoire"] = (ranking["Victoire"]/ranking["Total"]).fillna(0)
-        
-        # Conversion en entiers pour le formatage
-        ranking["Victoire"] = ranking["Victoire"].astype(int)
-        ranking["Défaite"] = ranking["Défaite"].astype(int)
-        ranking["Nul"] = ranking["Nul"].astype(int)
-        ranking["Total"] = ranking["Total"].astype(int)
-        
-        ranking = ranking.sort_values("% Victoire", ascending=False).reset_index(drop=True)
-        ranking.insert(0, "Position", range(1,len(ranking)+1))
-        st.dataframe(ranking.style.format({"% Victoire":"{:.2%}","Victoire":"{:d}","Défaite":"{:d}","Nul":"{:d}","Total":"{:d}"}), use_container_width=True)
+        # Forme récente sur la même période : % de victoires des N derniers jeux
+        forme_col = f"Forme ({FORM_WINDOW} derniers jeux)"
+        forme = player_form(data_version, stats, "jeux", FORM_WINDOW, Filters(mois=mois_sel_cl, semaines=semaine_sel_cl, jeu_range=jeu_range_cl, joueurs=joueurs_sel_cl), latest=True)
+        ranking = ranking.merge(forme[["Joueur", "Forme"]].rename(columns={"Forme": forme_col}), on="Joueur", how="left")
+        # Elo : tient compte des coéquipiers et des adversaires de chaque jeu
+        elo = player_ratings(data_version, stats, Filters(mois=mois_sel_cl, semaines=semaine_sel_cl, jeu_range=jeu_range_cl))
+        ranking = ranking.merge(elo.rename(columns={"Jeux_notes": "Jeux notés"}), on="Joueur", how="left")
+        tri_cl = st.radio("Classer par", ["% Victoire", "IC bas", "Elo"], horizontal=True, key="tri_classement_joueurs")
+        if tri_cl != "% Victoire":
+            ranking = ranking.sort_values(tri_cl, ascending=False, kind="stable").reset_index(drop=True)
+            ranking["Position"] = range(1, len(ranking) + 1)
+        st.dataframe(ranking.style.format({"% Victoire":"{:.2%}","Victoire":"{:d}","Défaite":"{:d}","Nul":"{:d}","Total":"{:d}",forme_col:"{:.0%}","Elo":"{:.0f}","Jeux notés":"{:.0f}","IC bas":"{:.0%}","IC haut":"{:.0%}"}), use_container_width=True)
+        st.caption("Elo : départ à 1500, chaque jeu gagné ou perdu ajuste les points selon la force moyenne des deux équipes ; peu fiable avec peu de jeux notés.")
 
     st.markdown("---")
 
@@ -235,35 +255,16 @@ if page == "Classement":
     # Classement des gardiens
     if len(gardiens_all) > 0:
         st.subheader("🥅 Classement des gardiens (période filtrée)")
-        mois_sel_cl_g = st.multiselect("Mois", months_all, default=months_all, key="mois_classement_gardiens")
-        semaine_sel_cl_g = st.multiselect("Semaine", semaines_all, default=semaines_all, key="semaine_classement_gardiens")
-        jeu_range_cl_g = st.slider("Plage de jeux", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key="jeu_classement_gardiens")
-        gardiens_sel_cl = st.multiselect("Gardiens", gardiens_all, default=gardiens_all, key="gardiens_classement")
-
-        mask_cl_g = (
-            (df["Postes"] == "Gardien") &
-            (df["Mois"].isin(mois_sel_cl_g)) &
-            (df["Semaine"].isin(semaine_sel_cl_g)) &
-            (df["Jeu"].between(jeu_range_cl_g[0], jeu_range_cl_g[1])) &
-            (df["Joueur"].isin(gardiens_sel_cl))
-        )
-        df_cl_g = df.loc[mask_cl_g]
+        mois_sel_cl_g = st.multiselect("Mois", months_all, default=months_all, key=f"mois_classement_gardiens_{saison}")
+        semaine_sel_cl_g = st.multiselect("Semaine", semaines_all, default=semaines_all, key=f"semaine_classement_gardiens_{saison}")
+        jeu_range_cl_g = st.slider("Plage de jeux", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key=f"jeu_classement_gardiens_{saison}")
+        gardiens_sel_cl = st.multiselect("Gardiens", gardiens_all, default=gardiens_all, key=f"gardiens_classement_{saison}")
+
+        ranking_gardiens = aggregate("goalkeeper_ranking", data_version, stats, Filters(mois=mois_sel_cl_g, semaines=semaine_sel_cl_g, jeu_range=jeu_range_cl_g, joueurs=gardiens_sel_cl))
 
-        if df_cl_g.empty:
+        if ranking_gardiens is None:
             st.warning("Aucune donnée gardien pour les filtres choisis.")
         else:
-            # Calculer les stats par séance unique d'abord, puis les moyennes
-            perf_par_seance_unique = df_cl_g.groupby(["Joueur", "Mois", "Seance", "Semaine"])["Buts_encaisses"].sum().reset_index()
-            ranking_gardiens = perf_par_seance_unique.groupby("Joueur").agg({
-                "Buts_encaisses": ["mean", "sum", "count"]
-            }).round(2)
-            ranking_gardiens.columns = ["Moyenne_buts_par_seance", "Total_buts", "Nb_seances"]
-            ranking_gardiens = ranking_gardiens.reset_index()
-            
-            # Tri par moyenne croissante (moins de buts = meilleur)
-            ranking_gardiens = ranking_gardiens.sort_values("Moyenne_buts_par_seance", ascending=True).reset_index(drop=True)
-            ranking_gardiens.insert(0, "Position", range(1, len(ranking_gardiens)+1))
-            
             st.dataframe(
                 ranking_gardiens.style.format({
                     "Moyenne_buts_par_seance": "{:.2f}",
@@ -275,6 +276,26 @@ if page == "Classement":
     else:
         st.info("Aucun gardien détecté dans les données.")
 
+    # ========================
+    # Comparaison entre saisons (archive)
+    if archived_seasons:
+        st.markdown("---")
+        st.subheader("📅 Comparaison entre saisons")
+        joueurs_sel_saisons = st.multiselect("Joueurs", joueurs_all, default=joueurs_all[:5], key=f"joueurs_saisons_{saison}")
+        comparaison = compare_seasons(archive.version(), tuple(joueurs_sel_saisons)) if joueurs_sel_saisons else None
+        if comparaison is None:
+            st.warning("Aucune donnée archivée pour ces joueurs.")
+        else:
+            st.dataframe(comparaison.style.format({"% Victoire":"{:.2%}","Victoire":"{:d}","Défaite":"{:d}","Nul":"{:d}","Total":"{:d}"}), use_container_width=True)
+            chart_saisons = alt.Chart(chart_data(comparaison, ["Joueur", "Saison", "% Victoire", "Total"])).mark_bar().encode(
+                x=alt.X("Saison:N", title="Saison"),
+                y=alt.Y("% Victoire:Q", axis=alt.Axis(format="%")),
+                color="Saison:N",
+                column=alt.Column("Joueur:N", title=None),
+                tooltip=["Joueur", "Saison", alt.Tooltip("% Victoire:Q", format=".2%"), "Total"]
+            )
+            show_chart(("saisons", archive.version(), joueurs_sel_saisons), chart_saisons)
+
 # ---------------- Page Joueurs ----------------
 elif page == "Joueurs":
     st.header("Graphiques et analyses — Joueurs")
@@ -286,21 +307,10 @@ elif page == "Joueurs":
     jeu_range_g1 = st.slider("Plage de jeux (G1)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max))
     joueurs_sel_g1 = st.multiselect("Joueurs (G1)", joueurs_all, default=joueurs_all)
 
-    mask_g1 = (
-        (df["Postes"] != "Gardien") &
-        (df["Mois"].isin(mois_sel_g1)) &
-        (df["Semaine"].isin(semaine_sel_g1)) &
-        (df["Jeu"].between(jeu_range_g1[0], jeu_range_g1[1])) &
-        (df["Joueur"].isin(joueurs_sel_g1))
-    )
-    df_g1 = df.loc[mask_g1]
-    if not df_g1.empty:
-        agg1 = df_g1.groupby(["Jeu","Joueur"], as_index=False).agg({"Victoire":"sum","Défaite":"sum"})
-        agg1["Total"] = agg1["Victoire"] + agg1["Défaite"]
-        agg1["% Victoire"] = (agg1["Victoire"]/agg1["Total"]).fillna(0)
-        agg1["Jeu_str"] = agg1["Jeu"].astype(str)
+    agg1 = aggregate("win_rate_by_game", data_version, stats, Filters(mois=mois_sel_g1, semaines=semaine_sel_g1, jeu_range=jeu_range_g1, joueurs=joueurs_sel_g1))
+    if agg1 is not None:
         chart1 = (
-            alt.Chart(agg1)
+            alt.Chart(chart_data(agg1, ["Joueur", "Jeu", "Jeu_str", "% Victoire"]))
             .mark_line(point=True)
             .encode(
                 x=alt.X("Jeu_str:O", title="Numéro du jeu"),
@@ -309,7 +319,7 @@ elif page == "Joueurs":
                 tooltip=["Joueur","Jeu","% Victoire"]
             ).interactive()
         )
-        st.altair_chart(chart1, use_container_width=True)
+        show_chart(("joueurs_g1", data_version, mois_sel_g1, semaine_sel_g1, jeu_range_g1, joueurs_sel_g1), chart1)
 
     st.markdown("---")
 
@@ -320,41 +330,19 @@ elif page == "Joueurs":
     jeu_range_g2 = st.slider("Plage de jeux (G2)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max))
     joueurs_sel_g2 = st.multiselect("Joueurs (G2)", joueurs_all, default=joueurs_all)
 
-    mask_g2 = (
-        (df["Postes"] != "Gardien") &
-        (df["Mois"].isin(mois_sel_g2)) &
-        (df["Semaine"].isin(semaine_sel_g2)) &
-        (df["Jeu"].between(jeu_range_g2[0], jeu_range_g2[1])) &
-        (df["Joueur"].isin(joueurs_sel_g2))
-    )
-    df_g2 = df.loc[mask_g2]
-    if not df_g2.empty:
-        # D'abord agréger par séance unique (Mois + Seance + Semaine)
-        df_par_seance = df_g2.groupby(["Joueur", "Mois", "Seance", "Semaine"]).agg({
-            "Victoire": "sum",
-            "Défaite": "sum"
-        }).reset_index()
-        
-        # Créer un identifiant de séance unique et trier chronologiquement
-        df_par_seance["Seance_ID"] = df_par_seance["Mois"] + " - " + df_par_seance["Seance"] + " (S" + df_par_seance["Semaine"].astype(str) + ")"
-        df_par_seance = df_par_seance.sort_values(["Joueur", "Mois", "Semaine"])
-        
-        # Calculer les pourcentages cumulés par séance
-        df_par_seance["Victoire_cum"] = df_par_seance.groupby("Joueur")["Victoire"].cumsum()
-        df_par_seance["Total_cum"] = df_par_seance.groupby("Joueur")[["Victoire", "Défaite"]].cumsum().sum(axis=1)
-        df_par_seance["% Victoire cumulée"] = (df_par_seance["Victoire_cum"] / df_par_seance["Total_cum"]).fillna(0)
-        
+    df_par_seance = aggregate("cumulative_by_session", data_version, stats, Filters(mois=mois_sel_g2, semaines=semaine_sel_g2, jeu_range=jeu_range_g2, joueurs=joueurs_sel_g2))
+    if df_par_seance is not None:
         chart2 = (
-            alt.Chart(df_par_seance)
+            alt.Chart(downsample_lines(chart_data(df_par_seance, ["Joueur", "Seance_ID", "% Victoire cumulée", "Victoire_cum", "Total_cum"]), "Seance_ID", "Joueur", CHART_POINT_BUDGET))
             .mark_line(point=True)
             .encode(
-                x=alt.X("Seance_ID:O", title="Séance", axis=alt.Axis(labelAngle=-45)),
+                x=alt.X("Seance_ID:O", title="Séance", sort=None, axis=alt.Axis(labelAngle=-45)),
                 y=alt.Y("% Victoire cumulée:Q", title="% Victoire cumulée", axis=alt.Axis(format="%")),
                 color="Joueur:N",
                 tooltip=["Joueur", "Seance_ID", "% Victoire cumulée", "Victoire_cum", "Total_cum"]
             ).interactive()
         )
-        st.altair_chart(chart2, use_container_width=True)
+        show_chart(("joueurs_g2", data_version, mois_sel_g2, semaine_sel_g2, jeu_range_g2, joueurs_sel_g2, CHART_POINT_BUDGET), chart2)
 
     st.markdown("---")
 
@@ -365,19 +353,10 @@ elif page == "Joueurs":
     jeu_range_g3 = st.slider("Plage de jeux (G3)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max))
     joueurs_sel_g3 = st.multiselect("Joueurs (G3)", joueurs_all, default=joueurs_all)
 
-    mask_g3 = (
-        (df["Postes"] != "Gardien") &
-        (df["Mois"].isin(mois_sel_g3)) &
-        (df["Semaine"].isin(semaine_sel_g3)) &
-        (df["Jeu"].between(jeu_range_g3[0], jeu_range_g3[1])) &
-        (df["Joueur"].isin(joueurs_sel_g3))
-    )
-    df_g3 = df.loc[mask_g3]
-    if not df_g3.empty:
-        agg3 = df_g3.groupby("Joueur", as_index=False).agg({"Victoire":"sum","Défaite":"sum"})
-        agg3_melted = agg3.melt(id_vars="Joueur", value_vars=["Victoire","Défaite"], var_name="Type", value_name="Nombre")
+    agg3_melted = aggregate("totals_by_player", data_version, stats, Filters(mois=mois_sel_g3, semaines=semaine_sel_g3, jeu_range=jeu_range_g3, joueurs=joueurs_sel_g3))
+    if agg3_melted is not None:
         chart3 = (
-            alt.Chart(agg3_melted)
+            alt.Chart(chart_data(agg3_melted, ["Joueur", "Type", "Nombre"]))
             .mark_bar()
             .encode(
                 x=alt.X("Joueur:N", sort=joueurs_all),
@@ -386,7 +365,7 @@ elif page == "Joueurs":
                 tooltip=["Joueur","Type","Nombre"]
             ).interactive()
         )
-        st.altair_chart(chart3, use_container_width=True)
+        show_chart(("joueurs_g3", data_version, mois_sel_g3, semaine_sel_g3, jeu_range_g3, joueurs_sel_g3), chart3)
 
     st.markdown("---")
 
@@ -396,37 +375,19 @@ elif page == "Joueurs":
     semaine_sel_g4 = st.multiselect("Semaine (G4)", semaines_all, default=semaines_all)
     joueurs_sel_g4 = st.multiselect("Joueurs (G4)", joueurs_all, default=joueurs_all)
 
-    mask_g4 = (
-        (df["Postes"] != "Gardien") &
-        (df["Mois"].isin(mois_sel_g4)) &
-        (df["Semaine"].isin(semaine_sel_g4)) &
-        (df["Joueur"].isin(joueurs_sel_g4))
-    )
-    df_g4 = df.loc[mask_g4]
-    if not df_g4.empty:
-        # Agréger par semaine (Mois + Semaine)
-        agg4 = df_g4.groupby(["Mois", "Semaine", "Joueur"], as_index=False).agg({"Victoire":"sum","Défaite":"sum"})
-        agg4 = agg4.sort_values(["Joueur", "Mois", "Semaine"])
-        
-        # Créer un identifiant de semaine unique pour l'affichage
-        agg4["Semaine_ID"] = agg4["Mois"] + " (S" + agg4["Semaine"].astype(str) + ")"
-        
-        # Calculer les cumuls par joueur
-        agg4["Victoire_cum"] = agg4.groupby("Joueur")["Victoire"].cumsum()
-        agg4["Total_cum"] = agg4.groupby("Joueur")[["Victoire","Défaite"]].cumsum().sum(axis=1)
-        agg4["% Victoire cumulée"] = (agg4["Victoire_cum"]/agg4["Total_cum"]).fillna(0)
-        
+    agg4 = aggregate("cumulative_by_week", data_version, stats, Filters(mois=mois_sel_g4, semaines=semaine_sel_g4, joueurs=joueurs_sel_g4))
+    if agg4 is not None:
         chart4 = (
-            alt.Chart(agg4)
+            alt.Chart(downsample_lines(chart_data(agg4, ["Joueur", "Semaine_ID", "% Victoire cumulée", "Victoire_cum", "Total_cum"]), "Semaine_ID", "Joueur", CHART_POINT_BUDGET))
             .mark_line(point=True)
             .encode(
-                x=alt.X("Semaine_ID:O", title="Semaine", axis=alt.Axis(labelAngle=-45)),
+                x=alt.X("Semaine_ID:O", title="Semaine", sort=None, axis=alt.Axis(labelAngle=-45)),
                 y=alt.Y("% Victoire cumulée:Q", axis=alt.Axis(format="%")),
                 color="Joueur:N",
                 tooltip=["Joueur", "Semaine_ID", "% Victoire cumulée", "Victoire_cum", "Total_cum"]
             ).interactive()
         )
-        st.altair_chart(chart4, use_container_width=True)
+        show_chart(("joueurs_g4", data_version, mois_sel_g4, semaine_sel_g4, joueurs_sel_g4, CHART_POINT_BUDGET), chart4)
 
     st.markdown("---")
 
@@ -453,152 +414,137 @@ elif page == "Joueurs":
     else:
         st.info("Cette analyse identifie les quatuors de joueurs qui jouent ensemble et calcule leur taux de victoire commun.")
     
-    mois_sel_g5 = st.multiselect("Mois (G5)", months_all, default=months_all, key="mois_g5")
-    semaine_sel_g5 = st.multiselect("Semaine (G5)", semaines_all, default=semaines_all, key="semaine_g5")
-    jeu_range_g5 = st.slider("Plage de jeux (G5)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key="jeu_g5")
-
-    mask_g5 = (
-        (df["Postes"] != "Gardien") &
-        (df["Mois"].isin(mois_sel_g5)) &
-        (df["Semaine"].isin(semaine_sel_g5)) &
-        (df["Jeu"].between(jeu_range_g5[0], jeu_range_g5[1]))
-    )
-    df_g5 = df.loc[mask_g5].copy()
+    mois_sel_g5 = st.multiselect("Mois (G5)", months_all, default=months_all, key=f"mois_g5_{saison}")
+    semaine_sel_g5 = st.multiselect("Semaine (G5)", semaines_all, default=semaines_all, key=f"semaine_g5_{saison}")
+    jeu_range_g5 = st.slider("Plage de jeux (G5)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key=f"jeu_g5_{saison}")
+
     
-    if not df_g5.empty:
-        # Créer un identifiant unique pour chaque jeu
-        df_g5["Match_ID"] = (df_g5["Mois"].astype(str) + "_" + 
-                             df_g5["Seance"].astype(str) + "_" + 
-                             df_g5["Semaine"].astype(str) + "_" + 
-                             df_g5["Jeu"].astype(str))
-        
-        # Pour chaque match, trouver les associations de joueurs
-        associations_data = []
-        
-        for match_id in df_g5["Match_ID"].unique():
-            match_data = df_g5[df_g5["Match_ID"] == match_id]
-            joueurs_du_match = match_data["Joueur"].unique()
+    ic_g5 = st.radio("Intervalle de confiance (G5)", list(INTERVAL_METHODS), format_func=INTERVAL_METHODS.get, horizontal=True, key="ic_g5")
+    top_n_g5 = st.slider("Nombre de groupes affichés", min_value=15, max_value=200, value=50, step=5, key="top_g5")
+    result_g5 = ranked_associations(data_version, stats, type_association, top_n_g5, Filters(mois=mois_sel_g5, semaines=semaine_sel_g5, jeu_range=jeu_range_g5), min_jeux_ensemble, ic_g5)
+    
+    if result_g5 is not None:
+        associations_agg, resume_g5 = result_g5
+        if not associations_agg.empty:
+            # Afficher le tableau
+            # Préparer le DataFrame pour l'affichage avec formatage
+            associations_display = associations_agg.assign(**{
+                col: associations_agg[col].map("{:.2%}".format) for col in ["% Victoire", "IC bas", "IC haut"]
+            })
             
-            # Si au moins le nombre requis de joueurs ont joué ce match
-            if len(joueurs_du_match) >= type_association:
-                # Obtenir le résultat (on prend le premier, ils devraient tous avoir le même résultat)
-                resultat = match_data["Resultat"].iloc[0]
-                victoire = match_data["Victoire"].iloc[0]
-                defaite = match_data["Défaite"].iloc[0]
-                
-                # Créer toutes les combinaisons possibles selon le type d'association
-                for groupe in combinations(sorted(joueurs_du_match), type_association):
-                    groupe_nom = " & ".join(groupe)
-                    associations_data.append({
-                        "Groupe": groupe_nom,
-                        "Victoire": victoire,
-                        "Défaite": defaite,
-                        "Match_ID": match_id
-                    })
-        
-        if associations_data:
-            df_associations = pd.DataFrame(associations_data)
+            st.dataframe(
+                associations_display,
+                use_container_width=True
+            )
             
-            # Agréger par groupe
-            associations_agg = df_associations.groupby("Groupe").agg({
-                "Victoire": "sum",
-                "Défaite": "sum",
-                "Match_ID": "count"
-            }).reset_index()
+            # Graphique des meilleures associations (top 15 pour voir plus d'options)
+            top_groupes = associations_agg.head(15)
             
-            associations_agg.columns = ["Groupe", "Victoires", "Défaites", "Nb_jeux"]
+            base_g5 = alt.Chart(chart_data(top_groupes, ["Groupe", "% Victoire", "IC bas", "IC haut", "Victoires", "Défaites", "Nb_jeux"])).encode(
+                y=alt.Y("Groupe:N", sort=list(top_groupes["Groupe"]), title=f"Groupe de {type_association} joueurs")
+            )
+            bars_g5 = base_g5.mark_bar().encode(
+                x=alt.X("% Victoire:Q", title="% de victoires", axis=alt.Axis(format="%")),
+                color=alt.Color("% Victoire:Q", scale=alt.Scale(scheme="greens"), legend=None),
+                tooltip=["Groupe", "% Victoire", "IC bas", "IC haut", "Victoires", "Défaites", "Nb_jeux"]
+            )
+            # Intervalle de confiance à 95 % de chaque groupe
+            ic_bars_g5 = base_g5.mark_rule(color="black").encode(x="IC bas:Q", x2="IC haut:Q")
+            chart_g5 = (bars_g5 + ic_bars_g5).properties(height=500)
             
-            # Filtrer selon le nombre minimum de jeux
-            associations_agg = associations_agg[associations_agg["Nb_jeux"] >= min_jeux_ensemble]
+            show_chart(("joueurs_g5", data_version, type_association, top_n_g5, mois_sel_g5, semaine_sel_g5, jeu_range_g5, min_jeux_ensemble, ic_g5), chart_g5)
+            
+            # Statistiques supplémentaires
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(f"Nombre de groupes analysés", resume_g5.groupes)
+            with col2:
+                meilleur_groupe = associations_agg.iloc[0]
+                st.metric(f"Meilleur groupe", meilleur_groupe["Groupe"], f"{meilleur_groupe['% Victoire']:.1%}")
+            with col3:
+                groupe_le_plus_actif = resume_g5.plus_actif
+                st.metric(f"Groupe le plus actif", groupe_le_plus_actif["Groupe"], f"{int(groupe_le_plus_actif['Nb_jeux'])} jeux")
             
-            if not associations_agg.empty:
-                # Calculer le pourcentage de victoire
-                associations_agg["Total"] = associations_agg["Victoires"] + associations_agg["Défaites"]
-                associations_agg["% Victoire"] = (associations_agg["Victoires"] / associations_agg["Total"]).fillna(0)
-                
-                # Trier par % de victoire décroissant
-                associations_agg = associations_agg.sort_values("% Victoire", ascending=False).reset_index(drop=True)
-                associations_agg.insert(0, "Rang", range(1, len(associations_agg) + 1))
-                
-                # Afficher le tableau
-                # Préparer le DataFrame pour l'affichage avec formatage
-                associations_display = associations_agg.copy()
-                associations_display["% Victoire"] = associations_display["% Victoire"].apply(lambda x: f"{x:.2%}")
-                
-                st.dataframe(
-                    associations_display,
-                    use_container_width=True
-                )
-                
-                # Graphique des meilleures associations (top 15 pour voir plus d'options)
-                top_groupes = associations_agg.head(15)
-                
-                chart_g5 = (
-                    alt.Chart(top_groupes)
-                    .mark_bar()
-                    .encode(
-                        x=alt.X("% Victoire:Q", title="% de victoires", axis=alt.Axis(format="%")),
-                        y=alt.Y("Groupe:N", sort="-x", title=f"Groupe de {type_association} joueurs"),
-                        color=alt.Color("% Victoire:Q", scale=alt.Scale(scheme="greens"), legend=None),
-                        tooltip=["Groupe", "% Victoire", "Victoires", "Défaites", "Nb_jeux"]
-                    )
-                ).properties(height=500)
-                
-                st.altair_chart(chart_g5, use_container_width=True)
-                
-                # Statistiques supplémentaires
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric(f"Nombre de groupes analysés", len(associations_agg))
-                with col2:
-                    meilleur_groupe = associations_agg.iloc[0]
-                    st.metric(f"Meilleur groupe", meilleur_groupe["Groupe"], f"{meilleur_groupe['% Victoire']:.1%}")
-                with col3:
-                    groupe_le_plus_actif = associations_agg.loc[associations_agg["Nb_jeux"].idxmax()]
-                    st.metric(f"Groupe le plus actif", groupe_le_plus_actif["Groupe"], f"{int(groupe_le_plus_actif['Nb_jeux'])} jeux")
-                
-            else:
-                st.warning(f"Aucun groupe de {type_association} joueurs n'a joué ensemble au moins {min_jeux_ensemble} fois avec les filtres sélectionnés.")
         else:
-            st.warning("Aucune association de joueurs trouvée pour les filtres sélectionnés.")
+            st.warning(f"Aucun groupe de {type_association} joueurs n'a joué ensemble au moins {min_jeux_ensemble} fois avec les filtres sélectionnés.")
     else:
         st.warning("Aucune donnée disponible pour les filtres sélectionnés.")
 
+    st.markdown("---")
+
+    # ---------------- Graphique 6 ----------------
+    st.subheader("Graphique 6 — Forme des joueurs")
+    mode_g6 = st.radio("Calcul de la forme (G6)", list(FORM_MODES), format_func=FORM_MODES.get, horizontal=True)
+    n_g6 = st.slider("N (G6)", min_value=1, max_value=30, value=FORM_WINDOW)
+    mois_sel_g6 = st.multiselect("Mois (G6)", months_all, default=months_all)
+    joueurs_sel_g6 = st.multiselect("Joueurs (G6)", joueurs_all, default=joueurs_all)
+
+    forme_g6 = player_form(data_version, stats, mode_g6, n_g6, Filters(mois=mois_sel_g6, joueurs=joueurs_sel_g6))
+    if forme_g6 is not None:
+        chart6 = (
+            alt.Chart(downsample_lines(chart_data(forme_g6, ["Joueur", "Seance_ID", "Forme", "Jeux_fenetre"]), "Seance_ID", "Joueur", CHART_POINT_BUDGET))
+            .mark_line(point=True)
+            .encode(
+                x=alt.X("Seance_ID:O", title="Séance", sort=None, axis=alt.Axis(labelAngle=-45)),
+                y=alt.Y("Forme:Q", title="Forme (% victoires)", axis=alt.Axis(format="%")),
+                color="Joueur:N",
+                tooltip=["Joueur", "Seance_ID", alt.Tooltip("Forme:Q", format=".0%"), "Jeux_fenetre"]
+            ).interactive()
+        )
+        show_chart(("joueurs_g6", data_version, mode_g6, n_g6, mois_sel_g6, joueurs_sel_g6, CHART_POINT_BUDGET), chart6)
+    else:
+        st.warning("Aucune donnée disponible pour les filtres sélectionnés.")
+
+    st.markdown("---")
+
+    # ---------------- Graphique 7 ----------------
+    st.subheader("Graphique 7 — Carte des paires de joueurs")
+    st.info("% de victoires de chaque paire de joueurs sur les jeux joués ensemble (survoler une case pour le détail).")
+    mois_sel_g7 = st.multiselect("Mois (G7)", months_all, default=months_all)
+    semaine_sel_g7 = st.multiselect("Semaine (G7)", semaines_all, default=semaines_all)
+    jeu_range_g7 = st.slider("Plage de jeux (G7)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max))
+    joueurs_sel_g7 = st.multiselect("Joueurs (G7)", joueurs_all, default=joueurs_all)
+    min_jeux_g7 = st.slider("Nombre minimum de jeux ensemble (G7)", min_value=1, max_value=20, value=3)
+
+    paires_g7 = pair_table(data_version, stats, Filters(mois=mois_sel_g7, semaines=semaine_sel_g7, jeu_range=jeu_range_g7, joueurs=joueurs_sel_g7), min_jeux_g7)
+    if paires_g7 is not None:
+        chart7 = (
+            alt.Chart(chart_data(paires_g7, PAIR_COLUMNS))
+            .mark_rect()
+            .encode(
+                x=alt.X("Partenaire:N", title="Partenaire", axis=alt.Axis(labelAngle=-45)),
+                y=alt.Y("Joueur:N", title="Joueur"),
+                color=alt.Color("% Victoire:Q", title="% Victoire", scale=alt.Scale(scheme="redyellowgreen", domain=[0, 1]), legend=alt.Legend(format="%")),
+                tooltip=["Joueur", "Partenaire", alt.Tooltip("% Victoire:Q", format=".0%"), "Victoires", "Défaites", "Nb_jeux"]
+            )
+            .properties(height=max(300, 18 * len(joueurs_sel_g7)))
+        )
+        show_chart(("joueurs_g7", data_version, mois_sel_g7, semaine_sel_g7, jeu_range_g7, joueurs_sel_g7, min_jeux_g7), chart7)
+    else:
+        st.warning(f"Aucune paire n'a joué ensemble au moins {min_jeux_g7} fois avec les filtres sélectionnés.")
+
 # ---------------- Page Gardiens ----------------
 elif page == "Gardiens":
     st.header("Statistiques des gardiens")
 
     # Vérification de la présence de gardiens
-    gardiens_all = sorted(df[df["Postes"] == "Gardien"]["Joueur"].unique())
-
     if len(gardiens_all) == 0:
         st.warning("Aucun gardien détecté dans les données. Vérifiez que la colonne 'Postes' contient bien 'Gardien'.")
-        st.write("Debug - Postes uniques détectés :", df["Postes"].unique())
+        st.write("Debug - Postes uniques détectés :", tables.postes)
     else:
         # ========================
         # Graphique 1 - Buts encaissés moyens par jeu
         st.subheader("Graphique 1 — Buts encaissés moyens par jeu")
-        mois_sel_g1 = st.multiselect("Mois (G1)", months_all, default=months_all, key="mois_g1")
-        semaine_sel_g1 = st.multiselect("Semaine (G1)", semaines_all, default=semaines_all, key="semaine_g1")
-        jeu_range_g1 = st.slider("Plage de jeux (G1)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key="jeu_g1")
-        gardiens_sel_g1 = st.multiselect("Gardiens (G1)", gardiens_all, default=gardiens_all, key="gardiens_g1")
-
-        mask_g1 = (
-            (df["Postes"] == "Gardien") &
-            (df["Mois"].isin(mois_sel_g1)) &
-            (df["Semaine"].isin(semaine_sel_g1)) &
-            (df["Jeu"].between(jeu_range_g1[0], jeu_range_g1[1])) &
-            (df["Joueur"].isin(gardiens_sel_g1))
-        )
-        df_g1 = df[mask_g1]
+        mois_sel_g1 = st.multiselect("Mois (G1)", months_all, default=months_all, key=f"mois_g1_{saison}")
+        semaine_sel_g1 = st.multiselect("Semaine (G1)", semaines_all, default=semaines_all, key=f"semaine_g1_{saison}")
+        jeu_range_g1 = st.slider("Plage de jeux (G1)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key=f"jeu_g1_{saison}")
+        gardiens_sel_g1 = st.multiselect("Gardiens (G1)", gardiens_all, default=gardiens_all, key=f"gardiens_g1_{saison}")
+
+        buts_par_jeu = aggregate("goals_by_game", data_version, stats, Filters(mois=mois_sel_g1, semaines=semaine_sel_g1, jeu_range=jeu_range_g1, joueurs=gardiens_sel_g1))
         
-        if not df_g1.empty:
-            buts_par_seance_unique = df_g1.groupby(["Mois", "Seance", "Semaine", "Jeu", "Joueur"])["Buts_encaisses"].sum().reset_index()
-            buts_par_jeu = buts_par_seance_unique.groupby(["Jeu", "Joueur"])["Buts_encaisses"].mean().reset_index()
-            buts_par_jeu["Jeu_str"] = buts_par_jeu["Jeu"].astype(str)
-            
+        if buts_par_jeu is not None:
             chart_g1 = (
-                alt.Chart(buts_par_jeu)
+                alt.Chart(chart_data(buts_par_jeu, ["Jeu", "Jeu_str", "Joueur", "Buts_encaisses"]))
                 .mark_bar()
                 .encode(
                     x=alt.X("Jeu_str:O", title="Numéro du jeu"),
@@ -607,7 +553,7 @@ elif page == "Gardiens":
                     tooltip=["Jeu", "Joueur", "Buts_encaisses"]
                 ).interactive()
             )
-            st.altair_chart(chart_g1, use_container_width=True)
+            show_chart(("gardiens_g1", data_version, mois_sel_g1, semaine_sel_g1, jeu_range_g1, gardiens_sel_g1), chart_g1)
         else:
             st.warning("Aucune donnée pour les filtres choisis (G1).")
 
@@ -616,26 +562,16 @@ elif page == "Gardiens":
         # ========================
         # Graphique 2 - Buts encaissés moyens par type de séance
         st.subheader("Graphique 2 — Buts encaissés moyens par type de séance")
-        mois_sel_g2 = st.multiselect("Mois (G2)", months_all, default=months_all, key="mois_g2")
-        semaine_sel_g2 = st.multiselect("Semaine (G2)", semaines_all, default=semaines_all, key="semaine_g2")
-        jeu_range_g2 = st.slider("Plage de jeux (G2)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key="jeu_g2")
-        gardiens_sel_g2 = st.multiselect("Gardiens (G2)", gardiens_all, default=gardiens_all, key="gardiens_g2")
-
-        mask_g2 = (
-            (df["Postes"] == "Gardien") &
-            (df["Mois"].isin(mois_sel_g2)) &
-            (df["Semaine"].isin(semaine_sel_g2)) &
-            (df["Jeu"].between(jeu_range_g2[0], jeu_range_g2[1])) &
-            (df["Joueur"].isin(gardiens_sel_g2))
-        )
-        df_g2 = df[mask_g2]
+        mois_sel_g2 = st.multiselect("Mois (G2)", months_all, default=months_all, key=f"mois_g2_{saison}")
+        semaine_sel_g2 = st.multiselect("Semaine (G2)", semaines_all, default=semaines_all, key=f"semaine_g2_{saison}")
+        jeu_range_g2 = st.slider("Plage de jeux (G2)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key=f"jeu_g2_{saison}")
+        gardiens_sel_g2 = st.multiselect("Gardiens (G2)", gardiens_all, default=gardiens_all, key=f"gardiens_g2_{saison}")
+
+        buts_par_type_seance = aggregate("goals_by_session_type", data_version, stats, Filters(mois=mois_sel_g2, semaines=semaine_sel_g2, jeu_range=jeu_range_g2, joueurs=gardiens_sel_g2))
         
-        if not df_g2.empty:
-            buts_par_seance_complete = df_g2.groupby(["Mois", "Seance", "Semaine", "Joueur"])["Buts_encaisses"].sum().reset_index()
-            buts_par_type_seance = buts_par_seance_complete.groupby(["Seance", "Joueur"])["Buts_encaisses"].mean().reset_index()
-            
+        if buts_par_type_seance is not None:
             chart_g2 = (
-                alt.Chart(buts_par_type_seance)
+                alt.Chart(chart_data(buts_par_type_seance, ["Seance", "Joueur", "Buts_encaisses"]))
                 .mark_bar()
                 .encode(
                     x=alt.X("Seance:N", title="Type de séance"),
@@ -644,7 +580,7 @@ elif page == "Gardiens":
                     tooltip=["Seance", "Joueur", "Buts_encaisses"]
                 ).interactive()
             )
-            st.altair_chart(chart_g2, use_container_width=True)
+            show_chart(("gardiens_g2", data_version, mois_sel_g2, semaine_sel_g2, jeu_range_g2, gardiens_sel_g2), chart_g2)
         else:
             st.warning("Aucune donnée pour les filtres choisis (G2).")
 
@@ -653,25 +589,16 @@ elif page == "Gardiens":
         # ========================
         # Graphique 3 - Buts encaissés totaux par mois
         st.subheader("Graphique 3 — Buts encaissés totaux par mois")
-        mois_sel_g3 = st.multiselect("Mois (G3)", months_all, default=months_all, key="mois_g3")
-        semaine_sel_g3 = st.multiselect("Semaine (G3)", semaines_all, default=semaines_all, key="semaine_g3")
-        jeu_range_g3 = st.slider("Plage de jeux (G3)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key="jeu_g3")
-        gardiens_sel_g3 = st.multiselect("Gardiens (G3)", gardiens_all, default=gardiens_all, key="gardiens_g3")
-
-        mask_g3 = (
-            (df["Postes"] == "Gardien") &
-            (df["Mois"].isin(mois_sel_g3)) &
-            (df["Semaine"].isin(semaine_sel_g3)) &
-            (df["Jeu"].between(jeu_range_g3[0], jeu_range_g3[1])) &
-            (df["Joueur"].isin(gardiens_sel_g3))
-        )
-        df_g3 = df[mask_g3]
+        mois_sel_g3 = st.multiselect("Mois (G3)", months_all, default=months_all, key=f"mois_g3_{saison}")
+        semaine_sel_g3 = st.multiselect("Semaine (G3)", semaines_all, default=semaines_all, key=f"semaine_g3_{saison}")
+        jeu_range_g3 = st.slider("Plage de jeux (G3)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key=f"jeu_g3_{saison}")
+        gardiens_sel_g3 = st.multiselect("Gardiens (G3)", gardiens_all, default=gardiens_all, key=f"gardiens_g3_{saison}")
+
+        buts_par_mois_complet = aggregate("goals_by_month", data_version, stats, Filters(mois=mois_sel_g3, semaines=semaine_sel_g3, jeu_range=jeu_range_g3, joueurs=gardiens_sel_g3))
         
-        if not df_g3.empty:
-            buts_par_mois_complet = df_g3.groupby(["Mois", "Joueur"])["Buts_encaisses"].sum().reset_index()
-            
+        if buts_par_mois_complet is not None:
             chart_g3 = (
-                alt.Chart(buts_par_mois_complet)
+                alt.Chart(chart_data(buts_par_mois_complet, ["Mois", "Joueur", "Buts_encaisses"]))
                 .mark_bar()
                 .encode(
                     x=alt.X("Mois:N", title="Mois"),
@@ -680,7 +607,7 @@ elif page == "Gardiens":
                     tooltip=["Mois", "Joueur", "Buts_encaisses"]
                 ).interactive()
             )
-            st.altair_chart(chart_g3, use_container_width=True)
+            show_chart(("gardiens_g3", data_version, mois_sel_g3, semaine_sel_g3, jeu_range_g3, gardiens_sel_g3), chart_g3)
         else:
             st.warning("Aucune donnée pour les filtres choisis (G3).")
 
@@ -689,30 +616,16 @@ elif page == "Gardiens":
         # ========================
         # Graphique 4 - Performance individuelle des gardiens
         st.subheader("Graphique 4 — Performance individuelle des gardiens")
-        mois_sel_g4 = st.multiselect("Mois (G4)", months_all, default=months_all, key="mois_g4")
-        semaine_sel_g4 = st.multiselect("Semaine (G4)", semaines_all, default=semaines_all, key="semaine_g4")
-        jeu_range_g4 = st.slider("Plage de jeux (G4)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key="jeu_g4")
-        gardiens_sel_g4 = st.multiselect("Gardiens (G4)", gardiens_all, default=gardiens_all, key="gardiens_g4")
-
-        mask_g4 = (
-            (df["Postes"] == "Gardien") &
-            (df["Mois"].isin(mois_sel_g4)) &
-            (df["Semaine"].isin(semaine_sel_g4)) &
-            (df["Jeu"].between(jeu_range_g4[0], jeu_range_g4[1])) &
-            (df["Joueur"].isin(gardiens_sel_g4))
-        )
-        df_g4 = df[mask_g4]
+        mois_sel_g4 = st.multiselect("Mois (G4)", months_all, default=months_all, key=f"mois_g4_{saison}")
+        semaine_sel_g4 = st.multiselect("Semaine (G4)", semaines_all, default=semaines_all, key=f"semaine_g4_{saison}")
+        jeu_range_g4 = st.slider("Plage de jeux (G4)", min_value=jeux_min, max_value=jeux_max, value=(jeux_min, jeux_max), key=f"jeu_g4_{saison}")
+        gardiens_sel_g4 = st.multiselect("Gardiens (G4)", gardiens_all, default=gardiens_all, key=f"gardiens_g4_{saison}")
+
+        perf_gardiens = aggregate("goalkeeper_performance", data_version, stats, Filters(mois=mois_sel_g4, semaines=semaine_sel_g4, jeu_range=jeu_range_g4, joueurs=gardiens_sel_g4))
         
-        if not df_g4.empty:
-            perf_par_seance_unique = df_g4.groupby(["Joueur", "Mois", "Seance", "Semaine"])["Buts_encaisses"].sum().reset_index()
-            perf_gardiens = perf_par_seance_unique.groupby("Joueur").agg({
-                "Buts_encaisses": ["mean", "sum", "count"]
-            }).round(2)
-            perf_gardiens.columns = ["Moyenne_buts_par_seance", "Total_buts", "Nb_seances"]
-            perf_gardiens = perf_gardiens.reset_index()
-            
+        if perf_gardiens is not None:
             chart_g4 = (
-                alt.Chart(perf_gardiens)
+                alt.Chart(chart_data(perf_gardiens, ["Joueur", "Moyenne_buts_par_seance", "Total_buts", "Nb_seances"]))
                 .mark_bar()
                 .encode(
                     x=alt.X("Joueur:N", title="Gardien"),
@@ -720,7 +633,7 @@ elif page == "Gardiens":
                     tooltip=["Joueur", "Moyenne_buts_par_seance", "Total_buts", "Nb_seances"]
                 ).interactive()
             )
-            st.altair_chart(chart_g4, use_container_width=True)
+            show_chart(("gardiens_g4", data_version, mois_sel_g4, semaine_sel_g4, jeu_range_g4, gardiens_sel_g4), chart_g4)
 
             # ========================
             # Tableau de synthèse gardiens
@@ -739,3 +652,20 @@ elif page == "Gardiens":
 
 st.markdown("---")
 st.caption("Astuce : le slider 'Plage de jeux' filtre les numéros de jeu. Les semaines sont calculées à partir du jour de la semaine.")
+
+# ---------------- Panneau de débogage ----------------
+if show_debug:
+    with st.sidebar.expander("🔧 Débogage", expanded=True):
+        st.caption("Étapes de ce rechargement, en ms")
+        st.dataframe(instrument.spans(run=run_id), use_container_width=True)
+        st.caption("Caches (tout le processus) : succès / échecs depuis la dernière remise à zéro")
+        st.dataframe(instrument.counters(), use_container_width=True)
+        # La table longue reste en mémoire côté chargement (instantané servi ou saison archivée)
+        memory = tables.memory_usage()
+        st.caption(
+            f"Tables compactes de la saison affichée : {memory['Octets'].sum() / 1024:.0f} Ko "
+            f"(table longue chargée : {tables.source_bytes / 1024:.0f} Ko)"
+        )
+        st.dataframe(memory, use_container_width=True)
+        if st.button("Remettre à zéro", key="debug_reset"):
+            instrument.reset()
@@ -0,0 +1 @@
+"""Calculs statistiques Nantes Métropole Futsal, indépendants de l'interface Streamlit."""
@@ -0,0 +1,158 @@
+"""Agrégations des graphiques et classements, à partir des lignes déjà filtrées.
+
+Chaque agrégation renvoie la table affichée par le tableau de bord ; elle
+est calculée par l'une des trois voies suivantes :
+
+- ``CUBE_AGGREGATIONS`` : simples sommes de V / D / N, lues dans le cube de
+  faits (``fact_cube.FactCube``) au lieu d'un groupby sur les lignes ;
+- ``TIMELINE_AGGREGATIONS`` : cumuls lus le long de l'index chronologique
+  (``timeline.SessionTimeline``) ;
+- ``AGGREGATIONS`` : les autres (gardiens), à partir d'une frame non vide de
+  lignes déjà filtrées.
+
+Les colonnes texte peuvent être des catégories (``tables.SeasonTables``) :
+les groupby utilisent ``observed=True`` et les identifiants affichés sont
+construits après conversion en chaînes.
+"""
+
+
+def _result_sums(rows, keys, results=("Victoire", "Défaite")):
+    """Sommes des résultats par ``keys`` (drapeaux int8 élargis en int64 pour ne pas déborder)."""
+    wide = rows.astype({col: "int64" for col in results})
+    return wide.groupby(keys, as_index=False, observed=True).agg({col: "sum" for col in results})
+
+
+def rank_players(counts):
+    """Classement à partir des comptes V / D / N par joueur."""
+    ranking = counts.copy(deep=False)
+    ranking["Total"] = ranking["Victoire"] + ranking["Défaite"]
+    ranking["% Victoire"] = (ranking["Victoire"] / ranking["Total"]).fillna(0)
+
+    # Conversion en entiers pour le formatage
+    for col in ["Victoire", "Défaite", "Nul", "Total"]:
+        ranking[col] = ranking[col].astype(int)
+
+    ranking = ranking.sort_values("% Victoire", ascending=False).reset_index(drop=True)
+    ranking.insert(0, "Position", range(1, len(ranking) + 1))
+    return ranking
+
+
+def season_comparison(rows):
+    """Bilan de chaque joueur par saison (lignes de l'archive, colonne Saison)."""
+    agg = _result_sums(rows, ["Joueur", "Saison"], ("Victoire", "Défaite", "Nul"))
+    agg["Total"] = agg["Victoire"] + agg["Défaite"]
+    agg["% Victoire"] = (agg["Victoire"] / agg["Total"]).fillna(0)
+    for col in ["Victoire", "Défaite", "Nul", "Total"]:
+        agg[col] = agg[col].astype(int)
+    return agg
+
+
+def goalkeeper_performance(rows):
+    """Buts encaissés par gardien : stats par séance unique d'abord, puis les moyennes."""
+    perf_par_seance_unique = rows.groupby(["Joueur", "Mois", "Seance", "Semaine"], observed=True)["Buts_encaisses"].sum().reset_index()
+    perf = perf_par_seance_unique.groupby("Joueur", observed=True).agg({
+        "Buts_encaisses": ["mean", "sum", "count"]
+    }).round(2)
+    perf.columns = ["Moyenne_buts_par_seance", "Total_buts", "Nb_seances"]
+    return perf.reset_index()
+
+
+def goalkeeper_ranking(rows):
+    """Classement des gardiens par moyenne croissante de buts encaissés (moins de buts = meilleur)."""
+    ranking = goalkeeper_performance(rows)
+    ranking = ranking.sort_values("Moyenne_buts_par_seance", ascending=True).reset_index(drop=True)
+    ranking.insert(0, "Position", range(1, len(ranking) + 1))
+    return ranking
+
+
+def win_rate_from_counts(counts):
+    """% de victoires par numéro de jeu (Graphique 1), à partir des comptes V / D par (Jeu, Joueur)."""
+    agg = counts.copy(deep=False)
+    agg["Total"] = agg["Victoire"] + agg["Défaite"]
+    agg["% Victoire"] = (agg["Victoire"] / agg["Total"]).fillna(0)
+    agg["Jeu_str"] = agg["Jeu"].astype(str)
+    return agg
+
+
+def totals_from_counts(counts):
+    """Victoires et défaites par joueur au format long (Graphique 3), à partir des comptes V / D par joueur."""
+    return counts.melt(id_vars="Joueur", value_vars=["Victoire", "Défaite"], var_name="Type", value_name="Nombre")
+
+
+def session_cumulative_table(totals):
+    """% de victoires cumulé par séance (Graphique 2), à partir des cumuls de ``timeline.SessionTimeline``."""
+    par_seance = totals.copy(deep=False)
+    par_seance["Seance_ID"] = par_seance["Mois"].astype(str) + " - " + par_seance["Seance"].astype(str) + " (S" + par_seance["Semaine"].astype(str) + ")"
+    par_seance["% Victoire cumulée"] = (par_seance["Victoire_cum"] / par_seance["Total_cum"]).fillna(0)
+    return par_seance
+
+
+def week_cumulative_table(totals):
+    """% de victoires cumulé par semaine (Graphique 4), à partir des cumuls de ``timeline.SessionTimeline``."""
+    agg = totals.copy(deep=False)
+    agg["Semaine_ID"] = agg["Mois"].astype(str) + " (S" + agg["Semaine"].astype(str) + ")"
+    agg["% Victoire cumulée"] = (agg["Victoire_cum"] / agg["Total_cum"]).fillna(0)
+    return agg
+
+
+def form_by_session_table(form):
+    """Forme par séance (Graphique 6), à partir de ``form.FormEngine.by_session``."""
+    form = form.copy(deep=False)
+    form["Seance_ID"] = form["Mois"].astype(str) + " - " + form["Seance"].astype(str) + " (S" + form["Semaine"].astype(str) + ")"
+    return form
+
+
+def goals_by_game(rows):
+    """Buts encaissés moyens par numéro de jeu (Gardiens, Graphique 1)."""
+    buts_par_seance_unique = rows.groupby(["Mois", "Seance", "Semaine", "Jeu", "Joueur"], observed=True)["Buts_encaisses"].sum().reset_index()
+    buts_par_jeu = buts_par_seance_unique.groupby(["Jeu", "Joueur"], observed=True)["Buts_encaisses"].mean().reset_index()
+    buts_par_jeu["Jeu_str"] = buts_par_jeu["Jeu"].astype(str)
+    return buts_par_jeu
+
+
+def goals_by_session_type(rows):
+    """Buts encaissés moyens par type de séance (Gardiens, Graphique 2)."""
+    buts_par_seance_complete = rows.groupby(["Mois", "Seance", "Semaine", "Joueur"], observed=True)["Buts_encaisses"].sum().reset_index()
+    return buts_par_seance_complete.groupby(["Seance", "Joueur"], observed=True)["Buts_encaisses"].mean().reset_index()
+
+
+def goals_by_month(rows):
+    """Buts encaissés totaux par mois (Gardiens, Graphique 3)."""
+    return rows.groupby(["Mois", "Joueur"], observed=True)["Buts_encaisses"].sum().reset_index()
+
+
+def association_ranking(associations):
+    """Ajoute le % de victoires aux bilans de groupes et les classe (Graphique 5)."""
+    associations = associations.copy(deep=False)
+    associations["Total"] = associations["Victoires"] + associations["Défaites"]
+    associations["% Victoire"] = (associations["Victoires"] / associations["Total"]).fillna(0)
+
+    # Trier par % de victoire décroissant
+    associations = associations.sort_values("% Victoire", ascending=False, kind="stable").reset_index(drop=True)
+    associations.insert(0, "Rang", range(1, len(associations) + 1))
+    return associations
+
+
+# Agrégations calculées sur les lignes filtrées, par nom
+AGGREGATIONS = {
+    "goalkeeper_performance": goalkeeper_performance,
+    "goalkeeper_ranking": goalkeeper_ranking,
+    "goals_by_game": goals_by_game,
+    "goals_by_session_type": goals_by_session_type,
+    "goals_by_month": goals_by_month,
+}
+
+
+# Agrégations calculables depuis le cube de faits :
+# (dimensions conservées, résultats comptés, mise en forme des comptes)
+CUBE_AGGREGATIONS = {
+    "player_ranking": (["Joueur"], ["Victoire", "Défaite", "Nul"], rank_players),
+    "win_rate_by_game": (["Jeu", "Joueur"], ["Victoire", "Défaite"], win_rate_from_counts),
+    "totals_by_player": (["Joueur"], ["Victoire", "Défaite"], totals_from_counts),
+}
+
+# Cumuls lus sur l'index chronologique : (axe de ``timeline.AXES``, mise en forme des cumuls)
+TIMELINE_AGGREGATIONS = {
+    "cumulative_by_session": ("seance", session_cumulative_table),
+    "cumulative_by_week": ("semaine", week_cumulative_table),
+}
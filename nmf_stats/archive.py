@@ -0,0 +1,131 @@
+"""Archive des saisons : une partition Parquet par (Saison, Mois).
+
+Arborescence : ``<racine>/Saison=<saison>/Mois=<mois>/data.parquet``. Les
+colonnes Saison et Mois ne sont pas stockées dans les fichiers : elles sont
+reconstituées à partir des répertoires. Une lecture ne touche que les
+partitions retenues par le filtre Saison / Mois, et le filtre Joueur est
+appliqué par pyarrow pendant la lecture (seuls les groupes de lignes utiles
+sont décodés) : la mémoire dépend de ce qui est lu, pas de la taille de
+l'historique.
+
+Utilisable en ligne de commande pour archiver une saison passée :
+``python -m nmf_stats.archive <racine> <saison> <source>`` (source : classeur
+.xlsx ou dossier de CSV exportés, voir ``sources.make_source``).
+"""
+import hashlib
+import json
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .parsing import COLUMNS
+from .snapshot import frame_hash, write_atomic
+
+PARTITIONING = ds.partitioning(pa.schema([("Saison", pa.string()), ("Mois", pa.string())]), flavor="hive")
+_META_KEY = b"nmf_archive"
+_FILE_NAME = "data.parquet"
+
+
+def _partition_values(root, key):
+    """Valeurs ``key=valeur`` des sous-répertoires de ``root`` (sans lire de données)."""
+    if not os.path.isdir(root):
+        return []
+    prefix = f"{key}="
+    return sorted(d[len(prefix):] for d in os.listdir(root)
+                  if d.startswith(prefix) and os.path.isdir(os.path.join(root, d)))
+
+
+class SeasonArchive:
+    """Archive partitionnée par saison et par mois (voir l'en-tête du module)."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _month_path(self, saison, mois):
+        return os.path.join(self.root, f"Saison={saison}", f"Mois={mois}", _FILE_NAME)
+
+    def seasons(self):
+        return _partition_values(self.root, "Saison")
+
+    def months(self, saison):
+        return _partition_values(os.path.join(self.root, f"Saison={saison}"), "Mois")
+
+    def version(self):
+        """Empreinte de l'archive (taille et date des fichiers) : change dès qu'une partition est réécrite."""
+        entries = []
+        for saison in self.seasons():
+            for mois in self.months(saison):
+                path = self._month_path(saison, mois)
+                if os.path.exists(path):
+                    stat = os.stat(path)
+                    entries.append((saison, mois, stat.st_size, stat.st_mtime_ns))
+        return hashlib.blake2b(repr(entries).encode(), digest_size=16).hexdigest()
+
+    def _stored_hash(self, path):
+        try:
+            return json.loads(pq.read_schema(path).metadata[_META_KEY])["data_hash"]
+        except Exception:
+            return None
+
+    def write_season(self, saison, df):
+        """Écrit (ou remplace) les mois de ``saison`` présents dans ``df``.
+
+        Seuls les mois dont le contenu a changé sont réécrits ; chaque fichier
+        est écrit de manière atomique. Renvoie la liste des mois réécrits.
+        """
+        written = []
+        for mois, part in df.groupby("Mois", sort=False):
+            part = part.drop(columns="Mois").reset_index(drop=True)
+            data_hash = frame_hash(part)
+            path = self._month_path(saison, mois)
+            if self._stored_hash(path) == data_hash:
+                continue
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                _META_KEY: json.dumps({"data_hash": data_hash, "rows": len(part)}).encode(),
+            })
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Préfixe "." : le fichier temporaire (unique) est ignoré par les lectures en cours
+            write_atomic(table, path, prefix=f".{_FILE_NAME}.")
+            written.append(mois)
+        return written
+
+    def load(self, saisons=None, mois=None, joueurs=None, columns=None):
+        """Lit les lignes archivées, filtrées à la lecture.
+
+        ``saisons`` / ``mois`` sélectionnent les partitions lues, ``joueurs``
+        est poussé dans la lecture Parquet et ``columns`` limite les colonnes
+        décodées. Renvoie une frame aux colonnes de ``parsing.COLUMNS`` (plus
+        ``Saison``), ou seulement celles de ``columns``.
+        """
+        if columns is None:
+            columns = COLUMNS + ["Saison"]
+        if not self.seasons():
+            return pd.DataFrame(columns=columns)
+        dataset = ds.dataset(self.root, format="parquet", partitioning=PARTITIONING)
+        predicate = None
+        for field, values in (("Saison", saisons), ("Mois", mois), ("Joueur", joueurs)):
+            if values is None:
+                continue
+            condition = ds.field(field).isin(pa.array([str(v) for v in values], type=pa.string()))
+            predicate = condition if predicate is None else predicate & condition
+        table = dataset.to_table(columns=list(columns), filter=predicate)
+        return table.to_pandas()
+
+
+if __name__ == "__main__":
+    from .sources import load_season, make_source
+
+    if len(sys.argv) != 4:
+        sys.exit("usage : python -m nmf_stats.archive <racine> <saison> <source>")
+    root, saison, spec = sys.argv[1:]
+    df, errors = load_season(make_source(spec))
+    for sheet_name, e in errors:
+        print(f"Erreur lecture feuille {sheet_name}: {e}", file=sys.stderr)
+    written = SeasonArchive(root).write_season(saison, df)
+    print(f"{saison} : {len(df)} lignes, mois réécrits : {', '.join(written) or 'aucun'}")
@@ -0,0 +1,274 @@
+"""Associations de joueurs (paires, triplettes, quatuors) et leur bilan commun.
+
+Un "jeu" est identifié par (Mois, Seance, Semaine, Jeu). Pour chaque jeu, tous
+les groupes de k joueurs présents sont comptés avec le résultat du jeu (celui
+de la première ligne du jeu, comme dans le tableau de bord).
+
+Les joueurs sont codés en entiers (dans l'ordre alphabétique) et chaque groupe
+en une clé entière unique ; les combinaisons sont générées en bloc pour tous
+les jeux ayant le même nombre de joueurs, puis comptées avec NumPy.
+"""
+import heapq
+from collections import namedtuple
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .instrument import span
+
+MATCH_KEYS = ["Mois", "Seance", "Semaine", "Jeu"]
+ASSOCIATION_COLUMNS = ["Groupe", "Victoires", "Défaites", "Nb_jeux"]
+
+_BLOCK_SIZE = 1_000_000  # nombre de groupes générés par bloc (borne la mémoire)
+_TOP_BLOCK_SIZE = 65_536  # nombre de groupes sommés par bloc dans ``AssociationCube.top``
+
+# Résumé d'une recherche des meilleurs groupes : nombre de groupes retenus,
+# meilleur groupe et groupe le plus actif (lignes au format ``ASSOCIATION_COLUMNS``)
+AssociationSummary = namedtuple("AssociationSummary", ["groupes", "meilleur", "plus_actif"])
+
+
+# Compositions des jeux : ``joueurs`` est le tableau trié des noms (l'identifiant
+# d'un joueur est sa position) ; les identifiants des joueurs du jeu ``m`` sont
+# ``players[offsets[m]:offsets[m + 1]]`` (triés) ; ``victoire``/``defaite``
+# donnent le résultat de chaque jeu et ``first_row`` la position de sa première ligne.
+Rosters = namedtuple("Rosters", ["joueurs", "players", "offsets", "victoire", "defaite", "first_row"])
+
+
+def match_rosters(df):
+    """Regroupe les lignes par jeu en une seule passe (voir ``Rosters``)."""
+    match_idx = df.groupby(MATCH_KEYS, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+    joueurs, player_idx = np.unique(df["Joueur"].to_numpy(dtype=object).astype(str), return_inverse=True)
+    n_matches = int(match_idx.max()) + 1 if len(match_idx) else 0
+
+    # Résultat du jeu : celui de sa première ligne
+    first = np.full(n_matches, len(match_idx), dtype=np.int64)
+    np.minimum.at(first, match_idx, np.arange(len(match_idx)))
+    victoire = np.nan_to_num(df["Victoire"].to_numpy(dtype=float)[first]).astype(np.int64)
+    defaite = np.nan_to_num(df["Défaite"].to_numpy(dtype=float)[first]).astype(np.int64)
+
+    # Joueurs distincts de chaque jeu, triés par identifiant
+    pairs = np.unique(np.stack([match_idx, player_idx], axis=1), axis=0) if len(match_idx) else np.zeros((0, 2), dtype=np.int64)
+    match_offsets = np.searchsorted(pairs[:, 0], np.arange(n_matches + 1))
+    return Rosters(joueurs, pairs[:, 1].astype(np.int64), match_offsets, victoire, defaite, first)
+
+
+def _prune_players(match_players, match_offsets, keep_player):
+    """Retire des jeux les joueurs exclus (``keep_player`` faux) et recalcule les bornes."""
+    kept = keep_player[match_players]
+    match_of = np.repeat(np.arange(len(match_offsets) - 1), np.diff(match_offsets))
+    new_offsets = np.zeros(len(match_offsets), dtype=np.int64)
+    np.cumsum(np.bincount(match_of[kept], minlength=len(match_offsets) - 1), out=new_offsets[1:])
+    return match_players[kept], new_offsets
+
+
+def iter_group_keys(match_players, match_offsets, k, n_players, match_ids=None):
+    """Génère, par blocs, les clés des groupes de ``k`` joueurs de chaque jeu.
+
+    Produit des couples ``(cles, jeux)`` : ``cles[i]`` encode un groupe trié
+    ``(a, b, ...)`` en ``((a * P + b) * P + ...)`` avec ``P = n_players`` et
+    ``jeux[i]`` est l'indice du jeu correspondant.
+    """
+    sizes = np.diff(match_offsets)
+    if match_ids is None:
+        match_ids = np.arange(len(sizes))
+    for n in np.unique(sizes[sizes >= k]):
+        combo_idx = np.array(list(combinations(range(n), k)), dtype=np.int64)  # (C(n, k), k)
+        all_sel = match_ids[sizes == n]
+        all_starts = match_offsets[:-1][sizes == n]
+        step = max(1, _BLOCK_SIZE // len(combo_idx))
+        for b in range(0, len(all_sel), step):
+            sel, starts = all_sel[b:b + step], all_starts[b:b + step]
+            roster = match_players[starts[:, None] + np.arange(n)]  # (jeux, n)
+            groups = roster[:, combo_idx]  # (jeux, C(n, k), k)
+            keys = np.zeros(groups.shape[:2], dtype=np.int64)
+            for j in range(k):
+                keys = keys * n_players + groups[:, :, j]
+            yield keys.ravel(), np.repeat(sel, len(combo_idx))
+
+
+def decode_group_keys(keys, k, joueurs):
+    """Retrouve les noms ``"A & B & ..."`` à partir des clés de groupes."""
+    keys = np.asarray(keys, dtype=np.int64).copy()
+    members = np.empty((len(keys), k), dtype=np.int64)
+    for j in range(k - 1, -1, -1):
+        members[:, j] = keys % len(joueurs)
+        keys //= len(joueurs)
+    names = joueurs[members]
+    return np.array([" & ".join(row) for row in names], dtype=object)
+
+
+def count_associations(df, k, min_games=1):
+    """Bilan (victoires, défaites, jeux) de chaque groupe de ``k`` joueurs ayant joué au moins ``min_games`` jeux.
+
+    ``df`` contient les lignes des joueurs de champ déjà filtrées. Renvoie une
+    frame ``ASSOCIATION_COLUMNS`` triée par nom de groupe.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=ASSOCIATION_COLUMNS)
+    joueurs, match_players, match_offsets, victoire, defaite, _ = match_rosters(df)
+    n_players = len(joueurs)
+
+    # Élagage précoce : un groupe ne peut pas avoir plus de jeux que chacun de ses membres
+    if min_games > 1:
+        player_games = np.bincount(match_players, minlength=n_players)
+        match_players, match_offsets = _prune_players(match_players, match_offsets, player_games >= min_games)
+
+    with span("associations.enumerate", k=k):
+        blocks = list(iter_group_keys(match_players, match_offsets, k, n_players))
+    if not blocks:
+        return pd.DataFrame(columns=ASSOCIATION_COLUMNS)
+    keys = np.concatenate([b[0] for b in blocks])
+    matches = np.concatenate([b[1] for b in blocks])
+
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    nb_jeux = np.bincount(inverse, minlength=len(uniq))
+    victoires = np.bincount(inverse, weights=victoire[matches], minlength=len(uniq)).astype(np.int64)
+    defaites = np.bincount(inverse, weights=defaite[matches], minlength=len(uniq)).astype(np.int64)
+
+    keep = nb_jeux >= min_games
+    result = pd.DataFrame({
+        "Groupe": decode_group_keys(uniq[keep], k, joueurs),
+        "Victoires": victoires[keep],
+        "Défaites": defaites[keep],
+        "Nb_jeux": nb_jeux[keep],
+    }, columns=ASSOCIATION_COLUMNS)
+    return result.sort_values("Groupe").reset_index(drop=True)
+
+
+class AssociationCube:
+    """Bilans partiels de tous les groupes de 2 à 4 joueurs, pré-agrégés par (Mois, Semaine, Jeu).
+
+    Construit une fois par chargement des données (lignes des joueurs de champ,
+    sans filtre). Un filtre Mois / Semaine / plage de jeux ne fait ensuite que
+    sommer les bilans partiels des cellules retenues, sans ré-énumérer les
+    combinaisons. Un jeu appartient à une seule cellule : le résultat est le
+    même que ``count_associations`` sur les lignes filtrées.
+    """
+
+    def __init__(self, df, sizes=(2, 3, 4)):
+        self.sizes = tuple(sizes)
+        self._levels = {}
+        if df.empty:
+            self.joueurs = np.array([], dtype=str)
+            self.cell_mois = self.cell_semaine = self.cell_jeu = np.array([])
+            self.cell_games = np.array([], dtype=np.int64)
+            return
+
+        rosters = match_rosters(df)
+        self.joueurs = rosters.joueurs
+        n_players = len(rosters.joueurs)
+
+        # Cellule (Mois, Semaine, Jeu) de chaque jeu
+        first = df.iloc[rosters.first_row]
+        cell_of_match, cells = pd.MultiIndex.from_arrays(
+            [first["Mois"].to_numpy(dtype=object), first["Semaine"].to_numpy(), first["Jeu"].to_numpy()]
+        ).factorize()
+        self.cell_mois = cells.get_level_values(0).to_numpy(dtype=object)
+        self.cell_semaine = cells.get_level_values(1).to_numpy()
+        self.cell_jeu = cells.get_level_values(2).to_numpy()
+        self.cell_games = np.bincount(cell_of_match, minlength=len(cells))
+
+        for k in self.sizes:
+            with span("associations.enumerate", k=k):
+                blocks = list(iter_group_keys(rosters.players, rosters.offsets, k, n_players))
+            if not blocks:
+                continue
+            keys = np.concatenate([b[0] for b in blocks])
+            matches = np.concatenate([b[1] for b in blocks])
+            group_keys, group_idx = np.unique(keys, return_inverse=True)
+
+            # Une ligne par couple (groupe, cellule) présent, triée par groupe
+            part, part_idx = np.unique(group_idx * len(cells) + cell_of_match[matches], return_inverse=True)
+            group = (part // len(cells)).astype(np.int32)
+            self._levels[k] = {
+                "group_keys": group_keys,
+                "cell": (part % len(cells)).astype(np.int32),
+                "group": group,
+                "group_offsets": np.searchsorted(group, np.arange(len(group_keys) + 1)),
+                "games": np.bincount(part_idx, minlength=len(part)).astype(np.int32),
+                "wins": np.bincount(part_idx, weights=rosters.victoire[matches], minlength=len(part)).astype(np.int32),
+                "losses": np.bincount(part_idx, weights=rosters.defaite[matches], minlength=len(part)).astype(np.int32),
+            }
+
+    def cell_mask(self, mois=None, semaines=None, jeu_range=None):
+        mask = np.ones(len(self.cell_games), dtype=bool)
+        if mois is not None:
+            mask &= np.isin(self.cell_mois, list(mois))
+        if semaines is not None:
+            mask &= np.isin(self.cell_semaine, list(semaines))
+        if jeu_range is not None:
+            mask &= (self.cell_jeu >= jeu_range[0]) & (self.cell_jeu <= jeu_range[1])
+        return mask
+
+    def match_count(self, mois=None, semaines=None, jeu_range=None):
+        """Nombre de jeux retenus par le filtre."""
+        return int(self.cell_games[self.cell_mask(mois, semaines, jeu_range)].sum())
+
+    def top(self, k, n, mois=None, semaines=None, jeu_range=None, min_games=1):
+        """Les ``n`` meilleurs groupes de ``k`` joueurs (par % de victoires) et un résumé, sans classer tous les groupes.
+
+        Les bilans sont sommés par blocs de groupes consécutifs ; chaque bloc
+        ne propose que ses ``n`` meilleurs candidats à un tas de taille ``n``,
+        et le résumé (nombre de groupes, groupe le plus actif) est tenu au fil
+        des blocs : la mémoire dépend de la taille des blocs et de ``n``, pas
+        du nombre de groupes. À % égal, l'ordre suit la clé du groupe (ordre
+        alphabétique des joueurs). Renvoie ``(frame, AssociationSummary)`` ; la
+        frame (format ``ASSOCIATION_COLUMNS``) est dans l'ordre du classement.
+        """
+        empty = pd.DataFrame(columns=ASSOCIATION_COLUMNS)
+        level = self._levels.get(k)
+        if level is None:
+            return empty, AssociationSummary(0, None, None)
+        cell_keep = self.cell_mask(mois, semaines, jeu_range)
+        offsets = level["group_offsets"]
+        n_groups = len(level["group_keys"])
+
+        heap = []  # (taux, -clé, victoires, défaites, jeux) : le moins bon groupe en tête
+        count = 0
+        most_active = None  # (jeux, taux, -clé, victoires, défaites)
+        for g0 in range(0, n_groups, _TOP_BLOCK_SIZE):
+            g1 = min(g0 + _TOP_BLOCK_SIZE, n_groups)
+            r0, r1 = offsets[g0], offsets[g1]
+            rows = cell_keep[level["cell"][r0:r1]]
+            group = level["group"][r0:r1][rows] - g0
+            size = g1 - g0
+            nb_jeux = np.bincount(group, weights=level["games"][r0:r1][rows], minlength=size).astype(np.int64)
+            victoires = np.bincount(group, weights=level["wins"][r0:r1][rows], minlength=size).astype(np.int64)
+            defaites = np.bincount(group, weights=level["losses"][r0:r1][rows], minlength=size).astype(np.int64)
+
+            kept = np.flatnonzero((nb_jeux >= min_games) & (nb_jeux > 0))
+            if len(kept) == 0:
+                continue
+            count += len(kept)
+            total = victoires[kept] + defaites[kept]
+            rate = np.divide(victoires[kept], total, out=np.zeros(len(kept)), where=total > 0)
+            keys = level["group_keys"][g0 + kept]
+
+            # Candidats du bloc : les n meilleurs (taux décroissant, puis clé croissante)
+            order = np.lexsort((keys, -rate))[:n]
+            for i in order:
+                item = (rate[i], -int(keys[i]), int(victoires[kept[i]]), int(defaites[kept[i]]), int(nb_jeux[kept[i]]))
+                if len(heap) < n:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+            i = np.lexsort((keys, -rate, -nb_jeux[kept]))[0]
+            candidate = (int(nb_jeux[kept[i]]), rate[i], -int(keys[i]), int(victoires[kept[i]]), int(defaites[kept[i]]))
+            if most_active is None or candidate > most_active:
+                most_active = candidate
+
+        if count == 0:
+            return empty, AssociationSummary(0, None, None)
+        best = sorted(heap, reverse=True)
+        names = decode_group_keys([-item[1] for item in best] + [-most_active[2]], k, self.joueurs)
+        result = pd.DataFrame({
+            "Groupe": names[:-1],
+            "Victoires": [item[2] for item in best],
+            "Défaites": [item[3] for item in best],
+            "Nb_jeux": [item[4] for item in best],
+        }, columns=ASSOCIATION_COLUMNS)
+        plus_actif = pd.Series({"Groupe": names[-1], "Victoires": most_active[3],
+                                "Défaites": most_active[4], "Nb_jeux": most_active[0]})
+        return result, AssociationSummary(count, result.iloc[0], plus_actif)
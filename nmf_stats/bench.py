@@ -0,0 +1,211 @@
+"""Banc d'essai : temps et mémoire de pointe des traitements du tableau de bord.
+
+Une saison fictive (``synthetic``) est analysée puis passée dans les mêmes
+traitements que le tableau de bord : lecture des feuilles (en mémoire, puis
+par les sources classeur .xlsx et dossier de CSV sur les mêmes feuilles
+écrites dans un dossier temporaire), tables compactes, classement (cube de
+faits), cumuls des Graphiques 2 et 4, associations du Graphique 5 (k = 2, 3,
+4), bilans des paires (Graphique 7) et Elo (saison complète, puis ajout de la
+dernière séance à la notation des précédentes). ``--seasons`` ajoute des saisons
+passées à une archive temporaire, lue en entier et comparée saison par saison
+comme la page Classement. Chaque mesure donne le meilleur temps sur plusieurs
+répétitions et la mémoire de pointe (``tracemalloc``, mesurée à part pour ne
+pas fausser le temps ; la mémoire allouée par pyarrow pour l'archive n'y
+figure pas).
+
+Les résultats sont écrits en JSON ; comparés à une référence, ils signalent
+les mesures plus lentes ou plus gourmandes que la tolérance et le code de
+sortie vaut 1 :
+
+    python -m nmf_stats.bench --save benchmarks/baseline.json
+    python -m nmf_stats.bench --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .aggregations import TIMELINE_AGGREGATIONS
+from .archive import SeasonArchive
+from .associations import AssociationCube, count_associations
+from .fact_cube import FactCube
+from .pairs import PairMatrix
+from .ratings import rate_players, update_ratings
+from .sources import SEASON, CsvFolderSource, ExcelSource, load_season
+from .stats import SeasonStats, compare_seasons
+from .synthetic import MONTHS, SyntheticSource, synthetic_season
+from .tables import SeasonTables
+from .timeline import SessionTimeline, update_timeline
+
+ASSOCIATION_SIZES = (2, 3, 4)
+TIME_TOLERANCE = 1.5    # plus de 50 % plus lent que la référence : régression
+MEMORY_TOLERANCE = 1.25
+
+
+def _measure(func, repeat):
+    """(meilleur temps en secondes, mémoire de pointe en octets) de ``func()``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def _season_name(offset):
+    # Saison courante (offset 0) puis les précédentes : "2025-2026", "2024-2025"...
+    start = int(SEASON[:4]) - offset
+    return f"{start}-{start + 1}"
+
+
+def write_sources(sheets, folder):
+    """Écrit les feuilles dans ``folder`` : un classeur et un dossier de CSV ; renvoie les deux sources."""
+    xlsx_path = os.path.join(folder, "saison.xlsx")
+    with pd.ExcelWriter(xlsx_path, engine="openpyxl") as writer:
+        for sheet_name, raw in sheets.items():
+            raw.to_excel(writer, sheet_name=sheet_name, header=False, index=False)
+    csv_folder = os.path.join(folder, "csv")
+    os.makedirs(csv_folder)
+    for sheet_name, raw in sheets.items():
+        raw.to_csv(os.path.join(csv_folder, f"{sheet_name}.csv"), header=False, index=False)
+    return ExcelSource(xlsx_path), CsvFolderSource(csv_folder)
+
+
+def workloads(sheets, folder, past_seasons=()):
+    """Traitements mesurés, dans l'ordre : ``[(nom, fonction)]``.
+
+    Chaque étape reprend le résultat de la précédente (calculé une fois hors
+    mesure), comme le tableau de bord avec ses caches. Les fichiers des
+    sources et l'archive (saison courante et ``past_seasons``, feuilles
+    brutes des saisons précédentes) sont écrits dans ``folder``.
+    """
+    source = SyntheticSource(sheets)
+    df, _ = load_season(source)
+    excel_source, csv_source = write_sources(sheets, folder)
+    archive = SeasonArchive(os.path.join(folder, "archive"))
+    archive.write_season(_season_name(0), df)
+    for offset, past in enumerate(past_seasons, start=1):
+        archive.write_season(_season_name(offset), load_season(SyntheticSource(past))[0])
+    # Mêmes calculs que les pages (API ``stats``), structures construites hors mesure
+    stats = SeasonStats(df)
+    players = stats.players
+    for name in ("fact_cube", "timeline", "association_cube", "pair_matrix"):
+        getattr(stats, name)
+
+    steps = [
+        ("parse", lambda: load_season(source)),
+        ("parse_xlsx", lambda: load_season(excel_source)),
+        ("parse_csv", lambda: load_season(csv_source)),
+        ("tables", lambda: SeasonTables(df)),
+        ("fact_cube", lambda: FactCube(players)),
+        ("classement", lambda: stats.player_ranking()),
+        ("timeline", lambda: SessionTimeline.build(players)),
+    ]
+    for name in TIMELINE_AGGREGATIONS:
+        steps.append((name, lambda name=name: stats.aggregate(name)))
+    steps.append(("association_cube", lambda: AssociationCube(players)))
+    for k in ASSOCIATION_SIZES:
+        steps.append((f"g5_top_k{k}", lambda k=k: stats.association_cube.top(k, 50, min_games=5)))
+        steps.append((f"g5_count_k{k}", lambda k=k: count_associations(players, k, min_games=5)))
+    steps.append(("pair_matrix", lambda: PairMatrix(players)))
+    steps.append(("pair_table", lambda: stats.pair_table(min_games=5)))
+    # Elo : notation complète, puis prolongement d'une notation arrêtée avant la dernière séance
+    period = stats.timeline.axes["seance"].row_pos
+    before_last = players.iloc[:int(np.flatnonzero(period == period[-1])[0])]
+    previous = update_ratings(None, before_last, update_timeline(None, before_last))
+    steps.append(("elo", lambda: rate_players(players, stats.timeline)))
+    steps.append(("elo_update", lambda: update_ratings(previous, players, stats.timeline)))
+    steps.append(("archive_load", lambda: archive.load()))
+    compared = sorted(df.loc[df["Postes"] != "Gardien", "Joueur"].unique())[:5]
+    steps.append(("compare_seasons", lambda: compare_seasons(archive, compared)))
+    return steps
+
+
+def run(months=10, players=30, sessions=20, games=6, per_game=10, seed=0, repeat=3, only=None, seasons=3):
+    """Mesure tous les traitements ; renvoie le dictionnaire écrit en JSON."""
+    options = dict(n_players=players, sessions=sessions, games_per_session=games, players_per_game=per_game)
+    sheets = synthetic_season(months, seed=seed, **options)
+    past_seasons = [synthetic_season(months, seed=seed + s, **options) for s in range(1, seasons)]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="nmf-bench-") as folder:
+        for name, func in workloads(sheets, folder, past_seasons):
+            if only and name not in only:
+                continue
+            seconds, peak = _measure(func, repeat)
+            results[name] = {"seconds": round(seconds, 6), "peak_bytes": int(peak)}
+    return {
+        "config": {"months": months, "seasons": seasons, "players": players, "sessions": sessions,
+                   "games": games, "per_game": per_game, "seed": seed, "repeat": repeat},
+        "environment": {"python": platform.python_version(), "numpy": np.__version__,
+                        "pandas": pd.__version__, "machine": platform.machine()},
+        "results": results,
+    }
+
+
+def compare(report, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """Mesures en régression par rapport à ``baseline`` : liste de messages."""
+    regressions = []
+    if report["config"] != baseline["config"]:
+        regressions.append(f"configuration différente de la référence : {baseline['config']}")
+    for name, ref in baseline["results"].items():
+        cur = report["results"].get(name)
+        if cur is None:
+            continue
+        if cur["seconds"] > ref["seconds"] * time_tolerance:
+            regressions.append(f"{name} : {cur['seconds'] * 1000:.1f} ms (référence {ref['seconds'] * 1000:.1f} ms)")
+        if cur["peak_bytes"] > ref["peak_bytes"] * memory_tolerance:
+            regressions.append(f"{name} : {cur['peak_bytes'] / 2**20:.1f} Mo (référence {ref['peak_bytes'] / 2**20:.1f} Mo)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m nmf_stats.bench", description="Banc d'essai du tableau de bord.")
+    parser.add_argument("--months", type=int, default=10, help="mois (feuilles) de chaque saison fictive, 12 au plus")
+    parser.add_argument("--seasons", type=int, default=3, help="saisons de l'archive, saison courante comprise")
+    parser.add_argument("--players", type=int, default=30, help="joueurs de champ")
+    parser.add_argument("--sessions", type=int, default=20, help="séances par mois")
+    parser.add_argument("--games", type=int, default=6, help="jeux par séance")
+    parser.add_argument("--per-game", type=int, default=10, help="joueurs par jeu")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="répétitions (meilleur temps retenu)")
+    parser.add_argument("--only", nargs="*", help="ne mesurer que ces traitements")
+    parser.add_argument("--save", help="écrire les résultats (JSON) dans ce fichier")
+    parser.add_argument("--compare", help="comparer à cette référence (JSON) ; code de sortie 1 en cas de régression")
+    args = parser.parse_args(argv)
+    if not 1 <= args.months <= len(MONTHS):
+        parser.error(f"--months : de 1 à {len(MONTHS)} mois par saison (plus de mois : --seasons)")
+    if args.seasons < 1:
+        parser.error("--seasons : au moins une saison")
+
+    report = run(args.months, args.players, args.sessions, args.games, args.per_game,
+                 args.seed, args.repeat, args.only, args.seasons)
+    for name, res in report["results"].items():
+        print(f"{name:<22} {res['seconds'] * 1000:>10.1f} ms {res['peak_bytes'] / 2**20:>10.1f} Mo")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+            fh.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh))
+        for message in regressions:
+            print(f"RÉGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
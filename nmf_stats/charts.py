@@ -0,0 +1,52 @@
+"""Données et spécifications des graphiques envoyées au navigateur.
+
+Un graphique Altair embarque ses données dans la spécification Vega-Lite :
+seules les colonnes utilisées par l'encodage sont gardées et les courbes
+(une ligne par joueur et par période) sont sous-échantillonnées au-delà d'un
+budget de points. La spécification sérialisée et sa taille sont calculées
+une fois ; le tableau de bord les met en cache par graphique et par filtres.
+"""
+import json
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+
+def chart_data(df, columns):
+    """Colonnes de ``df`` réellement encodées par le graphique (dans cet ordre)."""
+    return df[list(dict.fromkeys(columns))]
+
+
+def downsample_lines(df, x, series, budget):
+    """Réduit une frame de courbes à au plus ``budget`` points.
+
+    ``df`` est triée dans l'ordre de l'axe ``x`` (ordre chronologique des
+    périodes). Le premier et le dernier point de chaque série sont toujours
+    gardés (début de la courbe et valeur finale exacte), puis une période sur
+    ``pas`` pour toutes les séries, le pas étant augmenté jusqu'à tenir dans
+    le budget. Sans dépassement du budget, ``df`` est renvoyée telle quelle ;
+    un budget inférieur à deux points par série ne garde que les extrémités.
+    """
+    if not budget or len(df) <= budget:
+        return df
+    ends = (~df[series].duplicated(keep="first") | ~df[series].duplicated(keep="last")).to_numpy()
+    position = pd.factorize(df[x])[0]
+    # Points ajoutés par chaque période en plus des extrémités
+    per_period = np.bincount(position[~ends], minlength=position.max() + 1)
+    room = budget - int(ends.sum())
+    if room <= 0:
+        return df[ends]
+    step = max(1, int(np.ceil(per_period.sum() / room)))
+    while step < len(per_period) and per_period[::step].sum() > room:
+        step += 1
+    if per_period[::step].sum() > room:
+        return df[ends]
+    return df[(position % step == 0) | ends]
+
+
+def chart_spec(chart):
+    """Spécification Vega-Lite (données comprises) et sa taille JSON en octets."""
+    with alt.data_transformers.disable_max_rows():
+        spec = chart.to_dict()
+    return spec, len(json.dumps(spec, default=str).encode())
@@ -0,0 +1,80 @@
+"""Cube de faits joueurs : nombre de V / D / N par (Joueur, Mois, Semaine, Seance, Jeu).
+
+Construit une fois par chargement des données à partir des lignes des joueurs
+de champ. Les classements et graphiques qui ne font que sommer des résultats
+sont ensuite obtenus en sélectionnant des tranches du cube et en sommant les
+axes non demandés, sans repasser par les lignes brutes.
+"""
+import numpy as np
+import pandas as pd
+
+DIMS = ["Joueur", "Mois", "Semaine", "Seance", "Jeu"]
+RESULTS = ["Victoire", "Défaite", "Nul"]
+
+
+class FactCube:
+    def __init__(self, rows):
+        self.labels = {}
+        codes = []
+        for dim in DIMS:
+            values = rows[dim].to_numpy()
+            if dim in ("Joueur", "Mois", "Seance"):
+                values = values.astype(object).astype(str)
+            self.labels[dim], code = np.unique(values, return_inverse=True)
+            codes.append(code)
+
+        # Code résultat : 0 = V, 1 = D, 2 = N
+        result = np.select(
+            [rows["Victoire"].to_numpy() == 1, rows["Défaite"].to_numpy() == 1, rows["Nul"].to_numpy() == 1],
+            [0, 1, 2], default=-1,
+        )
+        valid = result >= 0
+        shape = tuple(len(self.labels[dim]) for dim in DIMS) + (len(RESULTS),)
+        flat = np.ravel_multi_index(tuple(c[valid] for c in codes) + (result[valid],), shape)
+        self.counts = np.bincount(flat, minlength=int(np.prod(shape))).astype(np.int32).reshape(shape)
+
+    def _selection(self, dim, selected):
+        labels = self.labels[dim]
+        if dim in ("Joueur", "Mois", "Seance"):
+            selected = [str(v) for v in selected]
+        return np.isin(labels, list(selected))
+
+    def reduce(self, keep, joueurs=None, mois=None, semaines=None, seances=None, jeu_range=None):
+        """Somme le cube sur les dimensions absentes de ``keep``, après sélection.
+
+        Renvoie ``(tableau, labels)`` : un tableau d'axes ``keep + [résultat]`` et
+        les labels retenus pour chaque dimension de ``keep``.
+        """
+        filters = {"Joueur": joueurs, "Mois": mois, "Semaine": semaines, "Seance": seances}
+        sub = self.counts
+        labels = dict(self.labels)
+        for axis, dim in enumerate(DIMS):
+            if dim == "Jeu" and jeu_range is not None:
+                sel = (self.labels["Jeu"] >= jeu_range[0]) & (self.labels["Jeu"] <= jeu_range[1])
+            elif filters.get(dim) is not None:
+                sel = self._selection(dim, filters[dim])
+            else:
+                continue
+            sub = np.compress(sel, sub, axis=axis)
+            labels[dim] = labels[dim][sel]
+
+        drop = tuple(i for i, dim in enumerate(DIMS) if dim not in keep)
+        sub = sub.sum(axis=drop, dtype=np.int64)
+        # Réordonne les axes restants dans l'ordre de ``keep``
+        kept_in_cube_order = [dim for dim in DIMS if dim in keep]
+        sub = np.moveaxis(sub, [kept_in_cube_order.index(d) for d in keep], range(len(keep)))
+        return sub, [labels[d] for d in keep]
+
+    def frame(self, keep, results=RESULTS, **filters):
+        """Table longue ``keep + results`` des combinaisons présentes, triée comme un groupby pandas.
+
+        Une combinaison est présente si elle a au moins une ligne (V, D ou N)
+        dans la sélection, comme pour un groupby sur les lignes filtrées.
+        """
+        sub, labels = self.reduce(keep, **filters)
+        present = np.nonzero(sub.sum(axis=-1) > 0)
+        data = {dim: labels[i][present[i]] for i, dim in enumerate(keep)}
+        values = sub[present]
+        for res in results:
+            data[res] = values[:, RESULTS.index(res)]
+        return pd.DataFrame(data, columns=list(keep) + list(results))
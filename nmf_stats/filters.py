@@ -0,0 +1,87 @@
+"""Filtres Mois / Semaine / Jeu / Joueur partagés par tous les graphiques.
+
+Les colonnes filtrées sont encodées une fois en codes entiers au chargement ;
+un filtre devient une table de correspondance booléenne indexée par ces codes.
+Les masques et sous-ensembles de lignes sont mémorisés par combinaison de
+filtres : deux graphiques avec les mêmes sélections partagent les mêmes lignes
+(succès et échecs comptés par ``instrument.count`` sous le nom "filter_index").
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .instrument import count
+
+
+def _encode(values):
+    """Codes entiers et catégories (triées) d'une colonne."""
+    categories, codes = np.unique(values, return_inverse=True)
+    return codes.astype(np.int32), categories
+
+
+def _selection_key(values):
+    return None if values is None else frozenset(values)
+
+
+class FilterIndex:
+    """Index de filtrage d'une table de résultats (joueurs ou gardiens, lecture seule)."""
+
+    def __init__(self, df, max_entries=64):
+        self.df = df
+        self.max_entries = max_entries
+        self.mois_codes, self.mois_values = _encode(df["Mois"].to_numpy(dtype=object).astype(str))
+        self.joueur_codes, self.joueur_values = _encode(df["Joueur"].to_numpy(dtype=object).astype(str))
+        self.semaine_codes, self.semaine_values = _encode(df["Semaine"].to_numpy())
+        self.jeu = df["Jeu"].to_numpy()
+        self._cache = OrderedDict()  # clé de filtre -> (masque, lignes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lookup(codes, values, selected):
+        # Table booléenne par catégorie, puis une seule indexation par les codes
+        return np.isin(values, list(selected))[codes]
+
+    def _compute(self, mois, semaines, jeu_range, joueurs):
+        mask = np.ones(len(self.df), dtype=bool)
+        if mois is not None:
+            mask &= self._lookup(self.mois_codes, self.mois_values, [str(m) for m in mois])
+        if semaines is not None:
+            mask &= self._lookup(self.semaine_codes, self.semaine_values, semaines)
+        if jeu_range is not None:
+            mask &= (self.jeu >= jeu_range[0]) & (self.jeu <= jeu_range[1])
+        if joueurs is not None:
+            mask &= self._lookup(self.joueur_codes, self.joueur_values, [str(j) for j in joueurs])
+        mask.flags.writeable = False
+        return mask
+
+    def _entry(self, mois=None, semaines=None, jeu_range=None, joueurs=None):
+        key = (_selection_key(mois), _selection_key(semaines),
+               None if jeu_range is None else tuple(jeu_range), _selection_key(joueurs))
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+        if entry is not None:
+            count("filter_index", True)
+            return entry
+        count("filter_index", False)
+        mask = self._compute(mois, semaines, jeu_range, joueurs)
+        entry = (mask, self.df.loc[mask])
+        with self._lock:
+            self._cache[key] = entry
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return entry
+
+    def mask(self, **filters):
+        """Masque booléen (lecture seule) des lignes retenues."""
+        return self._entry(**filters)[0]
+
+    def select(self, **filters):
+        """Lignes retenues ; la frame renvoyée est partagée et ne doit pas être modifiée.
+
+        Filtres : ``mois``, ``semaines``, ``joueurs`` (sélections, None = pas
+        de filtre) et ``jeu_range`` (bornes incluses).
+        """
+        return self._entry(**filters)[1]
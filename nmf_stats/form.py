@@ -0,0 +1,122 @@
+"""Forme des joueurs : % de victoires sur les N derniers jeux ou les N dernières séances, et forme exponentielle.
+
+Les lignes de la table joueurs (déjà triées chronologiquement) sont regroupées
+par joueur ; des sommes cumulées des victoires et défaites le long de ces
+séquences donnent le bilan de n'importe quelle fenêtre glissante en O(1) par
+point (différence de deux sommes cumulées). Pour les séances, les lignes sont
+d'abord regroupées par (joueur, séance). Comme ailleurs, les nuls ne comptent
+pas dans le total.
+
+La forme exponentielle est la moyenne pondérée exponentiellement des
+résultats (1 = victoire, 0 = défaite) de chaque joueur, avec une demi-vie
+exprimée en jeux ; un nul ne modifie pas la forme.
+"""
+import numpy as np
+import pandas as pd
+
+# Modes de calcul de la forme et leur libellé
+FORM_MODES = {
+    "jeux": "N derniers jeux",
+    "seances": "N dernières séances",
+    "ewm": "Moyenne exponentielle (demi-vie N jeux)",
+}
+
+
+def _rolling(values, group_first, window):
+    """Somme de ``values`` sur les ``window`` derniers éléments de chaque groupe (sommes cumulées)."""
+    cumsum = np.concatenate([[0], np.cumsum(values)])
+    idx = np.arange(len(values))
+    start = np.maximum(idx - window + 1, group_first)
+    return cumsum[idx + 1] - cumsum[start]
+
+
+def _rate(wins, losses):
+    total = wins + losses
+    return np.divide(wins, total, out=np.zeros(len(total), dtype=float), where=total > 0)
+
+
+class FormEngine:
+    """Séquences chronologiques de chaque joueur, construites une fois par version des données.
+
+    ``players`` est la table joueurs (``parsing.split_records``) et
+    ``timeline`` son ``timeline.SessionTimeline`` (positions des séances).
+    """
+
+    def __init__(self, players, timeline):
+        self.joueurs = np.array(players["Joueur"].cat.categories, dtype=object)
+        player = players["Joueur"].cat.codes.to_numpy().astype(np.int64)
+        # Tri stable par joueur : l'ordre chronologique est conservé dans chaque séquence
+        self.order = np.argsort(player, kind="stable")
+        self.player = player[self.order]
+        self.session = timeline.axes["seance"].row_pos[self.order].astype(np.int64)
+        result = players["Resultat"].cat.codes.to_numpy()[self.order]
+        self.win = (result == 0).astype(np.int64)
+        self.loss = (result == 1).astype(np.int64)
+        self.session_labels = timeline.axes["seance"].labels
+
+    def _select(self, mask):
+        if mask is None:
+            return self.player, self.session, self.win, self.loss
+        keep = np.asarray(mask)[self.order]
+        return self.player[keep], self.session[keep], self.win[keep], self.loss[keep]
+
+    @staticmethod
+    def _group_first(group):
+        # Indice de la première ligne du groupe de chaque ligne (groupes contigus)
+        new_group = np.concatenate([[True], group[1:] != group[:-1]]) if len(group) else np.zeros(0, dtype=bool)
+        return np.maximum.accumulate(np.where(new_group, np.arange(len(group)), 0))
+
+    def by_session(self, mode="jeux", n=10, mask=None):
+        """Forme de chaque joueur à la fin de chacune de ses séances, dans l'ordre chronologique.
+
+        ``mode`` : "jeux" (N derniers jeux), "seances" (N dernières séances) ou
+        "ewm" (demi-vie de N jeux). ``mask`` restreint les lignes prises en compte.
+        Renvoie une frame Joueur, Mois, Semaine, Seance, Forme, Jeux_fenetre.
+        """
+        player, session, win, loss = self._select(mask)
+        if len(player) == 0:
+            return pd.DataFrame(columns=["Joueur", "Mois", "Semaine", "Seance", "Forme", "Jeux_fenetre"])
+
+        # Unités (joueur, séance) : lignes contiguës de même clé
+        unit_key = player * (int(session.max()) + 1) + session
+        unit_start = np.flatnonzero(np.concatenate([[True], unit_key[1:] != unit_key[:-1]]))
+        unit_last = np.concatenate([unit_start[1:], [len(unit_key)]]) - 1
+        unit_player, unit_session = player[unit_start], session[unit_start]
+
+        if mode == "seances":
+            unit_win = np.add.reduceat(win, unit_start)
+            unit_loss = np.add.reduceat(loss, unit_start)
+            first = self._group_first(unit_player)
+            wins, losses = _rolling(unit_win, first, n), _rolling(unit_loss, first, n)
+            forme, jeux = _rate(wins, losses), wins + losses
+        elif mode == "ewm":
+            # Valeur à la dernière ligne de chaque séance ; nuls ignorés (NaN)
+            outcome = np.where(win + loss > 0, win.astype(float), np.nan)
+            ewm = pd.Series(outcome).groupby(player).ewm(halflife=n, ignore_na=True).mean().to_numpy()
+            forme = np.nan_to_num(ewm[unit_last])
+            first = self._group_first(player)
+            jeux = (np.arange(len(player)) - first + 1)[unit_last]
+        else:
+            first = self._group_first(player)
+            wins, losses = _rolling(win, first, n), _rolling(loss, first, n)
+            forme = _rate(wins, losses)[unit_last]
+            jeux = (wins + losses)[unit_last]
+
+        # Ordre chronologique des séances, joueurs par ordre alphabétique dans une séance
+        chrono = np.lexsort((unit_player, unit_session))
+        unit_player, unit_session = unit_player[chrono], unit_session[chrono]
+        labels = self.session_labels
+        return pd.DataFrame({
+            "Joueur": self.joueurs[unit_player],
+            "Mois": np.array(labels["Mois"], dtype=object)[unit_session],
+            "Semaine": np.array(labels["Semaine"])[unit_session],
+            "Seance": np.array(labels["Seance"], dtype=object)[unit_session],
+            "Forme": forme[chrono],
+            "Jeux_fenetre": jeux[chrono],
+        })
+
+    def latest(self, mode="jeux", n=10, mask=None):
+        """Forme actuelle de chaque joueur (à sa dernière séance retenue) : frame Joueur, Forme, Jeux_fenetre."""
+        per_session = self.by_session(mode, n, mask)
+        latest = per_session.groupby("Joueur").tail(1)[["Joueur", "Forme", "Jeux_fenetre"]]
+        return latest.sort_values("Joueur").reset_index(drop=True)
@@ -0,0 +1,162 @@
+"""Mesures légères : durées des étapes (spans) et compteurs de cache.
+
+Activées pour tout le processus par ``NMF_DEBUG=1`` au démarrage (ou
+``set_enabled`` dans un script), désactivées sinon : ``span`` renvoie alors
+un contexte vide partagé et les compteurs ne font rien, le coût se limite à
+un test de drapeau. Activées, chaque span est gardé dans un tampon circulaire
+(derniers ``MAX_SPANS``) et écrit comme une ligne JSON sur le logger
+``nmf_stats.timing`` ; le tableau de bord les affiche dans un panneau de
+débogage.
+
+Chaque span porte l'exécution en cours dans son thread (``set_run``) : le
+tableau de bord marque ainsi chaque rechargement de chaque session et
+n'affiche que ses propres spans. Les spans des threads d'arrière-plan
+(téléchargement et analyse des onglets) n'ont pas d'exécution. Les compteurs
+de cache sont communs au processus.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+MAX_SPANS = 1000
+
+logger = logging.getLogger("nmf_stats.timing")
+
+_enabled = os.environ.get("NMF_DEBUG", "") not in ("", "0")
+_lock = threading.Lock()
+_spans = deque(maxlen=MAX_SPANS)
+_counters = {}  # nom -> [succès, échecs]
+_local = threading.local()
+_NULL = contextlib.nullcontext()
+
+
+def enabled():
+    return _enabled
+
+
+def _configure_logger():
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def set_enabled(flag):
+    """Active ou coupe les mesures (pour tout le processus : scripts et bancs d'essai)."""
+    global _enabled
+    _enabled = bool(flag)
+    if _enabled:
+        _configure_logger()
+
+
+if _enabled:
+    _configure_logger()
+
+
+def set_run(run):
+    """Exécution en cours dans ce thread (ex. un rechargement d'une session), notée sur ses spans."""
+    _local.run = run
+
+
+class _Span:
+    __slots__ = ("name", "fields", "start")
+
+    def __init__(self, name, fields):
+        self.name, self.fields = name, fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record = {"span": self.name, "ms": round((time.perf_counter() - self.start) * 1000, 3),
+                  "thread": threading.current_thread().name, "run": getattr(_local, "run", None), **self.fields}
+        with _lock:
+            _spans.append(record)
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+        return False
+
+
+def span(name, **fields):
+    """Contexte mesurant la durée d'une étape : ``with span("source.fetch", onglet=nom): ...``."""
+    if not _enabled:
+        return _NULL
+    return _Span(name, fields)
+
+
+def count(name, hit):
+    """Compte un succès (``hit``) ou un échec de cache pour ``name``."""
+    if not _enabled:
+        return
+    with _lock:
+        counter = _counters.setdefault(name, [0, 0])
+        counter[0 if hit else 1] += 1
+    logger.info(json.dumps({"cache": name, "hit": bool(hit)}, ensure_ascii=False))
+
+
+def track_cache(name, cache_decorator):
+    """Applique ``cache_decorator`` (``st.cache_data(...)``, ``st.cache_resource``...) en comptant succès / échecs.
+
+    Le corps de la fonction ne s'exécute qu'en cas d'échec : il le signale
+    à l'appel en cours (pile par thread, les appels mis en cache pouvant s'imbriquer).
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            stack = getattr(_local, "stack", None)
+            if stack:
+                stack[-1] = True
+            return func(*args, **kwargs)
+
+        cached = cache_decorator(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            if not _enabled:
+                return cached(*args, **kwargs)
+            stack = _local.__dict__.setdefault("stack", [])
+            stack.append(False)
+            try:
+                with span(f"cache.{name}"):
+                    result = cached(*args, **kwargs)
+            finally:
+                missed = stack.pop()
+            count(name, not missed)
+            return result
+
+        return call
+    return decorate
+
+
+def spans(run=None):
+    """Spans enregistrés (les plus anciens d'abord) : frame span, ms, thread et champs propres.
+
+    ``run`` ne garde que les spans de cette exécution (voir ``set_run``).
+    """
+    with _lock:
+        records = [r for r in _spans if run is None or r["run"] == run]
+    if not records:
+        return pd.DataFrame(columns=["span", "ms", "thread"])
+    return pd.DataFrame(records).drop(columns="run")
+
+
+def counters():
+    """Compteurs de cache : frame Cache, Succès, Échecs."""
+    with _lock:
+        rows = [(name, hits, misses) for name, (hits, misses) in sorted(_counters.items())]
+    return pd.DataFrame(rows, columns=["Cache", "Succès", "Échecs"])
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
@@ -0,0 +1,89 @@
+"""Intervalles de confiance du % de victoires (Wilson et bootstrap).
+
+Un % de victoires calculé sur 4 jeux et un autre sur 40 n'ont pas la même
+précision : les deux méthodes donnent, pour chaque joueur ou groupe, un
+intervalle à 95 % autour de Victoires / (Victoires + Défaites).
+
+Le bootstrap rééchantillonne avec remise les jeux (victoire ou défaite) de
+chaque ligne. Le nombre de victoires d'un rééchantillon de n jeux suit une loi
+binomiale (n, p) ; p est le % observé lissé par une demi-victoire et une
+demi-défaite fictives (``PSEUDO_COUNT``), sans quoi un bilan de 1/1 ou 0/3
+donnerait un intervalle de largeur nulle et passerait devant 30/40 au
+classement par IC bas. Tous les rééchantillons de toutes les lignes sont
+donc tirés en une seule opération NumPy (tableau bilans x rééchantillons),
+par blocs pour borner la mémoire, puis réduits par quantiles. Les lignes de
+même bilan (fréquent pour les groupes) partagent le même tirage.
+"""
+import numpy as np
+
+INTERVAL_METHODS = {
+    "wilson": "Wilson",
+    "bootstrap": "Bootstrap",
+}
+LEVEL = 0.95
+N_BOOTSTRAP = 1000
+PSEUDO_COUNT = 0.5  # victoires et défaites fictives ajoutées à la probabilité de rééchantillonnage
+
+_BLOCK_SIZE = 2_000_000  # nombre de tirages par bloc (lignes x rééchantillons)
+
+
+def _z(level):
+    # Quantile de la loi normale, sans dépendance à scipy (niveaux usuels)
+    return {0.90: 1.6449, 0.95: 1.9600, 0.99: 2.5758}[level]
+
+
+def wilson_interval(wins, totals, level=LEVEL):
+    """Intervalle de Wilson de wins / totals ; NaN quand totals vaut 0."""
+    wins = np.asarray(wins, dtype=float)
+    totals = np.asarray(totals, dtype=float)
+    z = _z(level)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = wins / totals
+        denom = 1 + z ** 2 / totals
+        center = (p + z ** 2 / (2 * totals)) / denom
+        half = z * np.sqrt(p * (1 - p) / totals + z ** 2 / (4 * totals ** 2)) / denom
+    low, high = center - half, center + half
+    empty = totals == 0
+    low[empty], high[empty] = np.nan, np.nan
+    return np.clip(low, 0, 1), np.clip(high, 0, 1)
+
+
+def bootstrap_interval(wins, totals, level=LEVEL, n_boot=N_BOOTSTRAP, seed=0):
+    """Intervalle bootstrap (percentiles) de wins / totals ; NaN quand totals vaut 0.
+
+    Les rééchantillons sont tirés avec la probabilité lissée
+    ``(wins + PSEUDO_COUNT) / (totals + 2 * PSEUDO_COUNT)`` : l'intervalle n'est
+    jamais réduit à un point, même à 0 % ou 100 %. La graine est fixe : un
+    même tableau donne toujours le même intervalle.
+    """
+    wins = np.asarray(wins, dtype=np.int64)
+    totals = np.asarray(totals, dtype=np.int64)
+    low = np.full(len(totals), np.nan)
+    high = np.full(len(totals), np.nan)
+    rows = np.flatnonzero(totals > 0)
+    if len(rows) == 0:
+        return low, high
+
+    # Même bilan, même distribution : un seul tirage par couple (victoires, total) distinct
+    pairs, inverse = np.unique(np.stack([wins[rows], totals[rows]], axis=1), axis=0, return_inverse=True)
+    pair_low, pair_high = np.empty(len(pairs)), np.empty(len(pairs))
+    rng = np.random.default_rng(seed)
+    quantiles = [(1 - level) / 2, (1 + level) / 2]
+    step = max(1, _BLOCK_SIZE // n_boot)
+    for b in range(0, len(pairs), step):
+        n = pairs[b:b + step, 1:2]
+        p = (pairs[b:b + step, 0:1] + PSEUDO_COUNT) / (n + 2 * PSEUDO_COUNT)
+        rates = rng.binomial(n, p, size=(len(n), n_boot)) / n
+        pair_low[b:b + step], pair_high[b:b + step] = np.quantile(rates, quantiles, axis=1)
+    low[rows], high[rows] = pair_low[inverse.ravel()], pair_high[inverse.ravel()]
+    return low, high
+
+
+def add_intervals(table, wins, total, method="wilson", level=LEVEL):
+    """Copie de ``table`` avec les colonnes ``IC bas`` / ``IC haut`` du % de victoires."""
+    interval = bootstrap_interval if method == "bootstrap" else wilson_interval
+    low, high = interval(table[wins].to_numpy(), table[total].to_numpy(), level)
+    table = table.copy(deep=False)
+    table["IC bas"] = low
+    table["IC haut"] = high
+    return table
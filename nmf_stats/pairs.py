@@ -0,0 +1,106 @@
+"""Bilans de toutes les paires de joueurs par produits matriciels.
+
+Avec ``A`` la matrice d'incidence joueurs × jeux (1 si le joueur figure dans
+le jeu, jeux regroupés comme pour le Graphique 5 : ``associations.MATCH_KEYS``)
+et ``v`` / ``d`` le résultat de chaque jeu, ``A Aᵀ`` donne le nombre de jeux
+joués ensemble par chaque paire, ``A diag(v) Aᵀ`` leurs victoires et
+``A diag(d) Aᵀ`` leurs défaites. Les trois produits sont calculés en une
+multiplication (BLAS) sur les seuls jeux retenus par le filtre : les paires
+ne sont jamais énumérées et le résultat est celui de ``count_associations``
+avec ``k = 2``.
+
+L'incidence est construite à partir de ses coefficients non nuls (un par
+joueur et par jeu) ; elle est gardée pleine en ``float32`` car les joueurs
+sont peu nombreux (quelques dizaines × le nombre de jeux de la saison).
+"""
+import numpy as np
+import pandas as pd
+
+from .associations import match_rosters
+from .instrument import span
+
+PAIR_COLUMNS = ["Joueur", "Partenaire", "Victoires", "Défaites", "Nb_jeux", "% Victoire"]
+
+
+class PairMatrix:
+    """Incidence joueurs × jeux des joueurs de champ ; construite une fois par chargement des données."""
+
+    def __init__(self, df):
+        if df.empty:
+            self.joueurs = np.array([], dtype=str)
+            self.incidence = np.zeros((0, 0), dtype=np.float32)
+            self.weights = np.zeros((0, 3), dtype=np.float32)
+            self.match_mois = self.match_semaine = self.match_jeu = np.array([])
+            return
+        rosters = match_rosters(df)
+        self.joueurs = rosters.joueurs
+        n_matches = len(rosters.offsets) - 1
+
+        # Un coefficient par (joueur, jeu) : les joueurs de chaque jeu sont ``players[offsets[m]:offsets[m + 1]]``
+        match_of = np.repeat(np.arange(n_matches), np.diff(rosters.offsets))
+        self.incidence = np.zeros((len(rosters.joueurs), n_matches), dtype=np.float32)
+        self.incidence[rosters.players, match_of] = 1
+        # Poids de chaque jeu : 1 (jeux), victoire, défaite
+        self.weights = np.stack([np.ones(n_matches), rosters.victoire, rosters.defaite], axis=1).astype(np.float32)
+
+        first = df.iloc[rosters.first_row]
+        self.match_mois = first["Mois"].to_numpy(dtype=object).astype(str)
+        self.match_semaine = first["Semaine"].to_numpy()
+        self.match_jeu = first["Jeu"].to_numpy()
+
+    def match_mask(self, mois=None, semaines=None, jeu_range=None):
+        mask = np.ones(self.incidence.shape[1], dtype=bool)
+        if mois is not None:
+            mask &= np.isin(self.match_mois, [str(m) for m in mois])
+        if semaines is not None:
+            mask &= np.isin(self.match_semaine, list(semaines))
+        if jeu_range is not None:
+            mask &= (self.match_jeu >= jeu_range[0]) & (self.match_jeu <= jeu_range[1])
+        return mask
+
+    def counts(self, mois=None, semaines=None, jeu_range=None):
+        """Matrices joueurs × joueurs ``(jeux, victoires, défaites)`` des jeux joués ensemble (entiers).
+
+        La diagonale donne le bilan de chaque joueur.
+        """
+        n = len(self.joueurs)
+        mask = self.match_mask(mois, semaines, jeu_range)
+        with span("pairs.product", jeux=int(mask.sum())):
+            a = self.incidence[:, mask]
+            w = self.weights[mask]
+            # [A ; A diag(v) ; A diag(d)] Aᵀ en un seul produit
+            stacked = (a[None, :, :] * w.T[:, None, :]).reshape(3 * n, -1)
+            product = np.rint(stacked @ a.T).astype(np.int64).reshape(3, n, n)
+        return product[0], product[1], product[2]
+
+    def pair(self, a, b, mois=None, semaines=None, jeu_range=None):
+        """Bilan de la paire ``a`` / ``b`` : ``(victoires, défaites, jeux)`` (zéros si l'un est inconnu)."""
+        i, j = np.searchsorted(self.joueurs, [a, b])
+        if i >= len(self.joueurs) or j >= len(self.joueurs) or self.joueurs[i] != a or self.joueurs[j] != b:
+            return 0, 0, 0
+        mask = self.match_mask(mois, semaines, jeu_range)
+        together = mask & (self.incidence[i] > 0) & (self.incidence[j] > 0)
+        victoires, defaites = self.weights[together, 1:].sum(axis=0)
+        return int(victoires), int(defaites), int(together.sum())
+
+    def table(self, mois=None, semaines=None, jeu_range=None, joueurs=None, min_games=1):
+        """Paires ayant joué au moins ``min_games`` jeux ensemble, au format long (``PAIR_COLUMNS``).
+
+        Chaque paire figure dans les deux sens (matrice symétrique pour une carte
+        de chaleur) ; ``joueurs`` limite les deux membres de la paire.
+        """
+        jeux, victoires, defaites = self.counts(mois, semaines, jeu_range)
+        keep = (jeux >= max(min_games, 1)) & ~np.eye(len(self.joueurs), dtype=bool)
+        if joueurs is not None:
+            selected = np.isin(self.joueurs, [str(j) for j in joueurs])
+            keep &= selected[:, None] & selected[None, :]
+        i, j = np.nonzero(keep)
+        total = victoires[i, j] + defaites[i, j]
+        return pd.DataFrame({
+            "Joueur": self.joueurs[i],
+            "Partenaire": self.joueurs[j],
+            "Victoires": victoires[i, j],
+            "Défaites": defaites[i, j],
+            "Nb_jeux": jeux[i, j],
+            "% Victoire": np.divide(victoires[i, j], total, out=np.zeros(len(i)), where=total > 0),
+        }, columns=PAIR_COLUMNS)
@@ -0,0 +1,260 @@
+"""Conversion vectorisée des feuilles de séances en table longue (une ligne par résultat).
+
+Une feuille a la forme suivante :
+
+- une ligne "jour" (Lundi, Mardi, ...) fusionnée sur les colonnes de la séance ;
+- une ligne "jeu" avec le numéro du jeu dans la séance ;
+- puis une ligne par joueur : nom en colonne A, poste en colonne B, et une
+  cellule V/D/N (ou un nombre de buts encaissés pour les gardiens) par jeu.
+
+La table longue (``COLUMNS``, gardiens et joueurs mélangés) est le format
+d'échange (cache des onglets, instantané, archive). ``split_records`` en tire
+les deux tables utilisées par le tableau de bord : résultats des joueurs de
+champ et buts encaissés des gardiens, typées et triées chronologiquement.
+"""
+import io
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Mois", "Joueur", "Seance", "Jour_index", "Semaine", "Jeu", "Resultat",
+           "Victoire", "Défaite", "Nul", "Postes", "Buts_encaisses"]
+
+# Tables séparées : seules les colonnes utiles à chaque population
+PLAYER_COLUMNS = ["Mois", "Joueur", "Seance", "Jour_index", "Semaine", "Jeu", "Session",
+                  "Resultat", "Victoire", "Défaite", "Nul"]
+GOALKEEPER_COLUMNS = ["Mois", "Joueur", "Seance", "Jour_index", "Semaine", "Jeu", "Session",
+                      "Buts_encaisses"]
+RESULT_CATEGORIES = ["V", "D", "N"]
+
+# Ordre des mois dans la saison (noms sans accents, en minuscules)
+SEASON_MONTHS = ["aout", "septembre", "octobre", "novembre", "decembre", "janvier",
+                 "fevrier", "mars", "avril", "mai", "juin", "juillet"]
+
+DAY_NAMES = {"lundi": 1, "mardi": 2, "mercredi": 3, "jeudi": 4, "vendredi": 5, "samedi": 6, "dimanche": 7}
+
+_INT_RE = re.compile(r'(\d+)')
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except:
+        return np.nan
+
+
+def _header_rows(values):
+    """Repère la ligne des jours et la ligne des numéros de jeu."""
+    nrows = values.shape[0]
+
+    # Ligne des jours : celle (parmi les 6 premières) qui contient le plus de noms de jours
+    head = values[:6, 1:]
+    head_vals = pd.Series(head.ravel(), dtype=object).astype(str).fillna("").str.strip().str.lower()
+    day_scores = head_vals.isin(list(DAY_NAMES)).to_numpy().reshape(head.shape).sum(axis=1)
+    row_jours = int(day_scores.argmax()) if len(day_scores) else 0
+
+    # Ligne des jeux : celle (parmi les 5 suivantes) qui contient le plus de nombres
+    num_block = values[row_jours + 1:row_jours + 6, 1:]
+    if num_block.shape[0] > 0:
+        num_vals = pd.Series(num_block.ravel(), dtype=object).astype(str).fillna("").str.strip()
+        num_scores = num_vals.str.contains(r'\d').to_numpy(dtype=bool).reshape(num_block.shape).sum(axis=1)
+        row_jeux = row_jours + 1 + int(num_scores.argmax())
+    else:
+        row_jeux = min(row_jours + 1, nrows - 1)
+    return row_jours, row_jeux
+
+
+def _column_headers(values, row_jours, row_jeux):
+    """Diffuse les en-têtes jour / jeu / semaine sur les colonnes de résultats (C et suivantes)."""
+    ncols = values.shape[1]
+    cols = np.arange(2, ncols)
+
+    jours_series = pd.Series(values[row_jours], dtype=object).ffill().fillna("Séance inconnue").astype(str).str.strip()
+    jeux_series = pd.Series(values[row_jeux], dtype=object).astype(str).fillna("").str.strip()
+
+    jour_names = jours_series.iloc[2:].to_numpy(dtype=object)
+    jour_index = np.array([DAY_NAMES.get(j.lower(), 0) for j in jour_names], dtype=np.int64)
+
+    jeu_num = pd.to_numeric(jeux_series.iloc[2:].str.extract(_INT_RE, expand=False)).to_numpy()
+    jeu_num = np.where(np.isnan(jeu_num.astype(float)), cols - 1, jeu_num).astype(np.int64)
+
+    # Semaine déduite de la position de la colonne (C-I, J-P, Q-W, puis le reste)
+    semaine = np.select([cols <= 7, cols <= 13, cols <= 19], [1, 2, 3], default=4)
+    semaine = np.where(jour_index > 0, semaine, 1).astype(np.int64)
+    return jour_names, jour_index, jeu_num, semaine
+
+
+def parse_sheet(raw, sheet_name):
+    """Transforme une feuille brute (lue sans en-tête) en enregistrements au format long.
+
+    Le résultat a les colonnes de ``COLUMNS`` ; il n'est pas encore normalisé
+    (voir ``finalize_records``).
+    """
+    nrows, ncols = raw.shape
+    if raw.empty or ncols <= 2:
+        return pd.DataFrame(columns=COLUMNS)
+
+    # Une seule conversion en tableau objet : tout le reste travaille sur des tableaux NumPy
+    values = raw.to_numpy(dtype=object)
+    row_jours, row_jeux = _header_rows(values)
+    jour_names, jour_index, jeu_num, semaine = _column_headers(values, row_jours, row_jeux)
+
+    # Lignes joueurs/gardiens : nom non vide en colonne A
+    players = values[row_jeux + 1:]
+    noms = pd.Series(players[:, 0], dtype=object)
+    has_name = noms.notna().to_numpy() & (noms.astype(str).str.strip() != "").to_numpy(dtype=bool)
+    players = players[has_name]
+    if len(players) == 0:
+        return pd.DataFrame(columns=COLUMNS)
+
+    joueur_names = pd.Series(players[:, 0], dtype=object).astype(str).str.strip().to_numpy(dtype=object)
+    postes_raw = pd.Series(players[:, 1], dtype=object)
+    postes = np.where(postes_raw.isna(), "Joueur", postes_raw.astype(str).str.strip()).astype(object)
+    is_gardien = pd.Series(postes, dtype=object).str.lower().eq("gardien").to_numpy(dtype=bool)
+
+    # Décodage des cellules : chaque valeur distincte n'est décodée qu'une seule fois
+    codes, uniques = pd.factorize(players[:, 2:].ravel())
+    codes = codes.reshape(len(players), ncols - 2)
+    uniques_str = np.array([str(u).strip() for u in uniques], dtype=object)
+    uniques_upper = np.array([u.upper() for u in uniques_str], dtype=object)
+    uniques_ok = (uniques_str != "") if len(uniques) else np.zeros(0, dtype=bool)
+    uniques_vdn = np.isin(uniques_upper, ["V", "D", "N"]) & uniques_ok
+    uniques_buts = np.array([_to_float(u) for u in uniques], dtype=float)
+
+    filled = codes >= 0
+    safe = np.where(filled, codes, 0)
+    if len(uniques):
+        keep_joueur = filled & uniques_vdn[safe]
+        keep_gardien = filled & uniques_ok[safe]
+    else:
+        keep_joueur = keep_gardien = np.zeros(codes.shape, dtype=bool)
+    keep = np.where(is_gardien[:, None], keep_gardien, keep_joueur)
+
+    # Ordre ligne par ligne puis colonne par colonne (comme la saisie)
+    r_idx, c_idx = np.nonzero(keep)
+    if len(r_idx) == 0:
+        return pd.DataFrame(columns=COLUMNS)
+    cell = safe[r_idx, c_idx]
+    gardien = is_gardien[r_idx]
+
+    resultat = np.where(gardien, np.nan, uniques_upper[cell]).astype(object)
+    victoire = np.where(gardien, np.nan, resultat == "V")
+    defaite = np.where(gardien, np.nan, resultat == "D")
+    nul = np.where(gardien, np.nan, resultat == "N")
+    buts = np.where(gardien, uniques_buts[cell], np.nan)
+    if not gardien.any():
+        victoire, defaite, nul = (a.astype(np.int64) for a in (victoire, defaite, nul))
+
+    return pd.DataFrame({
+        "Mois": [str(sheet_name)] * len(r_idx),
+        "Joueur": joueur_names[r_idx].tolist(),
+        "Seance": jour_names[c_idx].tolist(),
+        "Jour_index": jour_index[c_idx],
+        "Semaine": semaine[c_idx],
+        "Jeu": jeu_num[c_idx],
+        "Resultat": resultat.tolist(),
+        "Victoire": victoire,
+        "Défaite": defaite,
+        "Nul": nul,
+        "Postes": postes[r_idx].tolist(),
+        "Buts_encaisses": buts,
+    }, columns=COLUMNS)
+
+
+def parse_csv(content, sheet_name):
+    """Analyse un onglet exporté en CSV (bytes)."""
+    raw = pd.read_csv(io.BytesIO(content), header=None)
+    if raw.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    return parse_sheet(raw, sheet_name)
+
+
+def finalize_records(frames):
+    """Concatène les feuilles analysées et normalise les types."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    # Une feuille sans joueur de champ donne une colonne Resultat vide (float) : on ré-infère
+    df["Resultat"] = df["Resultat"].infer_objects()
+    df["Jeu"] = df["Jeu"].astype(int)
+    df["Seance"] = df["Seance"].fillna("Séance inconnue").astype(str)
+    df["Mois"] = df["Mois"].astype(str)
+    df["Postes"] = df["Postes"].str.strip().str.capitalize()
+    return df
+
+
+def _month_key(name):
+    return unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode().strip().lower()
+
+
+def season_months(names):
+    """Mois distincts de ``names`` dans l'ordre de la saison (août à juillet).
+
+    Les noms inconnus viennent ensuite, dans leur ordre d'apparition.
+    """
+    distinct = list(dict.fromkeys(str(n) for n in names))
+    rank = {m: i for i, m in enumerate(SEASON_MONTHS)}
+    return sorted(distinct, key=lambda m: rank.get(_month_key(m), len(rank)))
+
+
+def _category(values):
+    return pd.Categorical(np.asarray(values, dtype=object).astype(str))
+
+
+def _month_category(values, months):
+    return pd.Categorical(np.asarray(values, dtype=object).astype(str), categories=months, ordered=True)
+
+
+def _typed_table(df, columns, months):
+    """Table d'une population : chaînes en catégories, entiers au plus juste, sans colonne vide."""
+    out = pd.DataFrame({
+        "Mois": _month_category(df["Mois"], months),
+        "Joueur": _category(df["Joueur"]),
+        "Seance": _category(df["Seance"]),
+        "Jour_index": df["Jour_index"].to_numpy().astype(np.int8),
+        "Semaine": df["Semaine"].to_numpy().astype(np.int8),
+        "Jeu": df["Jeu"].to_numpy().astype(np.int16),
+        "Session": df["Session"].to_numpy(),
+    })
+    if "Resultat" in columns:
+        # Codes int8 (catégorie V / D / N) et drapeaux int8
+        out["Resultat"] = pd.Categorical(df["Resultat"].to_numpy(dtype=object), categories=RESULT_CATEGORIES)
+        for col in ["Victoire", "Défaite", "Nul"]:
+            out[col] = np.nan_to_num(df[col].to_numpy(dtype=float)).astype(np.int8)
+    else:
+        out["Buts_encaisses"] = df["Buts_encaisses"].to_numpy(dtype=float)
+    return out[columns]
+
+
+def split_records(df):
+    """Sépare la table longue en ``(joueurs, gardiens, seances)``.
+
+    Les deux premières tables ont les colonnes ``PLAYER_COLUMNS`` et
+    ``GOALKEEPER_COLUMNS`` et sont triées chronologiquement : mois dans l'ordre
+    de la saison (``season_months`` ; Mois est une catégorie ordonnée dans cet
+    ordre), puis semaine, jour et numéro de jeu ; l'ordre de saisie est
+    conservé à égalité. ``Session`` est l'identifiant entier de la séance
+    (Mois, Seance), numéroté dans l'ordre chronologique ; ``seances`` donne le
+    Mois et la Seance de chaque identifiant.
+    """
+    months = season_months(pd.unique(df["Mois"].to_numpy(dtype=object)))
+    month_rank = _month_category(df["Mois"], months).codes
+    order = np.lexsort((df["Jeu"].to_numpy(), df["Jour_index"].to_numpy(), df["Semaine"].to_numpy(), month_rank))
+    df = df.iloc[order]
+
+    session_codes, session_keys = pd.MultiIndex.from_arrays(
+        [df["Mois"].to_numpy(dtype=object), df["Seance"].to_numpy(dtype=object)]
+    ).factorize()
+    seances = pd.DataFrame({
+        "Mois": _month_category(session_keys.get_level_values(0), months),
+        "Seance": _category(session_keys.get_level_values(1)),
+    })
+    seances.index.name = "Session"
+
+    df = df.assign(Session=session_codes.astype(np.int32))
+    gardien = (df["Postes"] == "Gardien").to_numpy()
+    return (_typed_table(df[~gardien], PLAYER_COLUMNS, months),
+            _typed_table(df[gardien], GOALKEEPER_COLUMNS, months), seances)
@@ -0,0 +1,162 @@
+"""Classement Elo des joueurs, à partir de la composition des équipes de chaque jeu.
+
+Un jeu est identifié comme pour les associations (Graphique 5) : même séance
+et même numéro de jeu. Dans un jeu, les joueurs notés V forment l'équipe
+gagnante et ceux notés D l'équipe perdante ; la force d'une équipe est la
+moyenne des Elo de ses joueurs. Chaque joueur de l'équipe gagnante gagne
+``K * (1 - E)`` points et chaque perdant en perd autant, ``E`` étant la
+probabilité de victoire attendue des gagnants. Les jeux sans deux équipes
+identifiables (nuls, un seul camp saisi) ne sont pas notés.
+
+Les jeux sont notés par période d'évaluation (une séance) : tous les jeux
+d'une séance utilisent les Elo du début de séance et leurs variations sont
+appliquées ensemble. Une séance se calcule donc en quelques opérations
+vectorisées, et de nouvelles séances ne font que prolonger la notation
+(``EloRatings.extend``) au lieu de tout recalculer.
+
+Banc d'essai : ``python -m nmf_stats.bench --only elo elo_update``.
+"""
+import numpy as np
+import pandas as pd
+
+from .snapshot import frame_hash
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 24.0
+
+
+def _rate_period(ratings, games, player, match, result, k):
+    """Note les jeux d'une période (Elo du début de période), en place."""
+    match_ids, match = np.unique(match, return_inverse=True)
+    win = result == 0
+    loss = result == 1
+    n_win = np.bincount(match, weights=win, minlength=len(match_ids))
+    n_loss = np.bincount(match, weights=loss, minlength=len(match_ids))
+    valid = (n_win > 0) & (n_loss > 0)
+
+    current = ratings[player]
+    mean_win = np.bincount(match, weights=current * win, minlength=len(match_ids)) / np.maximum(n_win, 1)
+    mean_loss = np.bincount(match, weights=current * loss, minlength=len(match_ids)) / np.maximum(n_loss, 1)
+    expected_win = 1.0 / (1.0 + 10.0 ** ((mean_loss - mean_win) / 400.0))
+    gain = np.where(valid, k * (1.0 - expected_win), 0.0)[match]
+
+    rated = valid[match] & (win | loss)
+    delta = np.where(win, gain, -gain) * rated
+    ratings += np.bincount(player, weights=delta, minlength=len(ratings))
+    games += np.bincount(player, weights=rated, minlength=len(games)).astype(games.dtype)
+
+
+class EloRatings:
+    """Elo courants de chaque joueur ; se prolonge période par période."""
+
+    def __init__(self, k=K_FACTOR, initial=INITIAL_RATING):
+        self.k = k
+        self.initial = initial
+        self.joueurs = []
+        self._code = {}
+        self.ratings = np.zeros(0)
+        self.games = np.zeros(0, dtype=np.int64)
+        self.n_rows = 0
+        self.rows_hash = None
+        # Dernière période notée : elle peut encore recevoir des jeux (séance en cours de saisie)
+        self._last_period = None
+        self._last_rows = None
+        self._before_last = None
+
+    def copy(self):
+        other = EloRatings(self.k, self.initial)
+        other.joueurs, other._code = list(self.joueurs), dict(self._code)
+        other.ratings, other.games = self.ratings.copy(), self.games.copy()
+        other.n_rows, other.rows_hash = self.n_rows, self.rows_hash
+        other._last_period, other._last_rows, other._before_last = self._last_period, self._last_rows, self._before_last
+        return other
+
+    def _codes(self, names):
+        for name in pd.unique(names):
+            if name not in self._code:
+                self._code[name] = len(self.joueurs)
+                self.joueurs.append(name)
+        grow = len(self.joueurs) - len(self.ratings)
+        if grow:
+            self.ratings = np.concatenate([self.ratings, np.full(grow, self.initial)])
+            self.games = np.concatenate([self.games, np.zeros(grow, dtype=np.int64)])
+        return np.array([self._code[name] for name in names], dtype=np.int64)
+
+    def extend(self, names, period, jeu, result):
+        """Note de nouvelles lignes (triées par période), postérieures ou égales à la dernière période notée.
+
+        ``names`` : joueur de chaque ligne ; ``period`` : position chronologique
+        de sa séance ; ``jeu`` : numéro du jeu ; ``result`` : 0 = V, 1 = D, 2 = N.
+        Lève ValueError si les lignes remontent avant la dernière période.
+        """
+        names = np.asarray(names, dtype=object)
+        period, jeu, result = (np.asarray(a, dtype=np.int64) for a in (period, jeu, result))
+        if len(period) == 0:
+            return
+        if self._last_period is not None and period[0] < self._last_period:
+            raise ValueError("Lignes antérieures à la dernière période notée")
+
+        player = self._codes(names)
+        if self._last_period is not None and period[0] == self._last_period:
+            # La dernière période est complétée : on la renote depuis l'état qui la précédait
+            ratings, games = self._before_last
+            self.ratings[:len(ratings)], self.games[:len(games)] = ratings, games
+            self.ratings[len(ratings):], self.games[len(games):] = self.initial, 0
+            last_player, last_jeu, last_result = self._last_rows
+            player = np.concatenate([last_player, player])
+            period = np.concatenate([np.full(len(last_player), self._last_period), period])
+            jeu = np.concatenate([last_jeu, jeu])
+            result = np.concatenate([last_result, result])
+
+        bounds = np.flatnonzero(np.diff(period)) + 1
+        starts = np.concatenate([[0], bounds])
+        ends = np.concatenate([bounds, [len(period)]])
+        for start, end in zip(starts, ends):
+            if end == len(period):
+                self._before_last = (self.ratings.copy(), self.games.copy())
+                self._last_period = int(period[start])
+                self._last_rows = (player[start:end], jeu[start:end], result[start:end])
+            _rate_period(self.ratings, self.games, player[start:end], jeu[start:end], result[start:end], self.k)
+
+    def table(self):
+        """Frame Joueur, Elo, Jeux_notes (par Elo décroissant)."""
+        table = pd.DataFrame({"Joueur": self.joueurs, "Elo": self.ratings.round(0).astype(int), "Jeux_notes": self.games})
+        return table.sort_values("Elo", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _row_arrays(players, timeline, mask=None):
+    period = timeline.axes["seance"].row_pos
+    arrays = (players["Joueur"].astype(str).to_numpy(dtype=object), period,
+              players["Jeu"].to_numpy(), players["Resultat"].cat.codes.to_numpy())
+    if mask is not None:
+        arrays = tuple(a[mask] for a in arrays)
+    return arrays
+
+
+def rate_players(players, timeline, mask=None, k=K_FACTOR):
+    """Elo calculés sur les lignes retenues par ``mask`` (toute la table par défaut)."""
+    ratings = EloRatings(k)
+    ratings.extend(*_row_arrays(players, timeline, mask))
+    ratings.n_rows = len(players)
+    return ratings
+
+
+def update_ratings(previous, players, timeline):
+    """Elo de ``players`` : prolonge ``previous`` si ``players`` n'en est qu'une suite, sinon recalcule tout."""
+    rows_hash = frame_hash(players)
+    if previous is not None and previous.n_rows <= len(players) \
+            and frame_hash(players.iloc[:previous.n_rows]) == previous.rows_hash:
+        ratings = previous.copy()
+        names, period, jeu, result = _row_arrays(players, timeline)
+        n = previous.n_rows
+        try:
+            ratings.extend(names[n:], period[n:], jeu[n:], result[n:])
+        except ValueError:
+            ratings = None
+        if ratings is not None:
+            ratings.n_rows, ratings.rows_hash = len(players), rows_hash
+            return ratings
+    ratings = rate_players(players, timeline)
+    ratings.rows_hash = rows_hash
+    return ratings
+
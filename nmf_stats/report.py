@@ -0,0 +1,153 @@
+"""Export des tableaux standard d'une saison : classements et associations, mois par mois.
+
+Pour la saison entière et pour chaque mois : classement des joueurs (avec
+intervalle de Wilson), classement des gardiens et meilleures associations
+(paires, trios...). Les structures partagées (cube de faits, index des
+gardiens, cube d'associations) sont construites une seule fois ; chaque
+tableau n'est ensuite qu'une tranche de ces structures.
+
+Les périodes sont réparties entre plusieurs processus, qui écrivent chacun
+leurs fichiers : ``<sortie>/<période>/<tableau>.csv`` (ou ``.parquet``), ou
+un classeur ``<sortie>/<période>.xlsx`` avec un onglet par tableau.
+
+    python -m nmf_stats.report Seances_V_D_2026.xlsx rapports --format xlsx
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .instrument import span
+from .parsing import season_months
+from .stats import Filters, SeasonStats
+
+FORMATS = ("csv", "xlsx", "parquet")
+SEASON = "Saison"  # période « saison entière »
+ASSOCIATION_NAMES = {2: "paires", 3: "trios", 4: "quatuors"}
+TOP_N = 50
+MIN_GAMES = 3
+
+# Calculs de la saison, hérités par les processus (fork) ou reconstruits une fois par processus
+_stats = None
+
+
+def _init_worker(df):
+    global _stats
+    if _stats is None:
+        _stats = SeasonStats(df)
+
+
+def _file_name(name):
+    return str(name).replace(os.sep, "-").replace("/", "-")
+
+
+def period_tables(stats, mois=None, sizes=(2, 3), n=TOP_N, min_games=MIN_GAMES):
+    """Tableaux d'une période (``mois`` None : saison entière) : ``{nom: frame}``, sans les tableaux vides."""
+    filters = Filters(mois=None if mois is None else [mois])
+    tables = {
+        "joueurs": stats.player_ranking(filters, "wilson"),
+        "gardiens": stats.goalkeeper_ranking(filters),
+    }
+    for k in sizes:
+        ranked = stats.associations(k, n, filters, min_games=min_games)
+        tables[ASSOCIATION_NAMES.get(k, f"groupes_{k}")] = None if ranked is None else ranked[0]
+    return {name: table for name, table in tables.items() if table is not None and not table.empty}
+
+
+def write_tables(tables, out_dir, period, fmt):
+    """Écrit les tableaux d'une période ; renvoie les chemins écrits."""
+    if not tables:
+        return []
+    if fmt == "xlsx":
+        path = os.path.join(out_dir, f"{_file_name(period)}.xlsx")
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            for name, table in tables.items():
+                table.to_excel(writer, sheet_name=name, index=False)
+        return [path]
+    folder = os.path.join(out_dir, _file_name(period))
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for name, table in tables.items():
+        path = os.path.join(folder, f"{name}.{fmt}")
+        if fmt == "csv":
+            table.to_csv(path, index=False)
+        else:
+            table.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def _export_period(mois, out_dir, fmt, sizes, n, min_games):
+    period = SEASON if mois is None else mois
+    with span("report.period", periode=period):
+        return write_tables(period_tables(_stats, mois, sizes, n, min_games), out_dir, period, fmt)
+
+
+def export_report(df, out_dir, fmt="csv", sizes=(2, 3), n=TOP_N, min_games=MIN_GAMES, workers=None):
+    """Écrit les tableaux de la saison ``df`` et de chacun de ses mois dans ``out_dir``.
+
+    ``workers`` : nombre de processus (par défaut un par cœur, au plus un
+    par période) ; 1 calcule tout dans le processus courant. Renvoie la
+    liste des fichiers écrits.
+    """
+    global _stats
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt} (attendu : {', '.join(FORMATS)})")
+    os.makedirs(out_dir, exist_ok=True)
+    periods = [None] + season_months(df["Mois"])
+    workers = min(workers or os.cpu_count() or 1, len(periods))
+
+    # Structures partagées construites une fois, avant de lancer les processus
+    stats = SeasonStats(df)
+    with span("report.build"):
+        for name in ("fact_cube", "association_cube"):
+            getattr(stats, name)
+        stats.index(gardiens=True)
+    args = (out_dir, fmt, tuple(sizes), n, min_games)
+
+    _stats = stats
+    try:
+        if workers == 1:
+            return [path for mois in periods for path in _export_period(mois, *args)]
+        # fork : les processus héritent de ``_stats`` sans copie ; sinon chacun le reconstruit
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(df,)) as pool:
+            futures = [pool.submit(_export_period, mois, *args) for mois in periods]
+            return [path for future in futures for path in future.result()]
+    finally:
+        _stats = None
+
+
+def main(argv=None):
+    from .sources import load_season, make_source
+
+    parser = argparse.ArgumentParser(prog="python -m nmf_stats.report",
+                                     description="Export des classements et associations de la saison, mois par mois.")
+    parser.add_argument("source", help="classeur .xlsx, dossier de CSV exportés ou « google »")
+    parser.add_argument("sortie", help="dossier de sortie")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--tailles", type=int, nargs="*", default=[2, 3], help="tailles des associations")
+    parser.add_argument("--top", type=int, default=TOP_N, help="associations gardées par tableau")
+    parser.add_argument("--min-jeux", type=int, default=MIN_GAMES, help="jeux minimum d'une association")
+    parser.add_argument("--processus", type=int, help="nombre de processus (défaut : un par cœur)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df, errors = load_season(make_source(args.source))
+    for sheet_name, e in errors:
+        print(f"Erreur lecture feuille {sheet_name}: {e}", file=sys.stderr)
+    if df.empty:
+        print("Aucune donnée à exporter.", file=sys.stderr)
+        return 1
+    paths = export_report(df, args.sortie, args.format, args.tailles, args.top, args.min_jeux, args.processus)
+    print(f"{len(paths)} fichiers écrits dans {args.sortie} en {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
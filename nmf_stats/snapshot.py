@@ -0,0 +1,180 @@
+"""Instantané local (Parquet) de la saison analysée.
+
+Au démarrage, l'instantané est servi immédiatement ; la source (Google Sheet)
+est relue en arrière-plan et l'instantané n'est réécrit que si les données
+ont changé. Si la source est injoignable, le tableau de bord continue de
+fonctionner avec le dernier instantané.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# À incrémenter dès que le schéma de la table longue change : les anciens instantanés sont ignorés
+SNAPSHOT_VERSION = 1
+_META_KEY = b"nmf_snapshot"
+
+
+def frame_hash(df):
+    """Empreinte du contenu d'une frame (indépendante de l'index)."""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(",".join(df.columns).encode())
+    h.update(hashes.tobytes())
+    return h.hexdigest()
+
+
+def save_snapshot(df, path, data_hash=None):
+    """Écrit l'instantané de manière atomique (fichier temporaire puis renommage)."""
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "data_hash": data_hash or frame_hash(df),
+        "saved_at": time.time(),
+        "rows": len(df),
+    }
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: json.dumps(meta).encode()})
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_atomic(table, path)
+    return meta
+
+
+def write_atomic(table, path, prefix=None):
+    """Écrit ``table`` en Parquet dans ``path`` via un fichier temporaire unique puis un renommage.
+
+    Deux écritures simultanées du même chemin ne se mélangent pas : chacune a
+    son fichier temporaire et la dernière remplace l'autre en entier.
+    """
+    folder = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=prefix or f"{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_snapshot(path):
+    """Relit l'instantané ; renvoie ``(df, meta)`` ou None s'il est absent, illisible ou d'une autre version."""
+    try:
+        table = pq.read_table(path)
+        meta = json.loads((table.schema.metadata or {})[_META_KEY])
+    except Exception:
+        return None
+    if meta.get("version") != SNAPSHOT_VERSION:
+        return None
+    return table.to_pandas(), meta
+
+
+class SeasonStore:
+    """Saison courante servie depuis l'instantané, revalidée en arrière-plan.
+
+    ``loader()`` relit la source et renvoie ``(df, erreurs)`` où ``erreurs`` est
+    la liste ``(onglet, exception)`` des onglets en échec. Il ne doit pas
+    appeler Streamlit : il peut tourner dans un thread. ``on_change(df)``, si
+    fourni, est appelé (dans le même thread) à chaque nouvelle version des données.
+
+    Une relecture à laquelle il manque un mois servi (onglet en échec sans
+    frame de remplacement) n'est ni servie ni enregistrée : la saison servie
+    et l'instantané restent complets jusqu'à la prochaine relecture réussie.
+    Un premier chargement partiel (sans instantané) est servi sans être enregistré.
+    """
+
+    def __init__(self, path, loader, max_age=120, on_change=None):
+        self.path = path
+        self.loader = loader
+        self.max_age = max_age
+        self.on_change = on_change
+        self.df = None
+        self.meta = None
+        self.last_errors = []
+        self.last_checked = 0.0
+        self.from_snapshot = False
+        self._lock = threading.Lock()       # état servi (df, meta, erreurs)
+        self._load_lock = threading.Lock()  # une seule relecture de la source à la fois
+        self._thread = None
+
+        loaded = load_snapshot(path)
+        if loaded is not None:
+            self.df, self.meta = loaded
+            self.from_snapshot = True
+
+    @property
+    def version(self):
+        """Identifiant des données servies (change à chaque nouvelle version de la saison)."""
+        return self.meta["data_hash"] if self.meta else None
+
+    def get(self):
+        """Renvoie ``(df, version, erreurs)`` lus ensemble, en revalidant si les données sont trop anciennes.
+
+        Sans instantané, le premier chargement est synchrone ; les sessions
+        arrivées pendant ce chargement attendent son résultat au lieu de relire
+        la source chacune de leur côté.
+        """
+        if self.df is None:
+            with self._load_lock:
+                if self.df is None:  # sinon chargé entre-temps par une autre session
+                    self._revalidate()
+        elif time.time() - self.last_checked > self.max_age:
+            self.revalidate_in_background()
+        with self._lock:
+            return self.df, self.version, self.last_errors
+
+    def revalidate_in_background(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.last_checked = time.time()
+            self._thread = threading.Thread(target=self.revalidate, name="nmf-revalidate", daemon=True)
+            self._thread.start()
+
+    def revalidate(self):
+        """Relit la source ; remplace la saison et l'instantané si les données ont changé.
+
+        Les relectures sont sérialisées : un appel attend celle en cours.
+        """
+        with self._load_lock:
+            self._revalidate()
+
+    def _revalidate(self):
+        self.last_checked = time.time()
+        df, errors = self.loader()
+        with self._lock:
+            self.last_errors = errors
+        if df.empty:
+            # Source vide ou injoignable : on garde ce qu'on a
+            return
+        if errors and self.df is not None:
+            failed = {str(sheet_name) for sheet_name, _ in errors}
+            lost = failed & set(self.df["Mois"].astype(str)) - set(df["Mois"].astype(str))
+            if lost:
+                # Relecture partielle : on garde la saison complète (et son instantané)
+                return
+        data_hash = frame_hash(df)
+        if self.meta is not None and self.meta["data_hash"] == data_hash:
+            with self._lock:
+                self.from_snapshot = False
+            return
+        meta = {"version": SNAPSHOT_VERSION, "data_hash": data_hash, "saved_at": time.time(), "rows": len(df)}
+        # Premier chargement partiel (rien d'autre à servir) : servi mais pas enregistré
+        if not errors or self.df is not None:
+            try:
+                meta = save_snapshot(df, self.path, data_hash=data_hash)
+            except OSError:
+                pass  # Disque en lecture seule : on sert quand même les nouvelles données
+        with self._lock:
+            self.df, self.meta, self.from_snapshot = df, meta, False
+        if self.on_change is not None:
+            self.on_change(df)
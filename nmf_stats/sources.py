@@ -0,0 +1,178 @@
+"""Sources de données : onglets mensuels du Google Sheet, classeur Excel local ou dossier de CSV.
+
+Chaque source renvoie ses onglets sous la forme ``(nom, contenu, erreur)`` et
+sait analyser un contenu avec le parseur commun (``parsing.parse_sheet``).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .instrument import span
+from .parsing import finalize_records, parse_csv, parse_sheet
+from .tab_cache import TabCache
+
+SHEET_ID = "1-QCywSqXboG2k1xLmaX2eRy7MWXzwcKoEPfIHbbEIY8"
+SEASON = "2025-2026"  # saison suivie par ce Google Sheet (nom de sa partition dans l'archive)
+
+# URL d'export CSV d'un onglet ; surchargeable (ex. serveur local pour travailler hors ligne)
+EXPORT_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+# Onglets de la saison (nom, gid) - ceux sans données sont ignorés au parsing
+SHEETS = [
+    ("Août", 0),
+    ("Septembre", 1815364140),
+    ("Octobre", 2065545828),
+    ("Novembre", 2055534384),
+    ("Décembre", 2028758753),
+    ("Janvier", 228471660),
+    ("Février", 1003146032),
+    ("Mars", 1342797580),
+    ("Avril", 1812433009),
+    ("Mai", 549449988),
+    ("Juin", 557016746)
+]
+
+MAX_WORKERS = 6
+TIMEOUT = (5, 15)  # (connexion, lecture) en secondes, par onglet
+RETRIES = 2
+
+
+def make_session(pool_size=MAX_WORKERS, retries=RETRIES):
+    """Session HTTP partagée : une seule connexion TLS réutilisée par thread du pool."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_tab(session, url, timeout=TIMEOUT):
+    """Télécharge un onglet et renvoie le contenu CSV brut (bytes)."""
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_tabs(sheets=SHEETS, sheet_id=SHEET_ID, url_template=EXPORT_URL,
+               session=None, max_workers=MAX_WORKERS, timeout=TIMEOUT):
+    """Télécharge tous les onglets en parallèle.
+
+    Renvoie une liste ``(nom, contenu, erreur)`` dans l'ordre de ``sheets`` :
+    ``contenu`` vaut None si le téléchargement a échoué, et ``erreur`` contient
+    alors l'exception. Un onglet lent ou en erreur ne bloque pas les autres.
+    """
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max_workers)
+
+    def _fetch(sheet):
+        sheet_name, gid = sheet
+        url = url_template.format(sheet_id=sheet_id, gid=gid)
+        try:
+            with span("source.fetch", onglet=sheet_name):
+                return sheet_name, fetch_tab(session, url, timeout=timeout), None
+        except Exception as e:
+            return sheet_name, None, e
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_fetch, sheets))
+    finally:
+        if own_session:
+            session.close()
+
+
+class GoogleSheetSource:
+    """Export CSV des onglets du Google Sheet, téléchargés en parallèle."""
+
+    def __init__(self, sheet_id=SHEET_ID, sheets=SHEETS, url_template=EXPORT_URL, session=None,
+                 max_workers=MAX_WORKERS, timeout=TIMEOUT):
+        self.sheet_id = sheet_id
+        self.sheets = sheets
+        self.url_template = url_template
+        self.session = session
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def fetch(self):
+        return fetch_tabs(self.sheets, sheet_id=self.sheet_id, url_template=self.url_template,
+                          session=self.session, max_workers=self.max_workers, timeout=self.timeout)
+
+    def parse(self, content, sheet_name):
+        return parse_csv(content, sheet_name)
+
+
+class ExcelSource:
+    """Classeur Excel local : toutes les feuilles sont lues en une seule ouverture du fichier."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self):
+        try:
+            with span("source.fetch", onglet=os.path.basename(self.path)):
+                sheets = pd.read_excel(self.path, sheet_name=None, header=None)
+        except Exception as e:
+            return [(os.path.basename(self.path), None, e)]
+        return [(sheet_name, raw, None) for sheet_name, raw in sheets.items()]
+
+    def parse(self, raw, sheet_name):
+        return parse_sheet(raw, sheet_name)
+
+
+class CsvFolderSource:
+    """Dossier de CSV, un fichier par onglet (le nom du fichier donne le mois)."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self):
+        month_order = {name: i for i, (name, _) in enumerate(SHEETS)}
+        files = [f for f in os.listdir(self.path) if f.lower().endswith(".csv")]
+        # Ordre de la saison pour les mois connus, puis ordre alphabétique
+        files.sort(key=lambda f: (month_order.get(os.path.splitext(f)[0], len(month_order)), f))
+        tabs = []
+        for filename in files:
+            sheet_name = os.path.splitext(filename)[0]
+            try:
+                with open(os.path.join(self.path, filename), "rb") as fh:
+                    tabs.append((sheet_name, fh.read(), None))
+            except OSError as e:
+                tabs.append((sheet_name, None, e))
+        return tabs
+
+    def parse(self, content, sheet_name):
+        return parse_csv(content, sheet_name)
+
+
+def make_source(spec=None, session=None):
+    """Construit la source décrite par ``spec`` : None/"google", un fichier .xlsx ou un dossier de CSV."""
+    if spec is None or spec == "" or spec == "google":
+        return GoogleSheetSource(session=session)
+    if os.path.isdir(spec):
+        return CsvFolderSource(spec)
+    if spec.lower().endswith((".xlsx", ".xlsm", ".xls")):
+        return ExcelSource(spec)
+    raise ValueError(f"Source de données inconnue : {spec}")
+
+
+def load_season(source, tab_cache=None):
+    """Lit et analyse tous les onglets d'une source.
+
+    Renvoie ``(df, erreurs)`` avec ``erreurs`` la liste ``(onglet, exception)``
+    des onglets illisibles. N'appelle pas Streamlit (utilisable en arrière-plan).
+    """
+    tab_cache = tab_cache if tab_cache is not None else TabCache()
+    with span("source.load"):
+        sheet_frames, errors = tab_cache.refresh(source.fetch(), source.parse)
+        return finalize_records(sheet_frames), errors
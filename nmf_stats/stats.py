@@ -0,0 +1,225 @@
+"""Calculs du tableau de bord, sans Streamlit : une saison et un filtre en entrée, des frames en sortie.
+
+``SeasonStats`` part de la table longue d'une saison (``sources.load_season``,
+snapshot ou archive) et construit à la demande les structures partagées
+(tables compactes, index de filtres, cube de faits, index chronologique,
+associations, paires, Elo). Chaque calcul prend un ``Filters`` et renvoie la frame
+affichée par le tableau de bord, ou None quand le filtre ne retient rien.
+
+Utilisable depuis un script ou un banc d'essai ::
+
+    from nmf_stats.sources import load_season, make_source
+    from nmf_stats.stats import Filters, SeasonStats
+
+    df, _ = load_season(make_source("Seances_V_D_2026.xlsx"))
+    stats = SeasonStats(df)
+    stats.aggregate("player_ranking", Filters(mois=["Septembre"]))
+
+Le tableau de bord n'ajoute que la mise en cache (par version des données
+et par filtre) et l'affichage.
+"""
+import threading
+from collections import namedtuple
+
+from .aggregations import (AGGREGATIONS, CUBE_AGGREGATIONS, TIMELINE_AGGREGATIONS,
+                           association_ranking, form_by_session_table, season_comparison)
+from .associations import AssociationCube
+from .fact_cube import FactCube
+from .filters import FilterIndex
+from .form import FormEngine
+from .instrument import span
+from .intervals import add_intervals
+from .pairs import PairMatrix
+from .ratings import rate_players, update_ratings
+from .tables import SeasonTables
+from .timeline import update_timeline
+
+# Filtre commun à tous les calculs ; None = pas de restriction. ``joueurs``
+# désigne les gardiens pour les agrégations de gardiens.
+Filters = namedtuple("Filters", ["mois", "semaines", "jeu_range", "joueurs"], defaults=(None, None, None, None))
+
+# Agrégations calculées sur la table des gardiens
+GOALKEEPER_AGGREGATIONS = {"goalkeeper_performance", "goalkeeper_ranking", "goals_by_game",
+                           "goals_by_session_type", "goals_by_month"}
+
+
+class SeasonStats:
+    """Calculs sur une saison ; les structures sont construites au premier usage puis partagées.
+
+    ``previous`` (calculs d'une version précédente des mêmes données) permet de
+    prolonger l'index chronologique et les Elo au lieu de les reconstruire
+    quand les nouvelles données ne font qu'ajouter des séances. La table longue
+    ``df`` n'est gardée que jusqu'à la construction des tables compactes.
+    """
+
+    def __init__(self, df, previous=None):
+        self._df = df
+        self._built = {}
+        self._lock = threading.RLock()
+        # Seules les structures incrémentales de la version précédente sont gardées
+        self._previous = {}
+        if previous is not None:
+            for name in ("timeline", "ratings"):
+                if name in previous._built:
+                    self._previous[name] = previous._built[name]
+
+    def _get(self, name, build):
+        built = self._built.get(name)
+        if built is None:
+            with self._lock:
+                built = self._built.get(name)
+                if built is None:
+                    built = self._built[name] = build()
+        return built
+
+    def _build_tables(self):
+        tables = SeasonTables(self._df)
+        self._df = None  # tous les calculs partent des tables compactes
+        return tables
+
+    @property
+    def tables(self):
+        return self._get("tables", self._build_tables)
+
+    @property
+    def players(self):
+        return self.tables.players
+
+    @property
+    def goalkeepers(self):
+        return self.tables.goalkeepers
+
+    def index(self, gardiens=False):
+        """Index de filtres de la table joueurs (ou gardiens)."""
+        if gardiens:
+            return self._get("index_gardiens", lambda: FilterIndex(self.goalkeepers))
+        return self._get("index_joueurs", lambda: FilterIndex(self.players))
+
+    @property
+    def fact_cube(self):
+        return self._get("fact_cube", lambda: FactCube(self.players))
+
+    @property
+    def timeline(self):
+        return self._get("timeline", lambda: update_timeline(self._previous.pop("timeline", None), self.players))
+
+    @property
+    def form_engine(self):
+        return self._get("form_engine", lambda: FormEngine(self.players, self.timeline))
+
+    @property
+    def ratings(self):
+        return self._get("ratings", lambda: update_ratings(self._previous.pop("ratings", None), self.players, self.timeline))
+
+    @property
+    def association_cube(self):
+        return self._get("association_cube", lambda: AssociationCube(self.players))
+
+    @property
+    def pair_matrix(self):
+        return self._get("pair_matrix", lambda: PairMatrix(self.players))
+
+    def _mask(self, filters, gardiens=False, joueurs=True):
+        filters = filters or Filters()
+        return self.index(gardiens).mask(mois=filters.mois, semaines=filters.semaines, jeu_range=filters.jeu_range,
+                                         joueurs=filters.joueurs if joueurs else None)
+
+    def aggregate(self, name, filters=None):
+        """Table du graphique ou classement ``name`` pour ``filters`` (noms : voir ``aggregations``)."""
+        filters = filters or Filters()
+        if name in CUBE_AGGREGATIONS:
+            # Simple somme de V / D / N : tranche du cube de faits, sans groupby sur les lignes
+            dims, results, finish = CUBE_AGGREGATIONS[name]
+            cube = self.fact_cube
+            with span("aggregate", graphique=name, chemin="cube"):
+                counts = cube.frame(dims, results, joueurs=filters.joueurs, mois=filters.mois,
+                                    semaines=filters.semaines, jeu_range=filters.jeu_range)
+                return None if counts.empty else finish(counts)
+        if name in TIMELINE_AGGREGATIONS:
+            # Cumuls lus le long de l'index chronologique (sans tri)
+            axis, finish = TIMELINE_AGGREGATIONS[name]
+            with span("mask", graphique=name):
+                mask = self._mask(filters)
+            timeline = self.timeline
+            with span("aggregate", graphique=name, chemin="timeline"):
+                totals = timeline.running_totals(axis, mask)
+                return None if totals.empty else finish(totals)
+        with span("mask", graphique=name):
+            rows = self.index(name in GOALKEEPER_AGGREGATIONS).select(
+                mois=filters.mois, semaines=filters.semaines, jeu_range=filters.jeu_range, joueurs=filters.joueurs)
+        if rows.empty:
+            return None
+        with span("aggregate", graphique=name, chemin="lignes"):
+            return AGGREGATIONS[name](rows)
+
+    def player_ranking(self, filters=None, interval=None):
+        """Classement des joueurs ; ``interval`` ("wilson" ou "bootstrap") ajoute IC bas / IC haut."""
+        ranking = self.aggregate("player_ranking", filters)
+        if ranking is None or interval is None:
+            return ranking
+        return add_intervals(ranking, "Victoire", "Total", interval)
+
+    def goalkeeper_ranking(self, filters=None):
+        return self.aggregate("goalkeeper_ranking", filters)
+
+    def win_rate_by_game(self, filters=None):
+        return self.aggregate("win_rate_by_game", filters)
+
+    def cumulative_by_session(self, filters=None):
+        return self.aggregate("cumulative_by_session", filters)
+
+    def cumulative_by_week(self, filters=None):
+        return self.aggregate("cumulative_by_week", filters)
+
+    def player_form(self, mode="jeux", n=10, filters=None, latest=False):
+        """Forme par séance (Graphique 6) ou, avec ``latest``, forme actuelle de chaque joueur."""
+        mask = self._mask(filters)
+        if latest:
+            return self.form_engine.latest(mode, n, mask)
+        form = self.form_engine.by_session(mode, n, mask)
+        return None if form.empty else form_by_session_table(form)
+
+    def player_ratings(self, filters=None):
+        """Elo des joueurs (frame Joueur, Elo, Jeux_notes) sur les jeux retenus par ``filters``.
+
+        Le filtre joueurs est ignoré : les équipes de chaque jeu doivent rester complètes.
+        """
+        mask = self._mask(filters, joueurs=False)
+        if mask.all():
+            return self.ratings.table()
+        return rate_players(self.players, self.timeline, mask).table()
+
+    def associations(self, k, n=50, filters=None, min_games=1, interval="wilson"):
+        """Les ``n`` meilleurs groupes de ``k`` joueurs (Graphique 5) et leur résumé.
+
+        Renvoie ``(classement, AssociationSummary)`` ou None si aucun jeu n'est
+        retenu (le filtre joueurs ne s'applique pas aux associations).
+        """
+        filters = filters or Filters()
+        cube = self.association_cube
+        if cube.match_count(filters.mois, filters.semaines, filters.jeu_range) == 0:
+            return None
+        top, summary = cube.top(k, n, filters.mois, filters.semaines, filters.jeu_range, min_games=min_games)
+        ranking = add_intervals(association_ranking(top), "Victoires", "Total", interval)
+        return ranking, summary
+
+    def pair_table(self, filters=None, min_games=1):
+        """Bilan de chaque paire de joueurs (carte de chaleur), dans les deux sens ; None si aucune paire.
+
+        Le filtre joueurs limite les deux membres de la paire, les jeux restent complets.
+        """
+        filters = filters or Filters()
+        table = self.pair_matrix.table(filters.mois, filters.semaines, filters.jeu_range,
+                                       joueurs=filters.joueurs, min_games=min_games)
+        return None if table.empty else table
+
+
+def compare_seasons(archive, joueurs):
+    """Bilan par saison des ``joueurs`` de champ, lu dans l'archive (``archive.SeasonArchive``) ; None si rien."""
+    # Seules les lignes des joueurs demandés sont lues (filtre poussé dans la lecture Parquet)
+    rows = archive.load(joueurs=joueurs, columns=["Saison", "Joueur", "Postes", "Victoire", "Défaite", "Nul"])
+    rows = rows[rows["Postes"] != "Gardien"]
+    if rows.empty:
+        return None
+    return season_comparison(rows)
+
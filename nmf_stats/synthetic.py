@@ -0,0 +1,81 @@
+"""Saisons fictives au format des feuilles de séances, pour les bancs d'essai.
+
+Chaque mois est une feuille brute (lue sans en-tête) disposée comme le
+classeur réel (voir ``parsing``) : une ligne "Séances" avec le jour au début
+de chaque séance, une ligne avec le numéro du jeu, puis une ligne par joueur
+(nom, poste, une cellule V / D / N par jeu joué) et par gardien (buts
+encaissés). Le parseur en déduit la semaine par la position des colonnes,
+exactement comme pour le classeur.
+"""
+import numpy as np
+import pandas as pd
+
+from .parsing import parse_sheet
+
+MONTHS = ["Août", "Septembre", "Octobre", "Novembre", "Décembre", "Janvier",
+          "Février", "Mars", "Avril", "Mai", "Juin", "Juillet"]
+DAYS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
+
+def synthetic_sheet(rng, n_players=30, n_goalkeepers=2, sessions=20, games_per_session=6,
+                    players_per_game=10, draw_rate=0.05):
+    """Une feuille (un mois) : frame brute, sans en-tête, au format du classeur.
+
+    Une séance par jour (Lundi, Mardi, ... puis on recommence), chacune sur
+    ``games_per_session`` colonnes, comme dans le classeur réel.
+    """
+    n_cols = 2 + sessions * games_per_session
+    n_rows = 3 + n_players + n_goalkeepers
+    sheet = np.full((n_rows, n_cols), np.nan, dtype=object)
+
+    sheet[1, 0] = "Séances"
+    sheet[2, :2] = ["Joueurs", "Postes"]
+    for s in range(sessions):
+        first = 2 + s * games_per_session
+        sheet[1, first] = DAYS[s % len(DAYS)]  # cellule fusionnée : seule la première est remplie
+        sheet[2, first:first + games_per_session] = np.arange(1, games_per_session + 1)
+    sheet[3:3 + n_players, 0] = [f"Joueur {p:03d}" for p in range(n_players)]
+    sheet[3:3 + n_players, 1] = "Joueur"
+    sheet[3 + n_players:, 0] = [f"Gardien {g:02d}" for g in range(n_goalkeepers)]
+    sheet[3 + n_players:, 1] = "Gardien"
+
+    # Joueurs de chaque jeu : deux équipes, l'une gagne (ou match nul)
+    n_games = n_cols - 2
+    per_game = min(players_per_game, n_players) // 2 * 2
+    picked = np.argsort(rng.random((n_games, n_players)), axis=1)[:, :per_game]
+    first_team_wins = rng.random(n_games) < 0.5
+    draw = rng.random(n_games) < draw_rate
+    first_team = np.arange(per_game) < per_game // 2
+    wins = first_team[None, :] == first_team_wins[:, None]
+    cells = np.where(draw[:, None], "N", np.where(wins, "V", "D"))
+    games = np.repeat(np.arange(n_games), per_game)
+    sheet[3 + picked.ravel(), 2 + games] = cells.ravel()
+
+    if n_goalkeepers:
+        sheet[3 + n_players:, 2:] = rng.integers(0, 6, (n_goalkeepers, n_games))
+    return pd.DataFrame(sheet)
+
+
+def synthetic_season(n_months=10, seed=0, **sheet_options):
+    """Feuilles brutes d'une saison fictive : ``{mois: frame}`` (options : ``synthetic_sheet``).
+
+    Une saison compte au plus 12 mois (Août à Juillet) ; pour un historique
+    plus long, générer plusieurs saisons.
+    """
+    if not 0 < n_months <= len(MONTHS):
+        raise ValueError(f"Une saison compte de 1 à {len(MONTHS)} mois (demandé : {n_months})")
+    rng = np.random.default_rng(seed)
+    return {MONTHS[m]: synthetic_sheet(rng, **sheet_options) for m in range(n_months)}
+
+
+class SyntheticSource:
+    """Source (même interface que ``sources.ExcelSource``) servant des feuilles fictives."""
+
+    def __init__(self, sheets):
+        self.sheets = sheets
+
+    def fetch(self):
+        return [(sheet_name, raw, None) for sheet_name, raw in self.sheets.items()]
+
+    def parse(self, raw, sheet_name):
+        return parse_sheet(raw, sheet_name)
@@ -0,0 +1,83 @@
+"""Cache des onglets analysés, indexé par le contenu téléchargé.
+
+Seul l'onglet du mois en cours change en pratique : les autres onglets
+(mois clos) sont reconnus à leur empreinte et ne sont pas ré-analysés.
+"""
+import hashlib
+import threading
+
+import pandas as pd
+
+from .instrument import span
+
+
+def content_hash(content):
+    """Empreinte d'un onglet : octets CSV, ou feuille déjà lue (classeur Excel)."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(content, pd.DataFrame):
+        h.update(repr(content.shape).encode())
+        h.update(pd.util.hash_pandas_object(content.astype(str), index=False).to_numpy().tobytes())
+    else:
+        h.update(content)
+    return h.hexdigest()
+
+
+class TabCache:
+    def __init__(self):
+        self._entries = {}  # nom d'onglet -> (empreinte, frame analysée)
+        self._lock = threading.Lock()
+        self.last_stats = {"parsed": 0, "skipped": 0, "total": 0}
+
+    def get(self, sheet_name, content, parser):
+        """Renvoie la frame de l'onglet, en ne la recalculant que si le contenu a changé.
+
+        ``parser(content, sheet_name)`` n'est appelé qu'en cas de contenu nouveau ;
+        ses exceptions sont propagées et l'entrée précédente est conservée.
+        """
+        digest = content_hash(content)
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+        if entry is not None and entry[0] == digest:
+            return entry[1], False
+        with span("source.parse", onglet=sheet_name):
+            frame = parser(content, sheet_name)
+        with self._lock:
+            self._entries[sheet_name] = (digest, frame)
+        return frame, True
+
+    def refresh(self, tabs, parser):
+        """Analyse les onglets ``(nom, contenu, erreur)`` renvoyés par une source (voir ``sources``).
+
+        Renvoie ``(frames, erreurs)`` : les frames dans l'ordre des onglets et
+        la liste ordonnée ``(nom, exception)`` des onglets non téléchargés ou
+        non analysables. Un onglet en erreur déjà analysé auparavant garde sa
+        dernière frame (toujours signalé dans les erreurs) : un échec passager
+        ne retire pas un mois de la saison.
+        """
+        frames, errors = [], []
+        parsed = skipped = 0
+        for sheet_name, content, error in tabs:
+            try:
+                if error is not None:
+                    raise error
+                frame, was_parsed = self.get(sheet_name, content, parser)
+            except Exception as e:
+                errors.append((sheet_name, e))
+                with self._lock:
+                    entry = self._entries.get(sheet_name)
+                if entry is not None:
+                    frames.append(entry[1])
+                continue
+            frames.append(frame)
+            if was_parsed:
+                parsed += 1
+            else:
+                skipped += 1
+        with self._lock:
+            # Les onglets disparus de la source sont oubliés
+            seen = {tab[0] for tab in tabs}
+            for name in list(self._entries):
+                if name not in seen:
+                    del self._entries[name]
+            self.last_stats = {"parsed": parsed, "skipped": skipped, "total": len(tabs)}
+        return frames, errors
@@ -0,0 +1,35 @@
+"""Tables compactes de la saison, partagées par le tableau de bord.
+
+Construites une fois par version des données à partir de la table longue
+(``parsing.split_records``) : résultats des joueurs de champ, buts encaissés
+des gardiens et correspondance des séances. Les chaînes sont des catégories,
+les résultats des codes et drapeaux int8 et la séance un identifiant entier ;
+aucune colonne n'est remplie de NaN pour l'autre population.
+"""
+import pandas as pd
+
+from .parsing import split_records
+
+
+def memory_bytes(df):
+    """Mémoire occupée par une frame (chaînes et dictionnaires compris)."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class SeasonTables:
+    """Tables ``players`` / ``goalkeepers`` / ``sessions`` construites depuis la table longue."""
+
+    def __init__(self, df):
+        self.players, self.goalkeepers, self.sessions = split_records(df)
+        self.source_bytes = memory_bytes(df)
+        # Valeurs distinctes de la colonne Postes (non conservée), pour le diagnostic des gardiens
+        self.postes = sorted(pd.unique(df["Postes"].astype(str)))
+
+    def memory_usage(self):
+        """Lignes et mémoire de chaque table (en octets) ; ``source_bytes`` donne celle de la table longue."""
+        rows = [
+            ("Joueurs", len(self.players), memory_bytes(self.players)),
+            ("Gardiens", len(self.goalkeepers), memory_bytes(self.goalkeepers)),
+            ("Séances", len(self.sessions), memory_bytes(self.sessions)),
+        ]
+        return pd.DataFrame(rows, columns=["Table", "Lignes", "Octets"])
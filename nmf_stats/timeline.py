@@ -0,0 +1,183 @@
+"""Index chronologique des séances et des semaines, avec les cumuls V / D / N de chaque joueur.
+
+Une séance est identifiée par (Mois, Semaine, Jour_index, Seance), une
+semaine par (Mois, Semaine) ; les mois suivent l'ordre de la saison (catégorie
+ordonnée de ``parsing.split_records``). Chaque période reçoit une position
+dans l'ordre chronologique et chaque ligne de la table joueurs la position de
+sa séance et de sa semaine.
+
+Les totaux cumulés par joueur sont tenus à jour le long de ces positions :
+des lignes plus récentes ne font qu'allonger les séries (``extend``) et les
+graphiques lisent directement les cumuls, sans tri. Avec des filtres, les
+comptes des lignes retenues sont regroupés par position puis cumulés.
+"""
+import numpy as np
+import pandas as pd
+
+from .snapshot import frame_hash
+
+RESULTS = ["Victoire", "Défaite", "Nul"]
+
+# Axes chronologiques : colonnes qui identifient une période
+AXES = {
+    "seance": ["Mois", "Semaine", "Jour_index", "Seance"],
+    "semaine": ["Mois", "Semaine"],
+}
+
+
+class _Axis:
+    """Périodes d'un axe, positions des lignes, comptes et cumuls (joueur x période x résultat)."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.keys = []  # clés des périodes, dans l'ordre chronologique (Mois remplacé par son rang)
+        self.labels = {col: [] for col in columns}
+        self.row_pos = np.zeros(0, dtype=np.int32)
+        self.counts = np.zeros((0, 0, len(RESULTS)), dtype=np.int32)
+        self.cum = np.zeros((0, 0, len(RESULTS)), dtype=np.int64)
+
+    def copy(self):
+        other = _Axis(self.columns)
+        other.keys = list(self.keys)
+        other.labels = {col: list(values) for col, values in self.labels.items()}
+        other.row_pos, other.counts, other.cum = self.row_pos.copy(), self.counts.copy(), self.cum.copy()
+        return other
+
+    def extend(self, rows, month_rank, row_player, result, n_players):
+        # Lignes triées chronologiquement : l'ordre d'apparition des clés est l'ordre des périodes
+        arrays = [month_rank] + [rows[col].to_numpy() for col in self.columns[1:]]
+        codes, uniques = pd.MultiIndex.from_arrays(arrays).factorize()
+        new_keys = [tuple(k) for k in uniques]
+        if self.keys and new_keys and new_keys[0] < self.keys[-1]:
+            raise ValueError("Lignes antérieures à la dernière période connue")
+
+        # La première clé peut prolonger la dernière période connue
+        start = len(self.keys)
+        if self.keys and new_keys and new_keys[0] == self.keys[-1]:
+            start -= 1
+        positions = start + np.arange(len(new_keys), dtype=np.int32)
+        first_row = np.unique(codes, return_index=True)[1]
+        for key, pos, row in zip(new_keys, positions, first_row):
+            if pos < len(self.keys):
+                continue
+            self.keys.append(key)
+            for col in self.columns:
+                self.labels[col].append(rows[col].iloc[row])
+        self.row_pos = np.concatenate([self.row_pos, positions[codes]])
+
+        n_periods = len(self.keys)
+        counts = np.zeros((n_players, n_periods, len(RESULTS)), dtype=np.int32)
+        counts[:self.counts.shape[0], :self.counts.shape[1]] = self.counts
+        np.add.at(counts, (row_player, positions[codes], result), 1)
+        cum = np.zeros(counts.shape, dtype=np.int64)
+        cum[:self.cum.shape[0], :start] = self.cum[:, :start]
+        # Seules les périodes touchées sont recalculées, à partir du dernier cumul connu
+        cum[:, start:] = np.cumsum(counts[:, start:], axis=1)
+        if start > 0:
+            cum[:, start:] += cum[:, start - 1][:, None]
+        self.counts, self.cum = counts, cum
+
+
+class SessionTimeline:
+    """Index chronologique (séances et semaines) de la table joueurs et cumuls par joueur."""
+
+    def __init__(self):
+        self.months = []
+        self.joueurs = []
+        self._player_code = {}
+        self.row_player = np.zeros(0, dtype=np.int32)
+        self.row_result = np.zeros(0, dtype=np.int8)
+        self.axes = {name: _Axis(columns) for name, columns in AXES.items()}
+        self.n_rows = 0
+        self.rows_hash = None
+
+    @classmethod
+    def build(cls, players):
+        timeline = cls()
+        timeline.extend(players)
+        return timeline
+
+    def copy(self):
+        other = SessionTimeline()
+        other.months, other.joueurs = list(self.months), list(self.joueurs)
+        other._player_code = dict(self._player_code)
+        other.row_player, other.row_result = self.row_player.copy(), self.row_result.copy()
+        other.axes = {name: axis.copy() for name, axis in self.axes.items()}
+        other.n_rows, other.rows_hash = self.n_rows, self.rows_hash
+        return other
+
+    def extend(self, rows):
+        """Ajoute des lignes de la table joueurs, plus récentes que (ou dans) la dernière séance connue.
+
+        Lève ValueError si les lignes remontent avant la dernière période ou si
+        l'ordre des mois a changé : il faut alors reconstruire (``build``).
+        """
+        months = list(rows["Mois"].cat.categories)
+        if months[:len(self.months)] != self.months:
+            raise ValueError("Ordre des mois modifié")
+        self.months = months
+        month_rank = rows["Mois"].cat.codes.to_numpy()
+
+        # Code de joueur stable d'une extension à l'autre (ordre d'apparition)
+        categories = rows["Joueur"].cat.categories
+        for name in categories:
+            if name not in self._player_code:
+                self._player_code[name] = len(self.joueurs)
+                self.joueurs.append(name)
+        category_code = np.array([self._player_code[name] for name in categories], dtype=np.int32)
+        row_player = category_code[rows["Joueur"].cat.codes.to_numpy()]
+        result = rows["Resultat"].cat.codes.to_numpy().astype(np.int8)  # 0 = V, 1 = D, 2 = N
+
+        for axis in self.axes.values():
+            axis.extend(rows, month_rank, row_player, result, len(self.joueurs))
+        self.row_player = np.concatenate([self.row_player, row_player])
+        self.row_result = np.concatenate([self.row_result, result])
+        self.n_rows += len(rows)
+
+    def running_totals(self, axis_name, mask=None):
+        """Comptes et cumuls V / D par (période, joueur) présents, dans l'ordre chronologique.
+
+        ``mask`` (booléens alignés sur les lignes de la table joueurs) restreint
+        les lignes comptées ; sans masque, les cumuls tenus à jour sont lus tels quels.
+        Renvoie une frame : colonnes de l'axe, Joueur, Victoire, Défaite,
+        Victoire_cum, Total_cum (joueurs par ordre alphabétique dans une période).
+        """
+        axis = self.axes[axis_name]
+        if mask is None or mask.all():
+            counts, cum = axis.counts, axis.cum
+        else:
+            n_players, n_periods = axis.counts.shape[:2]
+            flat = (self.row_player[mask].astype(np.int64) * n_periods + axis.row_pos[mask]) * len(RESULTS) + self.row_result[mask]
+            counts = np.bincount(flat, minlength=n_players * n_periods * len(RESULTS)).reshape(n_players, n_periods, len(RESULTS))
+            cum = np.cumsum(counts, axis=1)
+
+        alphabetical = np.argsort(np.array(self.joueurs, dtype=object)) if self.joueurs else np.zeros(0, dtype=np.int64)
+        present = counts[alphabetical].sum(axis=2) > 0
+        period, rank = np.nonzero(present.T)
+        player = alphabetical[rank]
+
+        data = {col: np.array(axis.labels[col], dtype=object)[period] for col in axis.columns}
+        data["Joueur"] = np.array(self.joueurs, dtype=object)[player]
+        data["Victoire"] = counts[player, period, 0]
+        data["Défaite"] = counts[player, period, 1]
+        data["Victoire_cum"] = cum[player, period, 0]
+        data["Total_cum"] = cum[player, period, 0] + cum[player, period, 1]
+        return pd.DataFrame(data)
+
+
+def update_timeline(previous, players):
+    """Index de ``players`` : prolonge ``previous`` si ``players`` n'en est qu'une suite, sinon reconstruit."""
+    rows_hash = frame_hash(players)
+    if previous is not None and previous.n_rows <= len(players) \
+            and frame_hash(players.iloc[:previous.n_rows]) == previous.rows_hash:
+        timeline = previous.copy()
+        try:
+            timeline.extend(players.iloc[previous.n_rows:])
+        except ValueError:
+            timeline = None
+        if timeline is not None:
+            timeline.rows_hash = rows_hash
+            return timeline
+    timeline = SessionTimeline.build(players)
+    timeline.rows_hash = rows_hash
+    return timeline
@@ -0,0 +1,47 @@
+"""Saisons fictives partagées par les tests.
+
+Chaque module de test choisit sa saison avec ``SEASON_OPTIONS`` (arguments de
+``synthetic.synthetic_season``) : les fixtures ``season_df`` et ``players``
+la construisent une fois par module.
+"""
+import pytest
+
+from nmf_stats.sources import load_season
+from nmf_stats.synthetic import SyntheticSource, synthetic_season
+from nmf_stats.tables import SeasonTables
+
+
+@pytest.fixture(scope="session")
+def make_season():
+    """Table longue d'une saison fictive : ``make_season(n_months, seed, **options)``."""
+    def make(n_months=3, seed=0, **options):
+        df, _ = load_season(SyntheticSource(synthetic_season(n_months, seed=seed, **options)))
+        return df
+    return make
+
+
+@pytest.fixture(scope="module")
+def season_df(request, make_season):
+    return make_season(**getattr(request.module, "SEASON_OPTIONS", {}))
+
+
+@pytest.fixture(scope="module")
+def players(season_df):
+    return SeasonTables(season_df).players
+
+
+def _filter_rows(players, mois=None, semaines=None, jeu_range=None):
+    rows = players
+    if mois is not None:
+        rows = rows[rows["Mois"].isin(mois)]
+    if semaines is not None:
+        rows = rows[rows["Semaine"].isin(semaines)]
+    if jeu_range is not None:
+        rows = rows[rows["Jeu"].between(*jeu_range)]
+    return rows
+
+
+@pytest.fixture(scope="session")
+def filter_rows():
+    """Référence des filtres Mois / Semaine / plage de jeux : sélection de lignes pandas."""
+    return _filter_rows
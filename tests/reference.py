@@ -0,0 +1,129 @@
+"""Implémentations d'origine, figées, servant de référence aux tests d'équivalence.
+
+``parse_records`` reprend la boucle cellule par cellule de l'ancien
+``parse_google_sheet`` (app.py) : une feuille brute (sans en-tête) par mois,
+le même traitement, la même frame finale. Les agrégations reprennent les
+groupby de l'ancien app.py sur la table longue filtrée (joueurs de champ).
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Mois", "Joueur", "Seance", "Jour_index", "Semaine", "Jeu", "Resultat",
+           "Victoire", "Défaite", "Nul", "Postes", "Buts_encaisses"]
+
+
+def _sheet_records(raw, sheet_name, all_records):
+    int_re = re.compile(r'(\d+)')
+    day_names = {"lundi": 1, "mardi": 2, "mercredi": 3, "jeudi": 4, "vendredi": 5, "samedi": 6, "dimanche": 7}
+    nrows, ncols = raw.shape
+
+    candidate_day_scores = []
+    for r in range(min(6, nrows)):
+        row_vals = raw.iloc[r, 1:].astype(str).fillna("").str.strip().str.lower().tolist()
+        score = sum(1 for v in row_vals if v in day_names)
+        candidate_day_scores.append((r, score))
+    row_jours = max(candidate_day_scores, key=lambda x: x[1])[0] if candidate_day_scores else 0
+
+    candidate_num_scores = []
+    for r in range(row_jours + 1, min(row_jours + 6, nrows)):
+        row_vals = raw.iloc[r, 1:].astype(str).fillna("").str.strip().tolist()
+        score = sum(1 for v in row_vals if int_re.search(str(v)))
+        candidate_num_scores.append((r, score))
+    row_jeux = max(candidate_num_scores, key=lambda x: x[1])[0] if candidate_num_scores else min(row_jours + 1, nrows - 1)
+
+    if not (row_jours < nrows and row_jeux < nrows):
+        return
+    jours_series = raw.iloc[row_jours].ffill().fillna("Séance inconnue").astype(str).str.strip()
+    jeux_series = raw.iloc[row_jeux].astype(str).fillna("").str.strip()
+
+    for r in range(row_jeux + 1, nrows):
+        joueur_cell = raw.iat[r, 0] if ncols > 0 else None
+        poste_cell = raw.iat[r, 1] if ncols > 1 else None
+        if pd.isna(joueur_cell) or str(joueur_cell).strip() == "":
+            continue
+        joueur_name = str(joueur_cell).strip()
+        poste = str(poste_cell).strip() if not pd.isna(poste_cell) else "Joueur"
+
+        for c in range(2, ncols):
+            raw_val = raw.iat[r, c]
+            if pd.isna(raw_val) or str(raw_val).strip() == "":
+                continue
+            jeu_cell = str(jeux_series.iloc[c]).strip() if c < len(jeux_series) else ""
+            m = int_re.search(jeu_cell)
+            jeu_num = int(m.group(1)) if m else c - 1
+            jour_name = str(jours_series.iloc[c]).strip() if c < len(jours_series) else "Séance inconnue"
+            jour_index = day_names.get(jour_name.lower(), 0)
+            if jour_index > 0:
+                if c <= 7:
+                    semaine = 1
+                elif c <= 13:
+                    semaine = 2
+                elif c <= 19:
+                    semaine = 3
+                else:
+                    semaine = 4
+            else:
+                semaine = 1
+
+            record = {"Mois": str(sheet_name), "Joueur": joueur_name, "Seance": jour_name,
+                      "Jour_index": jour_index, "Semaine": semaine, "Jeu": int(jeu_num), "Postes": poste}
+            if poste.lower() != "gardien":
+                val_str = str(raw_val).strip().upper()
+                if val_str not in ("V", "D", "N"):
+                    continue
+                record.update({"Resultat": val_str, "Victoire": 1 if val_str == "V" else 0,
+                               "Défaite": 1 if val_str == "D" else 0, "Nul": 1 if val_str == "N" else 0,
+                               "Buts_encaisses": np.nan})
+            else:
+                try:
+                    buts = float(raw_val)
+                except (TypeError, ValueError):
+                    buts = np.nan
+                record.update({"Resultat": np.nan, "Victoire": np.nan, "Défaite": np.nan, "Nul": np.nan,
+                               "Buts_encaisses": buts})
+            all_records.append(record)
+
+
+def parse_records(sheets):
+    """Table longue de ``sheets`` (liste ``(nom, frame brute)``), calculée comme l'ancien tableau de bord."""
+    all_records = []
+    for sheet_name, raw in sheets:
+        if raw.empty:
+            continue
+        _sheet_records(raw, sheet_name, all_records)
+    df = pd.DataFrame(all_records, columns=COLUMNS)
+    if not df.empty:
+        df["Jeu"] = df["Jeu"].astype(int)
+        df["Seance"] = df["Seance"].fillna("Séance inconnue").astype(str)
+        df["Mois"] = df["Mois"].astype(str)
+        df["Postes"] = df["Postes"].str.strip().str.capitalize()
+    return df
+
+
+def player_ranking(rows):
+    """Classement des joueurs (page Classement)."""
+    ranking = rows.groupby("Joueur", as_index=False).agg({"Victoire": "sum", "Défaite": "sum", "Nul": "sum"})
+    ranking["Total"] = ranking["Victoire"] + ranking["Défaite"]
+    ranking["% Victoire"] = (ranking["Victoire"] / ranking["Total"]).fillna(0)
+    for col in ["Victoire", "Défaite", "Nul", "Total"]:
+        ranking[col] = ranking[col].astype(int)
+    ranking = ranking.sort_values("% Victoire", ascending=False).reset_index(drop=True)
+    ranking.insert(0, "Position", range(1, len(ranking) + 1))
+    return ranking
+
+
+def win_rate_by_game(rows):
+    """% de victoires par numéro de jeu (Graphique 1)."""
+    agg = rows.groupby(["Jeu", "Joueur"], as_index=False).agg({"Victoire": "sum", "Défaite": "sum"})
+    agg["Total"] = agg["Victoire"] + agg["Défaite"]
+    agg["% Victoire"] = (agg["Victoire"] / agg["Total"]).fillna(0)
+    agg["Jeu_str"] = agg["Jeu"].astype(str)
+    return agg
+
+
+def totals_by_player(rows):
+    """Victoires et défaites par joueur, format long (Graphique 3)."""
+    agg = rows.groupby("Joueur", as_index=False).agg({"Victoire": "sum", "Défaite": "sum"})
+    return agg.melt(id_vars="Joueur", value_vars=["Victoire", "Défaite"], var_name="Type", value_name="Nombre")
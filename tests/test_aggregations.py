@@ -0,0 +1,62 @@
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats.stats import Filters, SeasonStats
+
+import reference
+
+SEASON_OPTIONS = dict(seed=3, n_players=12, sessions=8, draw_rate=0.2)
+FILTERS = [
+    Filters(),
+    Filters(mois=["Septembre"], semaines=[1, 2]),
+    Filters(jeu_range=(2, 4), joueurs=["Joueur 001", "Joueur 004", "Joueur 007"]),
+]
+
+
+@pytest.fixture(scope="module")
+def season(season_df):
+    return season_df, SeasonStats(season_df)
+
+
+def _rows(df, filters):
+    # Filtre de l'ancien app.py sur la table longue
+    mask = df["Postes"] != "Gardien"
+    if filters.mois is not None:
+        mask &= df["Mois"].isin(filters.mois)
+    if filters.semaines is not None:
+        mask &= df["Semaine"].isin(filters.semaines)
+    if filters.jeu_range is not None:
+        mask &= df["Jeu"].between(*filters.jeu_range)
+    if filters.joueurs is not None:
+        mask &= df["Joueur"].isin(filters.joueurs)
+    return df.loc[mask]
+
+
+def _normalized(table, keys):
+    table = table.copy()
+    for col in table.columns:
+        if col in ("Joueur", "Type", "Jeu_str"):
+            table[col] = table[col].astype(str)
+        elif col in ("Victoire", "Défaite", "Nul", "Total", "Jeu", "Nombre"):
+            table[col] = table[col].astype("int64")
+    return table.sort_values(keys).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_player_ranking_matches_reference(season, filters):
+    df, stats = season
+    result = stats.player_ranking(filters)
+    expected = reference.player_ranking(_rows(df, filters))
+    assert result["% Victoire"].is_monotonic_decreasing
+    # Positions des ex aequo : ordre libre, seules les lignes sont comparées
+    assert_frame_equal(_normalized(result.drop(columns="Position"), ["Joueur"]),
+                       _normalized(expected.drop(columns="Position"), ["Joueur"]))
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("name, keys", [("win_rate_by_game", ["Jeu", "Joueur"]), ("totals_by_player", ["Joueur", "Type"])])
+def test_cube_aggregations_match_reference(season, filters, name, keys):
+    df, stats = season
+    result = stats.aggregate(name, filters)
+    expected = getattr(reference, name)(_rows(df, filters))
+    assert_frame_equal(_normalized(result, keys), _normalized(expected, keys))
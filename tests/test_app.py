@@ -0,0 +1,58 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from nmf_stats.archive import SeasonArchive
+from nmf_stats.sources import load_season
+from nmf_stats.synthetic import SyntheticSource, synthetic_season
+
+APP = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")
+ARCHIVED = "2019-2020"
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Saison courante : 3 mois, 12 joueurs, servie depuis un dossier de CSV
+    folder = tmp_path / "csv"
+    folder.mkdir()
+    for sheet_name, raw in synthetic_season(3, seed=0, n_players=12, sessions=6).items():
+        raw.to_csv(folder / f"{sheet_name}.csv", header=False, index=False)
+    # Saison archivée : d'autres mois et des joueurs absents de la saison courante
+    past = synthetic_season(2, seed=1, n_players=16, sessions=6)
+    past = dict(zip(["Mars", "Avril"], past.values()))
+    df, _ = load_season(SyntheticSource(past))
+    SeasonArchive(str(tmp_path / "archive")).write_season(ARCHIVED, df)
+
+    monkeypatch.setenv("NMF_SOURCE", str(folder))
+    monkeypatch.setenv("NMF_ARCHIVE", str(tmp_path / "archive"))
+    monkeypatch.setenv("NMF_SNAPSHOT", str(tmp_path / "season.parquet"))
+    monkeypatch.delenv("NMF_DEBUG", raising=False)
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _warnings(at):
+    return [w.value for w in at.warning]
+
+
+@pytest.mark.parametrize("page", ["Classement", "Joueurs", "Gardiens"])
+def test_switching_season_resets_data_filters(app, page):
+    app.sidebar.radio[0].set_value(page).run()
+    app.sidebar.selectbox[0].set_value(ARCHIVED).run()
+
+    assert not app.exception
+    assert not [w for w in _warnings(app) if w.startswith("Aucune donnée")]
+    mois = [m for m in app.multiselect if m.label.startswith("Mois")]
+    assert len(mois) > 1 and all(m.value == ["Mars", "Avril"] for m in mois)  # "Mois chargés" compris
+    if page == "Classement":
+        ranking = app.dataframe[0].value
+        assert len(ranking) == 16  # tous les joueurs de la saison archivée
+
+    # Retour à la saison courante : ses propres valeurs par défaut
+    app.sidebar.selectbox[0].set_value(app.sidebar.selectbox[0].options[0]).run()
+    assert not app.exception
+    mois = [m for m in app.multiselect if m.label.startswith("Mois")]
+    assert all(m.value == ["Août", "Septembre", "Octobre"] for m in mois)
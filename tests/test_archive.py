@@ -0,0 +1,91 @@
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats.archive import SeasonArchive
+from nmf_stats.parsing import COLUMNS
+
+
+@pytest.fixture(scope="module")
+def seasons(make_season):
+    return {"2024-2025": make_season(seed=6, n_players=10, sessions=4),
+            "2025-2026": make_season(4, seed=7, n_players=12, sessions=4)}
+
+
+@pytest.fixture
+def archive(tmp_path, seasons):
+    archive = SeasonArchive(str(tmp_path / "archive"))
+    for saison, df in seasons.items():
+        archive.write_season(saison, df)
+    return archive
+
+
+def _sorted(df, columns):
+    df = df[columns].copy()
+    for col in df.columns:
+        if col in ("Saison", "Mois", "Joueur", "Seance", "Postes", "Resultat"):
+            df[col] = df[col].astype(str)
+    return df.sort_values(columns[:7]).reset_index(drop=True)  # clé unique : saison, mois, séance, semaine, jeu, joueur
+
+
+def _expected(seasons, saisons=None, mois=None, joueurs=None):
+    df = pd.concat([df.assign(Saison=saison) for saison, df in seasons.items()
+                    if saisons is None or saison in saisons], ignore_index=True)
+    if mois is not None:
+        df = df[df["Mois"].isin(mois)]
+    if joueurs is not None:
+        df = df[df["Joueur"].isin(joueurs)]
+    return df
+
+
+def test_one_partition_per_season_and_month(archive, seasons):
+    assert archive.seasons() == sorted(seasons)
+    for saison, df in seasons.items():
+        assert sorted(archive.months(saison)) == sorted(df["Mois"].unique())
+        for mois in df["Mois"].unique():
+            folder = os.path.join(archive.root, f"Saison={saison}", f"Mois={mois}")
+            assert os.listdir(folder) == ["data.parquet"]
+    assert archive.months("1999-2000") == []
+
+
+def test_only_changed_months_are_rewritten(archive, seasons):
+    df = seasons["2025-2026"]
+    version = archive.version()
+    assert archive.write_season("2025-2026", df) == []
+    assert archive.version() == version
+
+    changed = df.copy()
+    changed.loc[changed["Mois"] == "Octobre", "Jeu"] += 1
+    assert archive.write_season("2025-2026", changed) == ["Octobre"]
+    assert archive.version() != version
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"saisons": ["2025-2026"]},
+    {"saisons": ["2024-2025"], "mois": ["Septembre", "Octobre"]},
+    {"joueurs": ["Joueur 001", "Joueur 009", "Gardien 00"]},
+    {"saisons": ["2025-2026"], "mois": ["Novembre"], "joueurs": ["Joueur 011"]},
+])
+def test_load_filters_match_pandas(archive, seasons, filters):
+    result = archive.load(**filters)
+    expected = _expected(seasons, **filters)
+    assert sorted(result.columns) == sorted(COLUMNS + ["Saison"])
+    assert len(result) == len(expected) > 0
+    columns = ["Saison", "Mois", "Seance", "Jeu", "Joueur", "Postes", "Semaine", "Resultat", "Buts_encaisses"]
+    assert_frame_equal(_sorted(result, columns), _sorted(expected, columns), check_dtype=False)
+
+
+def test_load_selected_columns(archive):
+    result = archive.load(saisons=["2024-2025"], columns=["Saison", "Joueur", "Victoire"])
+    assert list(result.columns) == ["Saison", "Joueur", "Victoire"]
+    assert set(result["Saison"].astype(str)) == {"2024-2025"}
+
+
+def test_empty_archive(tmp_path):
+    archive = SeasonArchive(str(tmp_path / "vide"))
+    assert archive.seasons() == []
+    assert archive.load().empty
+    assert list(archive.load().columns) == COLUMNS + ["Saison"]
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats import associations
+from nmf_stats.associations import AssociationCube, count_associations
+
+SEASON_OPTIONS = dict(seed=1, n_players=12, sessions=8, players_per_game=8)
+FILTERS = [{}, {"mois": ["Septembre"]}, {"semaines": [1, 3], "jeu_range": (2, 5)}]
+
+
+def _ranked(counts):
+    # Référence : tous les groupes, classés par % décroissant puis par nom (noms de même longueur)
+    total = counts["Victoires"] + counts["Défaites"]
+    rate = np.divide(counts["Victoires"], total, out=np.zeros(len(counts)), where=total > 0)
+    return counts.assign(rate=rate).sort_values(["rate", "Groupe"], ascending=[False, True], kind="stable")
+
+
+@pytest.mark.parametrize("k", [2, 3, 4])
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("min_games", [1, 3])
+def test_top_matches_full_ranking(players, filter_rows, k, filters, min_games, monkeypatch):
+    monkeypatch.setattr(associations, "_TOP_BLOCK_SIZE", 7)  # plusieurs blocs même sur une petite saison
+    cube = AssociationCube(players)
+    expected = _ranked(count_associations(filter_rows(players, **filters), k, min_games=min_games))
+    top, summary = cube.top(k, 10, min_games=min_games, **filters)
+
+    assert summary.groupes == len(expected)
+    if expected.empty:
+        assert top.empty and summary.meilleur is None
+        return
+    assert_frame_equal(top.reset_index(drop=True),
+                       expected.drop(columns="rate").head(10).reset_index(drop=True), check_dtype=False)
+    most_active = expected.sort_values("Nb_jeux", ascending=False, kind="stable").iloc[0]
+    assert summary.plus_actif["Groupe"] == most_active["Groupe"]
+    assert summary.plus_actif["Nb_jeux"] == most_active["Nb_jeux"]
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nmf_stats.charts import chart_data, downsample_lines
+from nmf_stats.stats import SeasonStats
+
+SEASON_OPTIONS = dict(n_months=6, seed=8, n_players=15, sessions=12)
+
+
+def _lines(n_series=8, n_periods=200):
+    # Courbes de longueurs différentes : la série i commence à la période 7 i et finit à n_periods - 5 i
+    rows = [(f"P{p:03d}", f"Joueur {i}", p * 10 + i)
+            for p in range(n_periods) for i in range(n_series) if 7 * i <= p < n_periods - 5 * i]
+    return pd.DataFrame(rows, columns=["Seance_ID", "Joueur", "Valeur"])
+
+
+def _ends(df):
+    grouped = df.groupby("Joueur", sort=False)
+    return set(grouped.head(1).index) | set(grouped.tail(1).index)
+
+
+@pytest.mark.parametrize("budget", [16, 50, 333, 1000])
+def test_downsampling_keeps_line_ends_within_budget(budget):
+    df = _lines()
+    result = downsample_lines(df, "Seance_ID", "Joueur", budget)
+    assert len(result) <= budget
+    assert _ends(df) <= set(result.index)
+    # Sous-ensemble des lignes, ordre conservé
+    assert result.index.is_monotonic_increasing and set(result.index) <= set(df.index)
+
+
+def test_downsampling_keeps_whole_periods():
+    df = _lines()
+    result = downsample_lines(df, "Seance_ID", "Joueur", 400)
+    inner = result.drop(index=list(_ends(df)))
+    # Une période retenue l'est pour toutes les séries qui y ont un point
+    kept = df[df["Seance_ID"].isin(inner["Seance_ID"])]
+    assert set(kept.index) <= set(result.index)
+
+
+def test_small_budget_keeps_only_line_ends():
+    df = _lines()
+    result = downsample_lines(df, "Seance_ID", "Joueur", 10)
+    assert set(result.index) == _ends(df)
+
+
+@pytest.mark.parametrize("budget", [0, None, 10_000])
+def test_within_budget_is_unchanged(budget):
+    df = _lines()
+    assert downsample_lines(df, "Seance_ID", "Joueur", budget) is df
+
+
+def test_season_curves(season_df):
+    table = SeasonStats(season_df).aggregate("cumulative_by_session")
+    budget = len(table) // 4
+    result = downsample_lines(table, "Seance_ID", "Joueur", budget)
+    assert len(result) <= budget
+    assert _ends(table) <= set(result.index)
+    # Valeur finale exacte de chaque courbe
+    last = result.groupby("Joueur", observed=True)["% Victoire cumulée"].last()
+    expected = table.groupby("Joueur", observed=True)["% Victoire cumulée"].last()
+    np.testing.assert_array_equal(last.to_numpy(), expected.loc[last.index].to_numpy())
+
+
+def test_chart_data_keeps_encoded_columns():
+    df = _lines()
+    assert list(chart_data(df, ["Valeur", "Joueur", "Valeur"]).columns) == ["Valeur", "Joueur"]
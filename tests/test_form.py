@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+import pytest
+
+from nmf_stats.form import FORM_MODES, FormEngine
+from nmf_stats.timeline import SessionTimeline
+
+SEASON_OPTIONS = dict(seed=5, n_players=12, sessions=6, draw_rate=0.2)
+SESSION_KEYS = ["Mois", "Semaine", "Jour_index", "Seance"]
+
+
+@pytest.fixture(scope="module")
+def engine(players):
+    return FormEngine(players, SessionTimeline.build(players))
+
+
+def _ewm(outcomes, halflife):
+    # Moyenne exponentielle (pandas, adjust=True, ignore_na=True) : poids (1 - alpha)^âge, nuls ignorés
+    decay = 0.5 ** (1 / halflife)
+    values = [x for x in outcomes if x is not None]
+    if not values:
+        return 0.0
+    weights = [decay ** age for age in range(len(values) - 1, -1, -1)]
+    return sum(w * x for w, x in zip(weights, values)) / sum(weights)
+
+
+def _naive_form(players, mode, n, mask=None):
+    """Référence : boucle joueur par joueur, fenêtre recalculée à la fin de chaque séance.
+
+    Renvoie ``{(joueur, mois, semaine, seance): (forme, jeux_fenetre)}``.
+    """
+    rows = players if mask is None else players[mask]
+    expected = {}
+    for joueur, seq in rows.groupby("Joueur", observed=True, sort=False):
+        results = seq["Resultat"].astype(str).tolist()
+        keys = list(zip(*(seq[k].astype(str) if k in ("Mois", "Seance") else seq[k].astype(int) for k in SESSION_KEYS)))
+        # Séances du joueur : lignes consécutives de même clé (table triée chronologiquement)
+        units = []
+        for i, key in enumerate(keys):
+            if not units or units[-1][0] != key:
+                units.append((key, []))
+            units[-1][1].append(results[i])
+        seen = []
+        for u, (key, unit_results) in enumerate(units):
+            seen += unit_results
+            if mode == "seances":
+                window = [r for _, rs in units[max(0, u - n + 1):u + 1] for r in rs]
+            else:
+                window = seen[-n:]
+            wins, losses = window.count("V"), window.count("D")
+            if mode == "ewm":
+                outcomes = [1.0 if r == "V" else 0.0 if r == "D" else None for r in seen]
+                forme, jeux = _ewm(outcomes, n), len(seen)
+            else:
+                forme, jeux = (wins / (wins + losses) if wins + losses else 0.0), wins + losses
+            mois, semaine, _, seance = key
+            expected[(str(joueur), mois, semaine, seance)] = (forme, jeux)
+    return expected
+
+
+def _as_dict(form):
+    return {(j, str(m), int(s), str(se)): (f, int(n)) for j, m, s, se, f, n in
+            form[["Joueur", "Mois", "Semaine", "Seance", "Forme", "Jeux_fenetre"]].itertuples(index=False)}
+
+
+def _assert_same(result, expected):
+    assert result.keys() == expected.keys()
+    for key, (forme, jeux) in expected.items():
+        assert math.isclose(result[key][0], forme, abs_tol=1e-9), key
+        assert result[key][1] == jeux, key
+
+
+@pytest.mark.parametrize("mode", list(FORM_MODES))
+@pytest.mark.parametrize("n", [1, 3, 10])
+def test_by_session_matches_naive_loop(players, engine, mode, n):
+    _assert_same(_as_dict(engine.by_session(mode, n)), _naive_form(players, mode, n))
+
+
+@pytest.mark.parametrize("mode", list(FORM_MODES))
+def test_masked_rows_are_left_out(players, engine, mode):
+    mask = ((players["Jeu"] <= 4) & (players["Semaine"] != 2)).to_numpy()
+    _assert_same(_as_dict(engine.by_session(mode, 3, mask)), _naive_form(players, mode, 3, mask))
+
+
+def test_sessions_are_in_chronological_order(players, engine):
+    form = engine.by_session("jeux", 5)
+    position = {key: i for i, key in enumerate(dict.fromkeys(
+        zip(players["Mois"].astype(str), players["Semaine"].astype(int), players["Seance"].astype(str))))}
+    order = [position[key] for key in zip(form["Mois"].astype(str), form["Semaine"].astype(int), form["Seance"].astype(str))]
+    assert order == sorted(order)
+
+
+@pytest.mark.parametrize("mode", list(FORM_MODES))
+def test_latest_is_last_session_of_each_player(players, engine, mode):
+    latest = engine.latest(mode, 4)
+    per_session = engine.by_session(mode, 4)
+    last = per_session.groupby("Joueur").tail(1).set_index("Joueur")
+    assert list(latest["Joueur"]) == sorted(last.index)
+    np.testing.assert_allclose(latest["Forme"], last.loc[latest["Joueur"], "Forme"])
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from nmf_stats.intervals import bootstrap_interval, wilson_interval
+
+
+@pytest.mark.parametrize("interval", [wilson_interval, bootstrap_interval])
+def test_extreme_records_have_non_degenerate_intervals(interval):
+    low, high = interval([1, 0, 10], [1, 3, 10])
+    assert np.all(high - low > 0)
+    # 1 victoire sur 1 jeu ne passe pas devant 30 sur 40 au classement par IC bas
+    ranked_low, _ = interval([1, 3, 30], [1, 4, 40])
+    assert ranked_low[2] > ranked_low[1] and ranked_low[2] > ranked_low[0]
+
+
+@pytest.mark.parametrize("interval", [wilson_interval, bootstrap_interval])
+def test_empty_records_give_nan(interval):
+    low, high = interval([0, 2], [0, 4])
+    assert np.isnan(low[0]) and np.isnan(high[0])
+    assert low[1] <= 0.5 <= high[1]
+
+
+def test_bootstrap_is_deterministic_and_shared_by_equal_records():
+    wins, totals = [3, 7, 3], [5, 9, 5]
+    first, second = bootstrap_interval(wins, totals), bootstrap_interval(wins, totals)
+    np.testing.assert_array_equal(first, second)
+    assert first[0][0] == first[0][2] and first[1][0] == first[1][2]
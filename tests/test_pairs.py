@@ -0,0 +1,48 @@
+import pytest
+
+from nmf_stats.associations import count_associations
+from nmf_stats.pairs import PairMatrix
+
+# Peu de joueurs par jeu : certaines paires ne jouent jamais ensemble, d'autres moins de 3 fois
+SEASON_OPTIONS = dict(seed=4, n_players=20, sessions=4, players_per_game=6, draw_rate=0.2)
+FILTERS = [{}, {"mois": ["Septembre"]}, {"semaines": [1, 3], "jeu_range": (2, 5)}]
+
+
+def _expected(rows, min_games):
+    # Référence : l'énumération des paires du Graphique 5 (k = 2), par nom de groupe
+    counts = count_associations(rows, 2, min_games=min_games)
+    return {g: (v, d, n) for g, v, d, n in counts[["Groupe", "Victoires", "Défaites", "Nb_jeux"]].itertuples(index=False)}
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("min_games", [1, 3])
+def test_table_matches_count_associations(players, filter_rows, filters, min_games):
+    table = PairMatrix(players).table(min_games=min_games, **filters)
+    expected = _expected(filter_rows(players, **filters), min_games)
+
+    # Chaque paire figure dans les deux sens, avec le même bilan
+    assert len(table) == 2 * len(expected)
+    reverse = table.rename(columns={"Joueur": "Partenaire", "Partenaire": "Joueur"})
+    assert set(map(tuple, table.to_numpy())) == set(map(tuple, reverse[table.columns].to_numpy()))
+
+    ordered = table[table["Joueur"] < table["Partenaire"]]
+    got = {f"{a} & {b}": (v, d, n) for a, b, v, d, n in
+           ordered[["Joueur", "Partenaire", "Victoires", "Défaites", "Nb_jeux"]].itertuples(index=False)}
+    assert got == expected
+    total = ordered["Victoires"] + ordered["Défaites"]
+    assert (ordered["% Victoire"] == (ordered["Victoires"] / total).where(total > 0, 0)).all()
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_pair_matches_count_associations(players, filter_rows, filters):
+    matrix = PairMatrix(players)
+    expected = _expected(filter_rows(players, **filters), 1)
+    for group, record in expected.items():
+        a, b = group.split(" & ")
+        assert matrix.pair(a, b, **filters) == record
+        assert matrix.pair(b, a, **filters) == record
+
+
+def test_pair_of_unknown_player_is_empty(players):
+    matrix = PairMatrix(players)
+    assert matrix.pair("Inconnu", matrix.joueurs[0]) == (0, 0, 0)
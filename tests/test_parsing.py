@@ -0,0 +1,60 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats.parsing import finalize_records, parse_csv, parse_sheet
+from nmf_stats.synthetic import synthetic_season
+
+from reference import parse_records
+
+WORKBOOK = os.path.join(os.path.dirname(__file__), "..", "Seances_V_D_2026.xlsx")
+
+
+def _workbook_sheets():
+    return list(pd.read_excel(WORKBOOK, sheet_name=None, header=None).items())
+
+
+def _csv_bytes(raw):
+    return raw.to_csv(index=False, header=False).encode()
+
+
+def test_parse_sheet_matches_reference_on_workbook():
+    sheets = _workbook_sheets()
+    expected = parse_records(sheets)
+    assert not expected.empty
+    result = finalize_records([parse_sheet(raw, name) for name, raw in sheets])
+    assert_frame_equal(result, expected)
+
+
+def test_parse_csv_matches_reference_on_workbook():
+    # Même chemin que le Google Sheet : l'onglet arrive en CSV et l'ancien code le relisait avec read_csv
+    contents = [(name, _csv_bytes(raw)) for name, raw in _workbook_sheets()]
+    expected = parse_records([(name, pd.read_csv(io.BytesIO(content), header=None))
+                              for name, content in contents])
+    result = finalize_records([parse_csv(content, name) for name, content in contents])
+    assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_parse_sheet_matches_reference_on_synthetic_season(seed):
+    sheets = list(synthetic_season(3, seed=seed, sessions=25, draw_rate=0.2).items())
+    expected = parse_records(sheets)
+    result = finalize_records([parse_sheet(raw, name) for name, raw in sheets])
+    assert_frame_equal(result, expected)
+
+
+def test_unexpected_cells_are_skipped_like_reference():
+    raw = pd.DataFrame([
+        [np.nan, "Lundi", np.nan, "Mardi"],
+        ["Joueurs", "Postes", "Jeu 1", "Jeu 2"],
+        ["Ana", "joueur", " v ", "x"],
+        ["Bob", np.nan, "D", "N"],
+        ["  ", "Joueur", "V", "V"],
+        ["Gus", "Gardien", "3", "abc"],
+    ])
+    sheets = [("Septembre", raw)]
+    assert_frame_equal(finalize_records([parse_sheet(raw, "Septembre")]), parse_records(sheets))
@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats import ratings as ratings_module
+from nmf_stats.ratings import INITIAL_RATING, K_FACTOR, rate_players, update_ratings
+from nmf_stats.timeline import SessionTimeline, update_timeline
+
+SEASON_OPTIONS = dict(seed=2, n_players=14, sessions=7, draw_rate=0.15)
+
+
+def _naive_elo(players, period):
+    # Référence : boucle jeu par jeu, Elo du début de séance, variations appliquées en fin de séance
+    ratings, games = defaultdict(lambda: INITIAL_RATING), defaultdict(int)
+    rows = list(zip(period, players["Jeu"], players["Joueur"].astype(str), players["Resultat"].astype(str)))
+    for p in dict.fromkeys(period):
+        start = dict(ratings)
+        delta = defaultdict(float)
+        by_game = defaultdict(lambda: ([], []))
+        for row_period, jeu, joueur, resultat in rows:
+            ratings[joueur]  # joueur connu même sans jeu noté
+            if row_period == p and resultat in ("V", "D"):
+                by_game[jeu][0 if resultat == "V" else 1].append(joueur)
+        for winners, losers in by_game.values():
+            if not winners or not losers:
+                continue
+            mean_win = np.mean([start.get(j, INITIAL_RATING) for j in winners])
+            mean_loss = np.mean([start.get(j, INITIAL_RATING) for j in losers])
+            gain = K_FACTOR * (1 - 1 / (1 + 10 ** ((mean_loss - mean_win) / 400)))
+            for j in winners:
+                delta[j] += gain
+                games[j] += 1
+            for j in losers:
+                delta[j] -= gain
+                games[j] += 1
+        for j, d in delta.items():
+            ratings[j] += d
+    return ratings, games
+
+
+def test_ratings_match_naive_loop(players):
+    timeline = SessionTimeline.build(players)
+    table = rate_players(players, timeline).table()
+    ratings, games = _naive_elo(players, timeline.axes["seance"].row_pos)
+    assert sorted(table["Joueur"]) == sorted(ratings)
+    for joueur, elo, jeux in table.itertuples(index=False):
+        assert elo == int(np.round(ratings[joueur]))
+        assert jeux == games[joueur]
+
+
+@pytest.mark.parametrize("cuts", [(0.4,), (0.25, 0.5, 0.8), (0.333, 0.334)])
+def test_incremental_updates_equal_full_rating(players, cuts, monkeypatch):
+    # Coupures arbitraires : la dernière séance peut être complétée par la mise à jour suivante
+    full_timeline = SessionTimeline.build(players)
+    full = rate_players(players, full_timeline)
+
+    ratings = timeline = None
+    for cut in list(cuts) + [1.0]:
+        part = players.iloc[:int(len(players) * cut)]
+        timeline = update_timeline(timeline, part)
+        ratings = update_ratings(ratings, part, timeline)
+        assert ratings.n_rows == len(part)
+        # Les mises à jour suivantes doivent prolonger, jamais tout recalculer
+        monkeypatch.setattr(ratings_module, "rate_players", None)
+
+    np.testing.assert_allclose(ratings.ratings[[ratings.joueurs.index(j) for j in full.joueurs]], full.ratings)
+    assert_frame_equal(ratings.table(), full.table())
+
+
+def test_previous_ratings_are_not_modified(players):
+    half = players.iloc[:len(players) // 2]
+    timeline = update_timeline(None, half)
+    previous = update_ratings(None, half, timeline)
+    before = previous.table()
+    update_ratings(previous, players, update_timeline(timeline, players))
+    assert_frame_equal(previous.table(), before)
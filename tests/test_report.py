@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats.report import SEASON, export_report
+from nmf_stats.stats import Filters, SeasonStats
+
+SEASON_OPTIONS = dict(seed=9, n_players=10, sessions=6, players_per_game=8)
+TABLES = ["joueurs", "gardiens", "paires", "trios"]
+
+
+@pytest.fixture(scope="module")
+def periods(season_df):
+    return [SEASON] + list(pd.unique(season_df["Mois"]))
+
+
+def _files(root):
+    return sorted(os.path.relpath(os.path.join(folder, name), root)
+                  for folder, _, names in os.walk(root) for name in names)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_export_writes_every_period_and_table(tmp_path, season_df, periods, workers):
+    paths = export_report(season_df, str(tmp_path), "csv", workers=workers)
+    expected = sorted(os.path.join(period, f"{table}.csv") for period in periods for table in TABLES)
+    assert _files(tmp_path) == expected
+    assert sorted(os.path.relpath(p, tmp_path) for p in paths) == expected
+
+
+def test_tables_match_season_stats(tmp_path, season_df, periods):
+    export_report(season_df, str(tmp_path), "parquet", workers=1)
+    stats = SeasonStats(season_df)
+    for period in periods:
+        filters = Filters(mois=None if period == SEASON else [period])
+        written = pd.read_parquet(tmp_path / period / "joueurs.parquet")
+        expected = stats.player_ranking(filters, "wilson")
+        assert_frame_equal(written, expected.reset_index(drop=True), check_dtype=False, check_categorical=False)
+
+
+def test_xlsx_export_has_one_workbook_per_period(tmp_path, season_df, periods):
+    export_report(season_df, str(tmp_path), "xlsx", workers=1)
+    assert _files(tmp_path) == sorted(f"{period}.xlsx" for period in periods)
+    sheets = pd.read_excel(tmp_path / f"{periods[1]}.xlsx", sheet_name=None)
+    assert list(sheets) == TABLES
+
+
+def test_unknown_format_is_rejected(tmp_path, season_df):
+    with pytest.raises(ValueError):
+        export_report(season_df, str(tmp_path), "json")
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats.snapshot import SeasonStore, frame_hash, load_snapshot, save_snapshot
+
+
+@pytest.fixture(scope="module")
+def seasons(make_season):
+    # Saison enregistrée et saison relue à la source
+    return make_season(seed=0, n_players=10, sessions=4), make_season(seed=1, n_players=10, sessions=4)
+
+
+class _Loader:
+    """Source simulée : renvoie les résultats ``(df, erreurs)`` donnés, dans l'ordre."""
+
+    def __init__(self, *results, delay=0):
+        self.results = list(results)
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            return self.results[min(self.calls, len(self.results)) - 1]
+
+
+def _without(df, mois):
+    return df[df["Mois"] != mois].reset_index(drop=True)
+
+
+def test_serves_snapshot_then_revalidates_in_background(tmp_path, seasons):
+    old, new = seasons
+    path = str(tmp_path / "season.parquet")
+    save_snapshot(old, path)
+    changes = []
+    store = SeasonStore(path, _Loader((new, [])), on_change=changes.append)
+
+    df, version, errors = store.get()
+    assert store.from_snapshot
+    assert_frame_equal(df, old)
+    assert version == frame_hash(old) and errors == []
+
+    store._thread.join()
+    df, version, _ = store.get()
+    assert_frame_equal(df, new)
+    assert version == frame_hash(new) and not store.from_snapshot
+    assert len(changes) == 1
+    assert_frame_equal(load_snapshot(path)[0], new)
+
+
+def test_unchanged_source_does_not_rewrite_snapshot(tmp_path, seasons):
+    old, _ = seasons
+    path = str(tmp_path / "season.parquet")
+    save_snapshot(old, path)
+    mtime = os.stat(path).st_mtime_ns
+    changes = []
+    store = SeasonStore(path, _Loader((old.copy(), [])), on_change=changes.append)
+    store.revalidate()
+    assert not store.from_snapshot and changes == []
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("result", ["empty", "partial"])
+def test_failed_reload_keeps_full_season(tmp_path, seasons, result):
+    old, new = seasons
+    path = str(tmp_path / "season.parquet")
+    save_snapshot(old, path)
+    error = ("Septembre", TimeoutError("délai dépassé"))
+    reloaded = old.iloc[:0] if result == "empty" else _without(new, "Septembre")
+    store = SeasonStore(path, _Loader((reloaded, [error])))
+    store.revalidate()
+
+    df, version, errors = store.get()
+    assert_frame_equal(df, old)
+    assert version == frame_hash(old) and errors == [error]
+    assert_frame_equal(load_snapshot(path)[0], old)
+
+
+def test_failed_tab_with_replacement_frame_is_served(tmp_path, seasons):
+    # Onglet en échec mais remplacé par sa dernière frame (TabCache) : rien ne manque
+    old, new = seasons
+    path = str(tmp_path / "season.parquet")
+    save_snapshot(old, path)
+    store = SeasonStore(path, _Loader((new, [("Septembre", TimeoutError())])))
+    store.revalidate()
+    assert_frame_equal(store.get()[0], new)
+    assert_frame_equal(load_snapshot(path)[0], new)
+
+
+def test_partial_first_load_is_served_but_not_saved(tmp_path, seasons):
+    _, new = seasons
+    path = str(tmp_path / "season.parquet")
+    partial = _without(new, "Septembre")
+    store = SeasonStore(path, _Loader((partial, [("Septembre", TimeoutError())]), (new, [])))
+    assert_frame_equal(store.get()[0], partial)
+    assert not os.path.exists(path)
+
+    store.revalidate()
+    assert_frame_equal(store.get()[0], new)
+    assert_frame_equal(load_snapshot(path)[0], new)
+
+
+def test_cold_start_loads_source_once(tmp_path, seasons):
+    old, _ = seasons
+    loader = _Loader((old, []), delay=0.2)
+    store = SeasonStore(str(tmp_path / "season.parquet"), loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get()[1])) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.calls == 1
+    assert results == [frame_hash(old)] * 8
+
+
+def test_concurrent_saves_leave_one_valid_snapshot(tmp_path, seasons):
+    path = str(tmp_path / "season.parquet")
+    threads = [threading.Thread(target=save_snapshot, args=(seasons[i % 2], path)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    df, meta = load_snapshot(path)
+    assert meta["data_hash"] == frame_hash(df)
+    assert os.listdir(tmp_path) == ["season.parquet"]
@@ -0,0 +1,86 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from pandas.testing import assert_frame_equal
+
+from nmf_stats.parsing import finalize_records, parse_sheet
+from nmf_stats.sources import GoogleSheetSource, fetch_tabs, load_season
+from nmf_stats.synthetic import synthetic_season
+
+# Onglets servis par le serveur local : gid -> (feuille brute, délai en secondes) ; gid absent -> 404
+SEASON = synthetic_season(3, seed=0, sessions=8)
+MONTHS = list(SEASON)
+SLOW_DELAY = 1.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    tabs = {}
+
+    def do_GET(self):
+        gid = int(parse_qs(urlparse(self.path).query)["gid"][0])
+        if gid not in self.tabs:
+            self.send_error(404)
+            return
+        raw, delay = self.tabs[gid]
+        time.sleep(delay)
+        body = raw.to_csv(index=False, header=False).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # le client a abandonné (délai dépassé)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.tabs = {1: (SEASON[MONTHS[0]], 0.0), 2: (SEASON[MONTHS[1]], SLOW_DELAY), 3: (SEASON[MONTHS[2]], 0.0)}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/{{sheet_id}}/export?format=csv&gid={{gid}}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+SHEETS = [(MONTHS[0], 1), (MONTHS[1], 2), ("Absent", 404), (MONTHS[2], 3)]
+
+
+def test_slow_tab_does_not_block_and_missing_tab_is_reported(server):
+    start = time.perf_counter()
+    tabs = fetch_tabs(SHEETS, url_template=server, timeout=(2, 10))
+    elapsed = time.perf_counter() - start
+
+    assert [name for name, _, _ in tabs] == [name for name, _ in SHEETS]
+    by_name = {name: (content, error) for name, content, error in tabs}
+    assert by_name["Absent"][0] is None
+    assert isinstance(by_name["Absent"][1], requests.HTTPError)
+    for month in MONTHS:
+        content, error = by_name[month]
+        assert error is None and content
+    # Onglets téléchargés en parallèle : le lent ne s'ajoute pas aux autres
+    assert elapsed < SLOW_DELAY + 0.8
+
+
+def test_slow_tab_times_out_alone(server):
+    tabs = fetch_tabs(SHEETS, url_template=server, timeout=(2, 0.2))
+    by_name = {name: (content, error) for name, content, error in tabs}
+    assert by_name[MONTHS[1]][0] is None
+    assert isinstance(by_name[MONTHS[1]][1], requests.RequestException)
+    assert by_name[MONTHS[0]][1] is None and by_name[MONTHS[2]][1] is None
+
+
+def test_google_source_matches_direct_parse(server):
+    df, errors = load_season(GoogleSheetSource(sheets=SHEETS, url_template=server, timeout=(2, 10)))
+    assert [name for name, _ in errors] == ["Absent"]
+    expected = finalize_records([parse_sheet(SEASON[m], m) for m in MONTHS])
+    assert_frame_equal(df, expected)
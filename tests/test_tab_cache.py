@@ -0,0 +1,63 @@
+import pytest
+
+from nmf_stats.parsing import parse_csv
+from nmf_stats.synthetic import synthetic_season
+from nmf_stats.tab_cache import TabCache
+
+
+def _tabs(season):
+    return [(name, raw.to_csv(index=False, header=False).encode(), None) for name, raw in season.items()]
+
+
+@pytest.fixture
+def tabs():
+    return _tabs(synthetic_season(3, seed=0, sessions=6))
+
+
+def _counting(parser, calls):
+    def parse(content, sheet_name):
+        calls.append(sheet_name)
+        return parser(content, sheet_name)
+    return parse
+
+
+def test_only_changed_tabs_are_parsed_again(tabs):
+    cache, calls = TabCache(), []
+    first, errors = cache.refresh(tabs, _counting(parse_csv, calls))
+    assert not errors and calls == [name for name, _, _ in tabs]
+    assert cache.last_stats == {"parsed": 3, "skipped": 0, "total": 3}
+
+    # Seul le dernier onglet (mois en cours) change
+    changed = _tabs(synthetic_season(3, seed=1, sessions=6))[2]
+    calls.clear()
+    second, errors = cache.refresh(tabs[:2] + [changed], _counting(parse_csv, calls))
+    assert not errors and calls == [changed[0]]
+    assert cache.last_stats == {"parsed": 1, "skipped": 2, "total": 3}
+    assert second[0] is first[0] and second[1] is first[1]
+    assert second[2] is not first[2]
+
+
+def test_failed_tab_keeps_last_frame(tabs):
+    cache = TabCache()
+    first, _ = cache.refresh(tabs, parse_csv)
+
+    timeout = TimeoutError("délai dépassé")
+    broken = [tabs[0], (tabs[1][0], None, timeout), (tabs[2][0], b"\x00", None)]
+    frames, errors = cache.refresh(broken, lambda content, name: 1 / 0 if content == b"\x00" else parse_csv(content, name))
+    assert [name for name, _ in errors] == [tabs[1][0], tabs[2][0]]
+    assert errors[0][1] is timeout
+    assert len(frames) == 3 and all(f is g for f, g in zip(frames, first))
+
+
+def test_failed_tab_without_previous_frame_is_dropped(tabs):
+    cache = TabCache()
+    frames, errors = cache.refresh([tabs[0], (tabs[1][0], None, TimeoutError())], parse_csv)
+    assert len(frames) == 1 and [name for name, _ in errors] == [tabs[1][0]]
+
+
+def test_vanished_tabs_are_forgotten(tabs):
+    cache, calls = TabCache(), []
+    cache.refresh(tabs, parse_csv)
+    cache.refresh(tabs[:2], parse_csv)
+    cache.refresh(tabs, _counting(parse_csv, calls))
+    assert calls == [tabs[2][0]]
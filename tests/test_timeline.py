@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nmf_stats import timeline as timeline_module
+from nmf_stats.tables import SeasonTables
+from nmf_stats.timeline import SessionTimeline, update_timeline
+
+SEASON_OPTIONS = dict(n_months=4, n_players=12, sessions=6)
+
+
+def _naive_session_totals(players, mask=None):
+    # Référence : tri chronologique explicite puis cumul par joueur
+    rows = players if mask is None else players[mask]
+    keys = ["Mois", "Semaine", "Jour_index", "Seance"]
+    per_session = (rows.astype({"Victoire": "int64", "Défaite": "int64"})
+                   .groupby(["Joueur"] + keys, observed=True, as_index=False)[["Victoire", "Défaite"]].sum())
+    # Mois : catégorie ordonnée dans l'ordre de la saison
+    per_session = per_session.sort_values(["Joueur", "Mois", "Semaine", "Jour_index", "Seance"], kind="stable")
+    per_session["Victoire_cum"] = per_session.groupby("Joueur", observed=True)["Victoire"].cumsum()
+    per_session["Total_cum"] = (per_session["Victoire"] + per_session["Défaite"]).groupby(per_session["Joueur"], observed=True).cumsum()
+    return per_session
+
+
+def _comparable(totals, players):
+    out = totals.copy()
+    out["Mois"] = pd.Categorical(out["Mois"].astype(str), categories=players["Mois"].cat.categories).codes
+    out["Joueur"] = out["Joueur"].astype(str)
+    out = out[["Joueur", "Mois", "Semaine", "Jour_index", "Seance", "Victoire", "Défaite", "Victoire_cum", "Total_cum"]]
+    out = out.astype({"Semaine": "int64", "Jour_index": "int64", "Seance": str, "Victoire": "int64",
+                      "Défaite": "int64", "Victoire_cum": "int64", "Total_cum": "int64", "Mois": "int64"})
+    return out.sort_values(["Joueur", "Mois", "Semaine", "Jour_index", "Seance"]).reset_index(drop=True)
+
+
+def test_session_totals_follow_season_order(players):
+    timeline = SessionTimeline.build(players)
+    mask = (players["Jeu"] <= 4).to_numpy()
+    for m in (None, mask):
+        result = _comparable(timeline.running_totals("seance", m), players)
+        expected = _comparable(_naive_session_totals(players, m), players)
+        assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("cut", [0.3, 0.5, 0.77])
+def test_extending_a_prefix_equals_full_build(players, cut, monkeypatch):
+    # Coupure arbitraire, y compris au milieu d'une séance
+    n = int(len(players) * cut)
+    previous = update_timeline(None, players.iloc[:n])
+
+    def no_rebuild(cls, rows):
+        raise AssertionError("reconstruction complète au lieu d'une extension")
+
+    full = SessionTimeline.build(players)
+    monkeypatch.setattr(SessionTimeline, "build", classmethod(no_rebuild))
+    extended = update_timeline(previous, players)
+
+    mask = (players["Semaine"] != 2).to_numpy()
+    for axis in timeline_module.AXES:
+        for m in (None, mask):
+            assert_frame_equal(extended.running_totals(axis, m), full.running_totals(axis, m))
+    # La version précédente n'est pas modifiée
+    assert previous.n_rows == n
+
+
+def test_new_months_extend_previous_season(make_season):
+    options = dict(SEASON_OPTIONS, n_months=2)
+    short, long = SeasonTables(make_season(**options)).players, SeasonTables(make_season(**SEASON_OPTIONS)).players
+    assert len(long) > len(short)
+    extended = update_timeline(update_timeline(None, short), long)
+    full = SessionTimeline.build(long)
+    for axis in timeline_module.AXES:
+        assert_frame_equal(extended.running_totals(axis), full.running_totals(axis))
+
+
+def test_changed_history_falls_back_to_full_build(players):
+    previous = update_timeline(None, players)
+    altered = players.copy()
+    altered.loc[altered.index[0], "Victoire"] = 1 - altered["Victoire"].iloc[0]
+    rebuilt = update_timeline(previous, altered)
+    assert_frame_equal(rebuilt.running_totals("seance"), SessionTimeline.build(altered).running_totals("seance"))